@@ -0,0 +1,133 @@
+import asyncio
+import atexit
+import os
+import threading
+import weakref
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Dict, Optional
+
+MAX_IN_FLIGHT_ENV = "LLM_MAX_IN_FLIGHT"
+DEFAULT_MAX_IN_FLIGHT = int(os.environ.get(MAX_IN_FLIGHT_ENV, "8"))
+
+
+class BackgroundLoop:
+    """One long-lived asyncio event loop on a daemon thread, shared by every caller.
+
+    Sync code (Flask worker threads) hands coroutines to submit() or run()
+    instead of building an event loop per request, so agents, HTTP clients
+    and their keep-alive connections live on one loop and are reused.
+    limit() caps concurrent model calls at max_in_flight per event loop; on
+    the background loop that is the cap for the whole process. The loop
+    starts on first use and is stopped at interpreter exit.
+    """
+
+    def __init__(self, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT, name: str = "scheduler-loop"):
+        self.max_in_flight = max_in_flight
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = \
+            weakref.WeakKeyDictionary()
+        self.counters = {"submitted": 0, "completed": 0, "failed": 0, "in_flight": 0, "peak_in_flight": 0}
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The background event loop, started on first access."""
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def serve():
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(ready.set)
+                    loop.run_forever()
+
+                self._thread = threading.Thread(target=serve, name=self.name, daemon=True)
+                self._thread.start()
+                ready.wait()
+                self._loop = loop
+            return self._loop
+
+    def submit(self, coro: Awaitable[Any]) -> Future:
+        """Schedule a coroutine on the background loop from any thread; returns a concurrent Future."""
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        with self._lock:
+            self.counters["submitted"] += 1
+        future.add_done_callback(self._finished)
+        return future
+
+    def _finished(self, future: Future) -> None:
+        with self._lock:
+            failed = future.cancelled() or future.exception() is not None
+            self.counters["failed" if failed else "completed"] += 1
+
+    def run(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """Run a coroutine on the background loop and block until it finishes."""
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("BackgroundLoop.run() called from the loop's own thread; await instead")
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise
+
+    async def call(self, coro: Awaitable[Any]) -> Any:
+        """Await a coroutine on the background loop from any event loop (directly when already on it)."""
+        try:
+            on_loop = asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            on_loop = False
+        if on_loop:
+            return await coro
+        return await asyncio.wrap_future(self.submit(coro))
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_in_flight)
+            return semaphore
+
+    @asynccontextmanager
+    async def limit(self):
+        """Hold one of max_in_flight model-call slots for the current event loop."""
+        async with self._semaphore():
+            with self._lock:
+                self.counters["in_flight"] += 1
+                self.counters["peak_in_flight"] = max(self.counters["peak_in_flight"], self.counters["in_flight"])
+            try:
+                yield
+            finally:
+                with self._lock:
+                    self.counters["in_flight"] -= 1
+
+    def stop(self) -> None:
+        """Stop and close the loop; the next submit() starts a fresh one."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5)
+        if not loop.is_running():
+            loop.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return submission counters, current and peak model calls in flight, and whether the loop runs."""
+        with self._lock:
+            stats = dict(self.counters)
+            stats["max_in_flight"] = self.max_in_flight
+            stats["running"] = self._loop is not None and self._loop.is_running()
+        return stats
+
+
+background_loop = BackgroundLoop()
+atexit.register(background_loop.stop)
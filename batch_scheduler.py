@@ -0,0 +1,109 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from calendar_providers import CalendarProvider
+from compact_events import event_wall_bounds, wall_seconds
+from meeting_utils import MeetingScheduler, request_failure_response
+from reservations import ReservationTable, tentative_reservations
+
+# Scheduling order inside a batch; ties keep submission order
+PRIORITY_ORDER = {"high": 0, "medium": 1, "low": 2}
+
+
+class BatchScheduler:
+    """Schedule many meeting requests against one calendar fetch.
+
+    The union of every request's attendees is fetched once over the union of
+    their windows. Requests are then assigned greedily, most urgent first
+    (priority from parse_email_content), and each chosen slot is held in the
+    reservation table before the next request is placed, so requests in the
+    batch never share a slot. By default holds go in the shared
+    tentative_reservations table the serving entry points use, so single and
+    batched requests don't collide either; with reservations=None each
+    schedule() call holds slots in a fresh table of its own.
+    """
+
+    def __init__(self, scheduler: Optional[MeetingScheduler] = None,
+                 reservations: Optional[ReservationTable] = tentative_reservations):
+        self.scheduler = scheduler or MeetingScheduler()
+        self.reservations = reservations
+
+    def _prepare(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
+        scheduler = self.scheduler
+        start_time, end_time = scheduler.request_window(request_data)
+        return {
+            "request": request_data,
+            "analysis": scheduler.parse_email_content(request_data.get("EmailContent", ""),
+                                                      request_data.get("Datetime", "")),
+            "attendees": scheduler.request_attendees(request_data),
+            "start_time": start_time,
+            "end_time": end_time,
+            "start_dt": scheduler._parse_flexible_datetime(start_time),
+            "end_dt": scheduler._parse_flexible_datetime(end_time),
+        }
+
+    @staticmethod
+    def _in_window(events: Any, start: int, end: int) -> Any:
+        # Narrow a union-window fetch down to one request's window (wall clock, like the slot engines)
+        if isinstance(events, Exception):
+            return events
+        kept = []
+        for event in events:
+            event_start, event_end = event_wall_bounds(event)
+            if event_start < end and event_end > start:
+                kept.append(event)
+        return kept
+
+    def _availability(self, item: Dict[str, Any], fetched: Dict[str, Any],
+                      summaries: Dict[Tuple[str, int, int], Dict[str, Any]]) -> Dict[str, Any]:
+        # Per-attendee availability for one request window, shared by every request with the same window
+        start, end = wall_seconds(item["start_dt"]), wall_seconds(item["end_dt"])
+        availability = {"detailed_events": {}, "availability_summary": {}}
+        for attendee in item["attendees"]:
+            key = (attendee, start, end)
+            summary = summaries.get(key)
+            if summary is None:
+                summary = summaries[key] = self.scheduler.summarize_availability(
+                    [attendee], {attendee: self._in_window(fetched[attendee], start, end)})
+            availability["detailed_events"][attendee] = summary["detailed_events"][attendee]
+            availability["availability_summary"][attendee] = summary["availability_summary"][attendee]
+        return availability
+
+    def schedule(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Schedule every request; responses come back in input order."""
+        responses: List[Optional[Dict[str, Any]]] = [None] * len(requests)
+        prepared = []
+        for index, request_data in enumerate(requests):
+            try:
+                prepared.append((index, self._prepare(request_data)))
+            except Exception as e:
+                responses[index] = request_failure_response(request_data, e)
+        if not prepared:
+            return responses
+
+        attendees = list(dict.fromkeys(attendee for _, item in prepared for attendee in item["attendees"]))
+        window_start = min((item for _, item in prepared), key=lambda item: item["start_dt"])["start_time"]
+        window_end = max((item for _, item in prepared), key=lambda item: item["end_dt"])["end_time"]
+        fetched = self.scheduler.fetch_all_events(attendees, window_start, window_end)
+
+        summaries: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
+        reservations = self.reservations if self.reservations is not None else ReservationTable()
+        prepared.sort(key=lambda entry: (PRIORITY_ORDER.get(entry[1]["analysis"]["priority"], 1), entry[0]))
+        for index, item in prepared:
+            request_data = item["request"]
+            try:
+                availability = self._availability(item, fetched, summaries)
+                responses[index] = self.scheduler.schedule_from_availability(
+                    request_data, item["analysis"], availability, item["start_time"], item["end_time"],
+                    reservations)
+            except Exception as e:
+                responses[index] = request_failure_response(request_data, e)
+        return responses
+
+
+def process_meeting_batch(requests: List[Dict[str, Any]], availability_mode: str = "full",
+                          provider: Optional[CalendarProvider] = None,
+                          reservations: Optional[ReservationTable] = tentative_reservations) -> List[Dict[str, Any]]:
+    """Batch counterpart of process_meeting_request: one response per request, in order."""
+    scheduler = MeetingScheduler(availability_mode=availability_mode, provider=provider,
+                                 compact_events=True)
+    return BatchScheduler(scheduler, reservations).schedule(requests)
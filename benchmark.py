@@ -0,0 +1,1100 @@
+#!/usr/bin/env python3
+"""
+Performance Benchmarks for AI Meeting Scheduler
+Runs offline against local stubs - no LLM server or Google tokens required
+"""
+
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List
+from urllib.parse import parse_qs, urlparse
+
+BENCHMARKS: Dict[str, Callable[[], None]] = {}
+
+
+def benchmark(name: str):
+    """Register a benchmark under a command-line name."""
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+
+def timed(func: Callable[[], Any], repeat: int) -> List[float]:
+    """Run func repeat times and return per-call wall times in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def report(label: str, samples: List[float]) -> None:
+    """Print median and p95 for a list of millisecond samples."""
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(f"   {label:<32} median {statistics.median(ordered):8.3f} ms   p95 {p95:8.3f} ms   (n={len(ordered)})")
+
+
+class StubCalendarHandler(BaseHTTPRequestHandler):
+    """Minimal Google Calendar v3 stand-in: a fixed events page and a FreeBusy endpoint.
+
+    events().list honours pageToken/maxResults and hands out a nextSyncToken on
+    the last page. Incremental syncs (syncToken=...) return the class-level
+    changes list, or HTTP 410 for tokens listed in expired_sync_tokens.
+    FreeBusy answers with the busy intervals of the same events page for every
+    requested calendar, so both backends see identical availability.
+    """
+
+    events_page = {"items": []}
+    changes: List[Dict[str, Any]] = []
+    expired_sync_tokens: set = set()
+    requests_seen: List[Dict[str, str]] = []
+
+    def _send_json(self, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        query = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+        self.requests_seen.append(query)
+
+        if "syncToken" in query:
+            if query["syncToken"] in self.expired_sync_tokens:
+                body = json.dumps({"error": {"code": 410, "message": "Sync token is no longer valid"}}).encode()
+                self.send_response(410)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+            self._send_json({"items": self.changes, "nextSyncToken": query["syncToken"] + "+"})
+            return
+
+        items = self.events_page["items"]
+        offset = int(query.get("pageToken", 0))
+        page_size = int(query.get("maxResults", 250))
+        page = {"items": items[offset:offset + page_size]}
+        if offset + page_size < len(items):
+            page["nextPageToken"] = str(offset + page_size)
+        else:
+            page["nextSyncToken"] = "sync-0"
+        self._send_json(page)
+
+    def do_POST(self):
+        query = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        busy = [{"start": item["start"]["dateTime"], "end": item["end"]["dateTime"]}
+                for item in self.events_page["items"]]
+        self._send_json({
+            "kind": "calendar#freeBusy",
+            "timeMin": query.get("timeMin"),
+            "timeMax": query.get("timeMax"),
+            "calendars": {item["id"]: {"busy": busy} for item in query.get("items", [])},
+        })
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_calendar_server(events_page: Dict[str, Any]) -> ThreadingHTTPServer:
+    """Start a background stub Calendar server on a free localhost port."""
+    handler = type("Handler", (StubCalendarHandler,), {
+        "events_page": events_page, "changes": [], "expired_sync_tokens": set(), "requests_seen": [],
+    })
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def write_fake_tokens(keys_dir: str, users: List[str]) -> None:
+    """Write non-expiring authorized-user token files for the given users."""
+    for user in users:
+        token = {
+            "token": "stub-access-token",
+            "refresh_token": "stub-refresh-token",
+            "client_id": "stub-client",
+            "client_secret": "stub-secret",
+            "expiry": "2099-01-01T00:00:00Z",
+        }
+        with open(os.path.join(keys_dir, user.split("@")[0] + ".token"), "w") as f:
+            json.dump(token, f)
+
+
+def sample_events_page(num_events: int = 10) -> Dict[str, Any]:
+    """Build a Calendar events().list payload with num_events half-hour events."""
+    items = []
+    for i in range(num_events):
+        hour = 9 + (i % 8)
+        items.append({
+            "id": f"event{i}",
+            "summary": f"Event {i}",
+            "start": {"dateTime": f"2025-07-17T{hour:02d}:00:00+05:30"},
+            "end": {"dateTime": f"2025-07-17T{hour:02d}:30:00+05:30"},
+            "attendees": [{"email": "userone.amd@gmail.com"}, {"email": "usertwo.amd@gmail.com"}],
+        })
+    return {"items": items}
+
+
+# Heavy modules the rule-based path must not import at startup (see bench_import_time)
+LAZY_MODULES = ("pydantic_ai", "openai", "httpx", "googleapiclient", "google_auth_httplib2", "httplib2")
+IMPORT_BUDGET_ENV = "IMPORT_BUDGET_MS"
+
+
+def import_profile(module: str) -> Dict[str, Any]:
+    """Import module in a fresh interpreter under -X importtime; return its cumulative time and what it loaded."""
+    import subprocess
+    probe = f"import sys, {module}; print(' '.join(sorted(sys.modules)))"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", probe], capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+    cumulative_us = 0
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            cumulative_us = int(parts[1])
+    loaded = set(result.stdout.split())
+    return {"ms": cumulative_us / 1000, "lazy_loaded": sorted(name for name in LAZY_MODULES if name in loaded)}
+
+
+@benchmark("clients")
+def bench_calendar_clients():
+    """Cold (load token + build client per call) vs warm (registry hit) fetch latency."""
+    from calendar_extractor import CalendarClientRegistry, retrive_calendar_events
+
+    print("📅 Calendar client registry: cold vs warm fetch")
+    users = ["userone.amd@gmail.com", "usertwo.amd@gmail.com", "userthree.amd@gmail.com"]
+    server = start_stub_calendar_server(sample_events_page())
+    endpoint = f"http://127.0.0.1:{server.server_address[1]}/calendar/v3/"
+
+    with tempfile.TemporaryDirectory() as keys_dir:
+        write_fake_tokens(keys_dir, users)
+        registry = CalendarClientRegistry(keys_dir=keys_dir, api_endpoint=endpoint)
+
+        def cold_fetch():
+            registry.clear()
+            for user in users:
+                retrive_calendar_events(user, "2025-07-17T00:00:00+05:30", "2025-07-17T23:59:59+05:30", registry)
+
+        def warm_fetch():
+            for user in users:
+                retrive_calendar_events(user, "2025-07-17T00:00:00+05:30", "2025-07-17T23:59:59+05:30", registry)
+
+        cold = timed(cold_fetch, 20)
+        warm_fetch()
+        warm = timed(warm_fetch, 200)
+        report(f"cold ({len(users)} attendees)", cold)
+        report(f"warm ({len(users)} attendees)", warm)
+        print(f"   speedup: {statistics.median(cold) / statistics.median(warm):.1f}x   registry: {registry.stats()}")
+
+    server.shutdown()
+
+
+@benchmark("fanout")
+def bench_attendee_fanout():
+    """Sequential vs concurrent get_availability_for_all with injected per-fetch latency."""
+    from calendar_providers import SyntheticCalendarProvider
+    from meeting_utils import MeetingScheduler
+
+    print("👥 Attendee fan-out: sequential vs thread pool (50 ms per fetch)")
+    provider = SyntheticCalendarProvider(latency=0.05)
+    start, end = "2025-07-14T00:00:00+05:30", "2025-07-18T23:59:59+05:30"
+
+    for num_attendees in (3, 12, 50):
+        attendees = [f"user{i}@example.com" for i in range(num_attendees)]
+        for label, workers in (("sequential", 1), ("concurrent", 16)):
+            scheduler = MeetingScheduler(max_workers=workers, provider=provider)
+            samples = timed(lambda: scheduler.get_availability_for_all(attendees, start, end), 5)
+            report(f"{label} x{num_attendees}", samples)
+
+
+@benchmark("freebusy")
+def bench_freebusy():
+    """Full events().list per attendee vs one FreeBusy query: payload size and latency."""
+    from calendar_extractor import CalendarClientRegistry
+    from calendar_providers import GoogleCalendarProvider
+    from meeting_utils import MeetingScheduler
+
+    print("🗓️  Availability backend: full events vs busy-only (FreeBusy)")
+    events_page = sample_events_page(40)
+    server = start_stub_calendar_server(events_page)
+    endpoint = f"http://127.0.0.1:{server.server_address[1]}/calendar/v3/"
+    start, end = "2025-07-17T00:00:00+05:30", "2025-07-17T23:59:59+05:30"
+
+    for num_attendees in (3, 50):
+        users = [f"user{i}.amd@gmail.com" for i in range(num_attendees)]
+        with tempfile.TemporaryDirectory() as keys_dir:
+            write_fake_tokens(keys_dir, users)
+            registry = CalendarClientRegistry(keys_dir=keys_dir, api_endpoint=endpoint)
+            provider = GoogleCalendarProvider(registry=registry, use_cache=False)
+            for mode in ("full", "busy"):
+                scheduler = MeetingScheduler(max_workers=1, availability_mode=mode, provider=provider)
+                availability = scheduler.get_availability_for_all(users, start, end)
+                size = len(json.dumps(availability["detailed_events"]))
+                samples = timed(lambda: scheduler.get_availability_for_all(users, start, end), 10)
+                report(f"{mode} x{num_attendees} ({size // 1024} KiB)", samples)
+
+    server.shutdown()
+
+
+@benchmark("sync_cache")
+def bench_sync_cache():
+    """Uncached full-window fetch vs sync-token cache (local hit and incremental sync)."""
+    from calendar_extractor import CalendarClientRegistry, CalendarEventCache, retrive_calendar_events
+
+    print("🔁 Event sync cache: full fetch vs cached reads (12 attendees x 200 events)")
+    users = [f"user{i}.amd@gmail.com" for i in range(12)]
+    server = start_stub_calendar_server(sample_events_page(200))
+    endpoint = f"http://127.0.0.1:{server.server_address[1]}/calendar/v3/"
+    start, end = "2025-07-17T00:00:00+05:30", "2025-07-17T23:59:59+05:30"
+
+    with tempfile.TemporaryDirectory() as keys_dir:
+        write_fake_tokens(keys_dir, users)
+        registry = CalendarClientRegistry(keys_dir=keys_dir, api_endpoint=endpoint)
+        hit_cache = CalendarEventCache(registry=registry, sync_interval=3600)
+        sync_cache = CalendarEventCache(registry=registry, sync_interval=0)
+
+        def fetch_all(**kwargs):
+            for user in users:
+                retrive_calendar_events(user, start, end, **kwargs)
+
+        report("uncached", timed(lambda: fetch_all(registry=registry), 10))
+        report("incremental sync", timed(lambda: fetch_all(cache=sync_cache), 10))
+        report("cache hit", timed(lambda: fetch_all(cache=hit_cache), 10))
+        print(f"   stats: {hit_cache.stats()}")
+
+    server.shutdown()
+
+
+def synthetic_availability(num_attendees: int, events_per_day: int, start: str, end: str) -> Dict[str, Any]:
+    """Load availability for num_attendees synthetic calendars through MeetingScheduler."""
+    from calendar_providers import SyntheticCalendarProvider
+    from meeting_utils import MeetingScheduler
+
+    scheduler = MeetingScheduler(provider=SyntheticCalendarProvider(events_per_day=events_per_day))
+    attendees = [f"user{i}@example.com" for i in range(num_attendees)]
+    return scheduler.get_availability_for_all(attendees, start, end)
+
+
+@benchmark("slots")
+def bench_slot_engines():
+    """find_best_time_slots engines at 50 attendees x 200 events x 4 weeks."""
+    from meeting_utils import MeetingScheduler, SLOT_ENGINES
+
+    print("🔎 Slot search engines: 50 attendees x 200 events x 4 weeks, 30 min meeting")
+    start, end = "2025-07-07T00:00:00+05:30", "2025-08-03T23:59:59+05:30"
+    availability = synthetic_availability(50, 10, start, end)
+    scheduler = MeetingScheduler()
+
+    results, medians = {}, {}
+    for engine in SLOT_ENGINES:
+        repeat = 1 if engine == "scan" else 10
+        samples = timed(lambda: results.__setitem__(
+            engine, scheduler.find_best_time_slots(availability, 30, start, end, engine=engine)), repeat)
+        medians[engine] = statistics.median(samples)
+        report(engine, samples)
+    for engine in SLOT_ENGINES:
+        if engine != "scan":
+            print(f"   {engine}: {medians['scan'] / medians[engine]:.1f}x faster than scan, "
+                  f"identical top 5: {results[engine] == results['scan']}")
+
+    print("   Typical meeting, 3 attendees x 2 events/day x 4 weeks (top-k can stop early):")
+    sparse = synthetic_availability(3, 2, start, end)
+    for engine in SLOT_ENGINES:
+        report(f"{engine} sparse", timed(lambda: scheduler.find_best_time_slots(sparse, 30, start, end, engine=engine), 5))
+
+    print("   Horizon and attendee scaling (scan skipped):")
+    for num_attendees, weeks in ((50, 12), (200, 4), (200, 12)):
+        end = (datetime(2025, 7, 7) + timedelta(weeks=weeks) - timedelta(seconds=1)).isoformat() + "+05:30"
+        availability = synthetic_availability(num_attendees, 10, start, end)
+        for engine in SLOT_ENGINES:
+            if engine != "scan":
+                samples = timed(lambda: scheduler.find_best_time_slots(availability, 30, start, end, engine=engine), 3)
+                report(f"{engine} {num_attendees} x {weeks}w", samples)
+
+
+@benchmark("quorum")
+def bench_quorum_slots():
+    """find_quorum_slots for large meetings: numpy conflict matrix vs per-slot bisects."""
+    import slot_engines
+    from meeting_utils import MeetingScheduler
+
+    print("👥 Quorum search: 5 required + optional attendees, 10 events/day, 30 min meeting")
+    scheduler = MeetingScheduler()
+    start = "2025-07-07T00:00:00+05:30"
+    for num_attendees, weeks in ((20, 2), (100, 4), (300, 4)):
+        end = (datetime(2025, 7, 7) + timedelta(weeks=weeks) - timedelta(seconds=1)).isoformat() + "+05:30"
+        availability = synthetic_availability(num_attendees, 10, start, end)
+        attendees = list(availability["detailed_events"])
+        required, optional = attendees[:5], attendees[5:]
+        quorum = int(num_attendees * 0.6)
+        modes = [("bisect", False)] + ([("numpy", True)] if slot_engines.NUMPY_AVAILABLE else [])
+        results = {}
+        for label, use_numpy in modes:
+            slot_engines.NUMPY_AVAILABLE = use_numpy
+            try:
+                samples = timed(lambda: results.__setitem__(label, scheduler.find_quorum_slots(
+                    availability, 30, start, end, required, optional, quorum)), 3)
+            finally:
+                slot_engines.NUMPY_AVAILABLE = bool(slot_engines.np)
+            report(f"{label} {num_attendees} x {weeks}w", samples)
+        best = results["bisect"][0]
+        print(f"   best: {best['start_time']} {best['available_attendees']}/{num_attendees} free, "
+              f"quorum met {best['quorum_met']}, engines agree {len({str(r) for r in results.values()}) == 1}")
+
+
+@benchmark("recurring")
+def bench_recurring_slots():
+    """Weekly 30 min for 12 weeks: per-week fetch + find_best_time_slots vs one recurring search."""
+    from calendar_providers import SyntheticCalendarProvider
+    from meeting_utils import MeetingScheduler
+
+    print("🔁 Recurring meeting, weekly x 12 (20 ms per calendar round trip)")
+    scheduler = MeetingScheduler(provider=SyntheticCalendarProvider(events_per_day=2, latency=0.02))
+    start = "2025-07-14T00:00:00+05:30"
+    for num_attendees in (5, 20, 50):
+        attendees = [f"user{i}@example.com" for i in range(num_attendees)]
+
+        def per_week():
+            for week in range(12):
+                week_start = datetime(2025, 7, 14) + timedelta(weeks=week)
+                window = (week_start.isoformat() + "+05:30", (week_start + timedelta(days=7)).isoformat() + "+05:30")
+                availability = scheduler.get_availability_for_all(attendees, *window)
+                scheduler.find_best_time_slots(availability, 30, *window)
+
+        def recurring():
+            window = scheduler.recurrence_window(start, occurrences=12)
+            availability = scheduler.get_availability_for_all(attendees, *window)
+            return scheduler.find_recurring_slots(availability, 30, start, occurrences=12)
+
+        report(f"12 single searches x{num_attendees}", timed(per_week, 3))
+        report(f"recurring search x{num_attendees}", timed(recurring, 3))
+        availability = scheduler.get_availability_for_all(attendees, *scheduler.recurrence_window(start, occurrences=12))
+        report(f"  search only x{num_attendees}", timed(
+            lambda: scheduler.find_recurring_slots(availability, 30, start, occurrences=12), 5))
+        best = recurring()[0]
+        print(f"   best pattern: {best['day_of_week']} {best['start_time'][11:16]}, "
+              f"{best['conflicted_occurrences']}/12 occurrences conflicted")
+
+
+@benchmark("timezones")
+def bench_timezone_slots():
+    """tz-aware search across IST, EU and US working hours: cold vs cached masks."""
+    import slot_engines
+    from meeting_utils import MeetingScheduler
+    from working_hours import WorkingHours, WorkingHoursMasks
+
+    print("🌍 Timezone-aware slot search: attendees split across Kolkata, Berlin and New York")
+    zones = [("Asia/Kolkata", "09:00", "18:00"), ("Europe/Berlin", "09:00", "17:00"),
+             ("America/New_York", "07:00", "16:00")]
+    start = "2025-07-07T00:00:00+05:30"
+    for num_attendees, weeks in ((3, 1), (30, 4), (150, 4)):
+        end = (datetime(2025, 7, 7) + timedelta(weeks=weeks) - timedelta(seconds=1)).isoformat() + "+05:30"
+        availability = synthetic_availability(num_attendees, 2, start, end)
+        working_hours = {attendee: WorkingHours(*zones[i % len(zones)])
+                         for i, attendee in enumerate(availability["detailed_events"])}
+        scheduler = MeetingScheduler(working_hours=working_hours)
+
+        def cold():
+            # A fresh mask cache per call: every profile is compiled again
+            slot_engines.working_hour_masks, saved = WorkingHoursMasks(), slot_engines.working_hour_masks
+            try:
+                return scheduler.find_tz_slots(availability, 30, start, end)
+            finally:
+                slot_engines.working_hour_masks = saved
+
+        report(f"cold masks {num_attendees} x {weeks}w", timed(cold, 5))
+        report(f"cached masks {num_attendees} x {weeks}w",
+               timed(lambda: scheduler.find_tz_slots(availability, 30, start, end), 5))
+        report(f"naive topk {num_attendees} x {weeks}w (no tz)",
+               timed(lambda: scheduler.find_best_time_slots(availability, 30, start, end), 5))
+        best = scheduler.find_tz_slots(availability, 30, start, end)
+        if best:
+            print(f"   best: {best[0]['start_time']} (all free: {best[0]['all_available']}), "
+                  f"local {sorted(set(t[11:16] for t in best[0]['local_start_times'].values()))}")
+
+
+@benchmark("reschedule")
+def bench_incremental_rescheduling():
+    """One attendee's calendar changes: full re-run vs a delta on SchedulingState."""
+    import random
+    from compact_events import CompactEvent
+    from meeting_utils import MeetingScheduler
+    from rescheduling import SchedulingState
+
+    print("♻️  Re-scheduling after one calendar change (30 min meeting)")
+    scheduler = MeetingScheduler()
+    rng = random.Random(0)
+    start = "2025-07-07T00:00:00+05:30"
+    for num_attendees, weeks in ((5, 1), (50, 4)):
+        end = (datetime(2025, 7, 7) + timedelta(weeks=weeks) - timedelta(seconds=1)).isoformat() + "+05:30"
+        attendees = [f"user{i}@example.com" for i in range(num_attendees)]
+        report(f"fetch + search {num_attendees} x {weeks}w",
+               timed(lambda: scheduler.find_best_time_slots(
+                   synthetic_availability(num_attendees, 10, start, end), 30, start, end), 3))
+
+        state = SchedulingState(scheduler, synthetic_availability(num_attendees, 10, start, end)["detailed_events"],
+                                30, start, end)
+        deltas = []
+        for _ in range(200):
+            day = datetime(2025, 7, 7) + timedelta(days=rng.randrange(weeks * 7), hours=rng.randrange(9, 18))
+            deltas.append((rng.choice(attendees), CompactEvent.from_dict({
+                "StartTime": day.isoformat(), "EndTime": (day + timedelta(minutes=45)).isoformat(),
+                "Summary": "Moved"})))
+        pending = iter(deltas)
+
+        def apply_delta():
+            attendee, event = next(pending)
+            key, _ = rng.choice(state.event_keys(attendee))
+            state.move_event(attendee, key, event)
+            return state.best_slot()
+
+        report(f"delta + best_slot {num_attendees} x {weeks}w", timed(apply_delta, 200))
+
+
+def legacy_slot_score(slot_time: datetime, all_available: bool, conflicts: List) -> float:
+    """The original hard-coded MeetingScheduler._calculate_slot_score, kept as the reference."""
+    score = 0.0
+    if all_available:
+        score += 100
+    else:
+        score -= len(conflicts) * 20
+    hour = slot_time.hour
+    if 9 <= hour <= 11:
+        score += 20
+    elif 14 <= hour <= 16:
+        score += 15
+    elif 11 <= hour <= 12:
+        score += 10
+    elif 16 <= hour <= 17:
+        score += 5
+    else:
+        score -= 10
+    weekday = slot_time.weekday()
+    if weekday in [1, 2, 3]:
+        score += 10
+    elif weekday in [0, 4]:
+        score += 5
+    if 12 <= hour <= 13:
+        score -= 15
+    return score
+
+
+@benchmark("scoring")
+def bench_slot_scoring():
+    """Per-candidate scoring cost: original if-chain vs weight-table lookup vs vectorized scores()."""
+    import random
+    from compact_events import wall_seconds
+    from slot_engines import iter_candidate_starts
+    from slot_scoring import SlotScoring
+
+    print("🧮 Slot scoring cost per candidate")
+    scoring = SlotScoring()
+    rng = random.Random(0)
+    for weeks in (1, 4, 12, 52):
+        start = datetime(2025, 7, 7)
+        candidates = [slot_start for slot_start, _ in iter_candidate_starts(
+            start, start + timedelta(weeks=weeks), 30, 9, 18)]
+        counts = [rng.choice((0, 0, 1, 2, 5)) for _ in candidates]
+        conflicts = [[None] * count for count in counts]
+        wall_starts = [wall_seconds(slot_start) for slot_start in candidates]
+        assert scoring.scores(wall_starts, counts) == [
+            legacy_slot_score(slot_start, not c, c) for slot_start, c in zip(candidates, conflicts)]
+
+        runs = (("if-chain", lambda: [legacy_slot_score(t, not c, c) for t, c in zip(candidates, conflicts)]),
+                ("table lookup", lambda: [scoring.score(t, not n, n) for t, n in zip(candidates, counts)]),
+                ("vectorized", lambda: scoring.scores(wall_starts, counts)))
+        line = []
+        for label, run in runs:
+            per_candidate = statistics.median(timed(run, 5)) * 1e6 / len(candidates)
+            line.append(f"{label} {per_candidate:6.0f} ns")
+        print(f"   {weeks:>2}w ({len(candidates):>5} candidates): " + "   ".join(line))
+
+
+@benchmark("memory")
+def bench_event_memory():
+    """tracemalloc footprint of cached calendars as event dicts vs CompactEvents."""
+    import tracemalloc
+    from calendar_providers import SyntheticCalendarProvider
+    from compact_events import AttendeeInterner, CompactEvent
+
+    print("🧠 Cached calendar memory: 50 users x 200 events")
+    provider = SyntheticCalendarProvider(events_per_day=10)
+    start, end = "2025-07-07T00:00:00+05:30", "2025-08-03T23:59:59+05:30"
+    users = [f"user{i}@example.com" for i in range(50)]
+    meeting_attendees = users[:8]
+    calendars = {}
+    for user in users:
+        events = provider.get_events(user, start, end)
+        for event in events:
+            # Realistic attendee lists: each event shares a handful of colleagues
+            event["Attendees"] = list(meeting_attendees)
+            event["NumAttendees"] = len(event["Attendees"])
+        calendars[user] = json.dumps(events)
+    num_events = sum(len(json.loads(payload)) for payload in calendars.values())
+
+    def measure(build):
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        cache = {user: build(json.loads(payload)) for user, payload in calendars.items()}
+        elapsed = (time.perf_counter() - started) * 1000
+        used = tracemalloc.get_traced_memory()[0] - baseline
+        tracemalloc.stop()
+        del cache
+        return used, elapsed
+
+    interner = AttendeeInterner()
+    for label, build in (("dicts", lambda events: events),
+                         ("CompactEvent", lambda events: [CompactEvent.from_dict(event, interner) for event in events])):
+        used, elapsed = measure(build)
+        print(f"   {label:<32} {used / 1024:9.1f} KiB   {used / num_events:6.0f} B/event   (build {elapsed:.1f} ms)")
+
+
+def synthetic_requests(num_requests: int, attendees_per_request: int = 3, seed: int = 0) -> List[Dict[str, Any]]:
+    """Meeting requests over one week, drawn from a pool that grows with the batch (about 6 meetings each)."""
+    import random
+
+    rng = random.Random(seed)
+    pool = [f"user{i}@example.com" for i in range(max(attendees_per_request * 4, num_requests // 2))]
+    phrasing = ["Let's meet for 30 minutes to sync.", "Urgent: need 30 min tomorrow, asap.",
+                "No rush, 1 hour when convenient.", "Quick 15 min check-in please."]
+    requests = []
+    for i in range(num_requests):
+        organizer, *invitees = rng.sample(pool, attendees_per_request)
+        requests.append({
+            "Request_id": f"bench-{seed}-{i}",
+            "Datetime": "13-07-2025T12:34:55",
+            "Location": "IIT Mumbai",
+            "From": organizer,
+            "Attendees": [{"email": email} for email in invitees],
+            "Subject": f"Sync {i}",
+            "EmailContent": rng.choice(phrasing),
+            "Start": "2025-07-14T00:00:00+05:30",
+            "End": "2025-07-18T23:59:59+05:30",
+        })
+    return requests
+
+
+def legacy_parse_flexible_datetime(datetime_str: str) -> datetime:
+    """The original MeetingScheduler._parse_flexible_datetime (minus its now() fallback), kept as the reference."""
+    clean_str = datetime_str.replace('Z', '').replace('+00:00', '').replace('+05:30', '')
+    try:
+        dt = datetime.fromisoformat(clean_str)
+        return dt.replace(tzinfo=None) if dt.tzinfo else dt
+    except ValueError:
+        pass
+    try:
+        if 'T' in clean_str:
+            date_part, time_part = clean_str.split('T')
+            if '-' in date_part and len(date_part.split('-')[0]) == 2:
+                day, month, year = date_part.split('-')
+                return datetime.fromisoformat(f"{year}-{month}-{day}T{time_part}")
+    except ValueError:
+        pass
+    raise ValueError(datetime_str)
+
+
+@benchmark("timestamps")
+def bench_timestamp_parsing():
+    """Per-call parse cost of request and event timestamps: original parsing vs the memoized parser."""
+    import pytz
+    from calendar_providers import SyntheticCalendarProvider
+    from compact_events import wall_seconds
+    from timestamps import TimestampParser
+
+    print("🕰️  Timestamp parse cost per call (repeating request and event timestamps)")
+    tz = pytz.timezone('Asia/Kolkata')
+    requests = synthetic_requests(1000)
+    for i, request in enumerate(requests):
+        request["Datetime"] = f"{7 + i % 14:02d}-07-2025T12:34:55"
+    provider = SyntheticCalendarProvider(events_per_day=8)
+    events = [event for user in [f"user{i}@example.com" for i in range(20)]
+              for event in provider.get_events(user, "2025-07-14T00:00:00+05:30", "2025-07-18T23:59:59+05:30")]
+    event_times = [event[key] for event in events for key in ("StartTime", "EndTime")]
+    request_times = [request[key] for request in requests for key in ("Datetime", "Start", "End")]
+
+    def legacy_aware(value):
+        try:
+            dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            dt = legacy_parse_flexible_datetime(value)
+        return tz.localize(dt) if dt.tzinfo is None else dt
+
+    cases = (("request Datetime/Start/End", request_times, (
+                ("flexible (original)", lambda parser, value: legacy_parse_flexible_datetime(value)),
+                ("aware (original)", lambda parser, value: legacy_aware(value)),
+                ("parse_wall", lambda parser, value: parser.parse_wall(value)),
+                ("aware", lambda parser, value: parser.aware(value, tz)))),
+             ("event StartTime/EndTime", event_times, (
+                ("fromisoformat + wall (original)", lambda parser, value: wall_seconds(datetime.fromisoformat(value))),
+                ("wall", lambda parser, value: parser.wall(value)),
+                ("epoch_offset", lambda parser, value: parser.epoch_offset(value)))))
+    for label, values, runs in cases:
+        print(f"   {label} ({len(values)} values, {len(set(values))} distinct)")
+        for run_label, run in runs:
+            line = []
+            for cache_label, max_entries in (("uncached", 0), ("memoized", 16384)):
+                parser = TimestampParser(max_entries)
+                per_call = statistics.median(timed(lambda: [run(parser, value) for value in values], 5))
+                line.append(f"{cache_label} {per_call * 1e6 / len(values):6.0f} ns")
+                if "original" in run_label:
+                    break
+            print(f"      {run_label:<34} " + "   ".join(line))
+
+
+def legacy_email_cues(email_content: str) -> Dict[str, Any]:
+    """The original sequential keyword checks from parse_email_content, kept as the reference."""
+    email_lower = email_content.lower()
+    duration = 30
+    if "30 min" in email_lower or "half hour" in email_lower:
+        duration = 30
+    elif "1 hour" in email_lower or "60 min" in email_lower:
+        duration = 60
+    elif "15 min" in email_lower:
+        duration = 15
+    elif "45 min" in email_lower:
+        duration = 45
+    weekday = None
+    for i, name in enumerate(["monday", "tuesday", "wednesday", "thursday", "friday", "tomorrow", "today"]):
+        if name in email_lower:
+            weekday = i
+            break
+    priority = "medium"
+    if any(word in email_lower for word in ["urgent", "asap", "immediately", "critical"]):
+        priority = "high"
+    elif any(word in email_lower for word in ["when convenient", "flexible", "no rush"]):
+        priority = "low"
+    return {"duration_minutes": duration, "weekday": weekday, "priority": priority,
+            "urgency_keywords": [word for word in ["urgent", "asap", "critical"] if word in email_lower]}
+
+
+def synthetic_emails(num_emails: int, max_filler: int = 4, seed: int = 0) -> List[str]:
+    """Meeting request emails mixing durations, days, clock times and priority cues with filler text."""
+    import random
+
+    rng = random.Random(seed)
+    durations = ["15 min", "30 minutes", "45 mins", "1 hour", "90-minute", "2 hours", "1 hour 30 min", "half an hour"]
+    days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "tomorrow", "today", "next week"]
+    times = ["9 am", "10:30 AM", "2 PM", "3:45 p.m.", "14:00", "morning", "afternoon", ""]
+    moods = ["Urgent:", "ASAP please,", "No rush,", "When convenient,", "", ""]
+    filler = ("Following up on the roadmap review, we still need to agree on owners for the open items "
+              "and confirm the budget numbers before the quarterly planning session. ")
+    return [f"Hi team, {rng.choice(moods)} let's meet {rng.choice(days)} {rng.choice(times)} for "
+            f"{rng.choice(durations)} to discuss the project. " + filler * rng.randint(0, max_filler) + "Thanks!"
+            for _ in range(num_emails)]
+
+
+@benchmark("emails")
+def bench_email_extraction():
+    """Emails per second: sequential keyword checks vs the single-pass extractor vs parse_email_content."""
+    from email_extraction import extract_email_details
+    from meeting_utils import MeetingScheduler
+
+    print("✉️  Email extraction throughput (synthetic corpus)")
+    scheduler = MeetingScheduler()
+    for num_emails, max_filler in ((10000, 0), (10000, 4)):
+        emails = synthetic_emails(num_emails, max_filler)
+        print(f"   {num_emails} emails, avg {sum(map(len, emails)) // num_emails} chars")
+        runs = (("keyword chain (reference)", lambda: [legacy_email_cues(email) for email in emails]),
+                ("single-pass extractor", lambda: [extract_email_details(email) for email in emails]),
+                ("parse_email_content", lambda: [scheduler.parse_email_content(email, "13-07-2025T12:34:55")
+                                                 for email in emails]))
+        for label, run in runs:
+            elapsed = statistics.median(timed(run, 3)) / 1000
+            print(f"      {label:<30} {num_emails / elapsed:11.0f} emails/s")
+
+
+@benchmark("extraction_cache")
+def bench_extraction_cache():
+    """parse_email_content throughput on templated emails with and without the extraction cache."""
+    from extraction_cache import ExtractionCache
+    from meeting_utils import MeetingScheduler
+
+    print("🗃️  Extraction cache on templated emails (200 distinct bodies)")
+    templates = synthetic_emails(200, max_filler=2)
+    emails = [templates[i % len(templates)] for i in range(20000)]
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "extractions.db")
+        caches = (("no cache", None), ("memory LRU", ExtractionCache()),
+                  ("memory + SQLite", ExtractionCache(db_path=db_path)),
+                  ("SQLite after restart", "restart"))
+        for label, cache in caches:
+            if cache == "restart":
+                cache = ExtractionCache(db_path=db_path)
+            scheduler = MeetingScheduler(extraction_cache=cache)
+            started = time.perf_counter()
+            for email in emails:
+                scheduler.parse_email_content(email, "13-07-2025T12:34:55")
+            elapsed = time.perf_counter() - started
+            stats = cache.stats() if cache else {}
+            print(f"   {label:<24} {len(emails) / elapsed:9.0f} emails/s   "
+                  f"hit rate {stats.get('hit_rate', 0.0):5.1%}   disk hits {stats.get('disk_hits', 0)}")
+            if cache:
+                cache.close()
+
+
+@benchmark("llm_cache")
+def bench_llm_cache():
+    """Model calls and wall time for bursts of repeated prompts with and without the LLM response cache."""
+    import asyncio
+    from llm_cache import LLMResponseCache
+
+    print("🧠 LLM response cache (fake model: 50 ms per call, 500 prompts over 50 templates, 25 in flight)")
+    emails = synthetic_emails(50, max_filler=2)
+    prompts = [json.dumps({"Datetime": "13-07-2025T12:34:55", "EmailContent": emails[i % len(emails)]})
+               for i in range(500)]
+
+    for label, cache in (("no cache", None), ("cache + single-flight", LLMResponseCache())):
+        calls = []
+
+        async def model(prompt: str) -> str:
+            calls.append(prompt)
+            await asyncio.sleep(0.05)
+            return '{"Start": "2025-07-14T00:00:00+05:30", "End": "2025-07-18T23:59:59+05:30"}'
+
+        async def ask(prompt: str, gate: asyncio.Semaphore) -> str:
+            async with gate:
+                if cache is None:
+                    return await model(prompt)
+                return await cache.run("date_range", prompt, lambda: model(prompt))
+
+        async def burst():
+            gate = asyncio.Semaphore(25)
+            await asyncio.gather(*[ask(prompt, gate) for prompt in prompts])
+
+        started = time.perf_counter()
+        asyncio.run(burst())
+        elapsed = time.perf_counter() - started
+        stats = cache.stats() if cache else {}
+        print(f"   {label:<24} {len(calls):4d} model calls   {elapsed * 1000:8.1f} ms   "
+              f"coalesced {stats.get('coalesced', 0):3d}   hit rate {stats.get('hit_rate', 0.0):5.1%}")
+
+
+@benchmark("event_loop")
+def bench_event_loop():
+    """Per-request event loops vs the shared background loop for 50 concurrent sync callers."""
+    import asyncio
+    import socketserver
+    from concurrent.futures import ThreadPoolExecutor
+    from background_loop import BackgroundLoop
+
+    class EchoHandler(socketserver.StreamRequestHandler):
+        connections = 0
+
+        def handle(self):
+            type(self).connections += 1
+            for line in self.rfile:
+                time.sleep(0.02)
+                self.wfile.write(line)
+
+    server_class = type("EchoServer", (socketserver.ThreadingTCPServer,), {"request_queue_size": 128,
+                                                                         "daemon_threads": True})
+    server = server_class(("127.0.0.1", 0), EchoHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+
+    print("🔁 Event loop reuse (fake model server: 20 ms per call, 200 requests from 50 threads)")
+    try:
+        for label in ("loop per request", "shared background loop"):
+            pools: Dict[asyncio.AbstractEventLoop, list] = {}
+            runner = BackgroundLoop(max_in_flight=50)
+
+            async def model_call(i: int) -> bytes:
+                # Keep-alive connections belong to the loop that opened them, like an HTTP client's pool
+                idle = pools.setdefault(asyncio.get_running_loop(), [])
+                reader, writer = idle.pop() if idle else await asyncio.open_connection("127.0.0.1", port)
+                writer.write(b"%d\n" % i)
+                reply = await reader.readline()
+                idle.append((reader, writer))
+                return reply
+
+            def per_request(i: int) -> bytes:
+                loop = asyncio.new_event_loop()
+                try:
+                    return loop.run_until_complete(model_call(i))
+                finally:
+                    for _, writer in pools.pop(loop, []):
+                        writer.close()
+                    loop.close()
+
+            async def limited(i: int) -> bytes:
+                async with runner.limit():
+                    return await model_call(i)
+
+            def shared(i: int) -> bytes:
+                return runner.run(limited(i))
+
+            EchoHandler.connections = 0
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=50) as pool:
+                replies = list(pool.map(per_request if label == "loop per request" else shared, range(200)))
+            elapsed = time.perf_counter() - started
+            assert replies == [b"%d\n" % i for i in range(200)]
+            runner.stop()
+            print(f"   {label:<24} {200 / elapsed:8.1f} req/s   {elapsed * 1000:8.1f} ms   "
+                  f"connections opened {EchoHandler.connections:4d}")
+    finally:
+        server.shutdown()
+
+
+class StubChatHandler(BaseHTTPRequestHandler):
+    """OpenAI-compatible /chat/completions stand-in that answers after a fixed delay and counts connections."""
+
+    protocol_version = "HTTP/1.1"
+    delay = 0.02
+    connections = 0
+
+    def setup(self):
+        super().setup()
+        type(self).connections += 1
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(self.delay)
+        body = json.dumps({"id": "stub", "object": "chat.completion", "choices": [
+            {"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "{}"}}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@benchmark("llm_client")
+def bench_llm_client():
+    """Connections opened toward the model server per client setup, and batches formed by the prompt batcher."""
+    import asyncio
+    import random
+    import httpx
+    from llm_client import PromptBatcher, shared_http_client
+
+    handler = type("Handler", (StubChatHandler,), {"connections": 0})
+    server_class = type("ChatServer", (ThreadingHTTPServer,), {"request_queue_size": 256})
+    server = server_class(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1/chat/completions"
+
+    print("🌐 Model server client (stub: 20 ms per completion, 400 requests, 100 in flight)")
+    try:
+        async def post(client: httpx.AsyncClient) -> None:
+            response = await client.post(url, json={"model": "stub", "messages": []})
+            response.raise_for_status()
+
+        async def per_request(_):
+            async with httpx.AsyncClient() as client:
+                await post(client)
+
+        def burst(label: str, factory: Callable[[], Any]) -> None:
+            async def run():
+                client = factory()
+                gate = asyncio.Semaphore(100)
+
+                async def one(i):
+                    async with gate:
+                        await (per_request(i) if client is None else post(client))
+                await asyncio.gather(*[one(i) for i in range(400)])
+                if client is not None:
+                    await client.aclose()
+
+            handler.connections = 0
+            started = time.perf_counter()
+            asyncio.run(run())
+            elapsed = time.perf_counter() - started
+            print(f"   {label:<26} {400 / elapsed:8.1f} req/s   connections opened {handler.connections:4d}")
+
+        burst("client per request", lambda: None)
+        burst("shared default client", httpx.AsyncClient)
+        burst("shared pooled client (16)", lambda: shared_http_client(max_connections=16))
+    finally:
+        server.shutdown()
+
+    print("📦 Date-range micro-batching (fake model: 50 ms, 200 prompts arriving 0-2 ms apart)")
+    for window in (0.0, 0.002, 0.005):
+        async def model(prompt: str) -> str:
+            await asyncio.sleep(0.05)
+            return prompt
+
+        batcher = PromptBatcher(model, window=window)
+        latencies = []
+
+        async def arrive(i: int) -> None:
+            await asyncio.sleep(random.Random(i).uniform(0, 0.002) * i)
+            started = time.perf_counter()
+            await batcher.submit(f"prompt {i}")
+            latencies.append((time.perf_counter() - started) * 1000)
+
+        async def run():
+            await asyncio.gather(*[arrive(i) for i in range(200)])
+
+        asyncio.run(run())
+        stats = batcher.stats()
+        print(f"   window {window * 1000:3.0f} ms   batches {stats['batches'] or len(latencies):4d}   "
+              f"mean batch {stats['mean_batch'] or 1.0:5.1f}   p50 latency {statistics.median(latencies):6.1f} ms")
+
+
+@benchmark("circuit_breaker")
+def bench_circuit_breaker():
+    """Per-request latency during a model-server outage with and without the circuit breaker."""
+    import asyncio
+    import functools
+    from calendar_providers import SyntheticCalendarProvider
+    from circuit_breaker import CircuitBreaker
+    from meeting_scheduler_agent import schedule_meeting_speculative_async
+    from meeting_utils import process_meeting_request
+
+    print("🔌 Model server outage (fake connect timeout: 300 ms, 30 requests, 8 s budget)")
+    rule_based = functools.partial(process_meeting_request, provider=SyntheticCalendarProvider(events_per_day=4),
+                                   reservations=None)
+    requests = synthetic_requests(30)
+
+    for label, breaker in (("no breaker", CircuitBreaker(failure_threshold=10 ** 9)),
+                           ("breaker (3 failures)", CircuitBreaker(failure_threshold=3))):
+        async def unreachable_llm(request_data):
+            async with breaker.guard():
+                await asyncio.sleep(0.3)
+                raise ConnectionError("connection timed out")
+
+        async def failing_llm(request_data):
+            try:
+                return await unreachable_llm(request_data)
+            except Exception as e:
+                return {"status": "error", "error": str(e)}
+
+        samples = []
+        for request in requests:
+            started = time.perf_counter()
+            asyncio.run(schedule_meeting_speculative_async(request, budget=8.0, rule_based=rule_based,
+                                                           llm=failing_llm, reservations=None, breaker=breaker))
+            samples.append((time.perf_counter() - started) * 1000)
+        report(f"{label}, state {breaker.state}", samples)
+
+
+@benchmark("speculative")
+def bench_speculative_scheduling():
+    """End-to-end latency of sequential LLM-then-fallback vs speculative scheduling under a budget."""
+    import asyncio
+    import functools
+    import random
+    from calendar_providers import SyntheticCalendarProvider
+    from meeting_scheduler_agent import schedule_meeting_speculative_async
+    from meeting_utils import process_meeting_request
+
+    print("🏁 Speculative scheduling latency (fake LLM: 0.1-0.5 s, 1 in 10 calls stalls for 5 s)")
+    rule_based = functools.partial(process_meeting_request, provider=SyntheticCalendarProvider(events_per_day=4),
+                                   reservations=None)
+    requests = synthetic_requests(40)
+
+    def llm_delay(i: int) -> float:
+        return 5.0 if i % 10 == 9 else random.Random(i).uniform(0.1, 0.5)
+
+    def fake_llm(delay: float):
+        async def run(request_data):
+            await asyncio.sleep(delay)
+            return {"status": "error", "error": "model stalled"} if delay >= 5.0 else {
+                "status": "success", "event_start": "2025-07-15T10:00:00+05:30",
+                "event_end": "2025-07-15T10:30:00+05:30"}
+        return run
+
+    async def sequential(request_data, delay):
+        result = await fake_llm(delay)(request_data)
+        return result if result["status"] == "success" else await asyncio.to_thread(rule_based, request_data)
+
+    for label, run in (("sequential", lambda request, delay: sequential(request, delay)),
+                       ("speculative, 1 s budget", lambda request, delay: schedule_meeting_speculative_async(
+                           request, budget=1.0, rule_based=rule_based, llm=fake_llm(delay), reservations=None))):
+        samples = []
+        for i, request in enumerate(requests):
+            started = time.perf_counter()
+            asyncio.run(run(request, llm_delay(i)))
+            samples.append((time.perf_counter() - started) * 1000)
+        ordered = sorted(samples)
+        p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+        report(label, samples)
+        print(f"      p99 {p99:8.1f} ms")
+
+
+@benchmark("batch")
+def bench_batch_scheduling():
+    """Requests per second: process_meeting_request one by one vs the batch scheduler."""
+    from batch_scheduler import process_meeting_batch
+    from calendar_providers import SyntheticCalendarProvider
+    from meeting_utils import process_meeting_request
+    from reservations import ReservationTable
+
+    print("📦 Batch scheduling throughput (synthetic calendars, 3 attendees per request)")
+    provider = SyntheticCalendarProvider(events_per_day=4)
+    for num_requests in (100, 1000, 10000):
+        requests = synthetic_requests(num_requests)
+        modes = [("batch", lambda table: process_meeting_batch(requests, provider=provider, reservations=table))]
+        if num_requests <= 1000:
+            modes.insert(0, ("one by one", lambda table: [process_meeting_request(request, provider=provider,
+                                                                                  reservations=table)
+                                                          for request in requests]))
+        for label, run in modes:
+            table = ReservationTable()
+            started = time.perf_counter()
+            responses = run(table)
+            elapsed = time.perf_counter() - started
+            booked = [response for response in responses if "error" not in response]
+            held = [(attendee["email"], attendee["events"][-1]["StartTime"])
+                    for response in booked if not response["scheduling_metadata"]["conflicts_resolved"]
+                    for attendee in response["Attendees"]]
+            clashes = len(held) - len(set(held))
+            print(f"   {label + ' x' + str(num_requests):<24} {num_requests / elapsed:9.1f} req/s   "
+                  f"{elapsed:7.2f} s   holds {table.stats()['holds']}   double-booked {clashes}")
+
+
+@benchmark("import_time")
+def bench_import_time():
+    """Cold import time of the scheduler modules; exits non-zero if a heavy client library is imported eagerly.
+
+    The budget for the rule-based scheduler (meeting_utils) is $IMPORT_BUDGET_MS, 500 ms by default.
+    """
+    budget_ms = float(os.environ.get(IMPORT_BUDGET_ENV, "500"))
+    print(f"🚀 Cold import time (python -X importtime, median of 3, budget {budget_ms:.0f} ms for meeting_utils)")
+    failures = []
+    for module in ("meeting_utils", "calendar_extractor", "meeting_scheduler_agent"):
+        profiles = [import_profile(module) for _ in range(3)]
+        ms = statistics.median(profile["ms"] for profile in profiles)
+        lazy_loaded = profiles[0]["lazy_loaded"]
+        print(f"   {module:<26} {ms:8.1f} ms   eager heavy imports: {', '.join(lazy_loaded) or 'none'}")
+        if lazy_loaded:
+            failures.append(f"{module} imports {lazy_loaded}")
+        if module == "meeting_utils" and ms > budget_ms:
+            failures.append(f"{module} took {ms:.0f} ms")
+    if failures:
+        print(f"   ❌ import-time regression: {'; '.join(failures)}")
+        sys.exit(1)
+
+
+def main(argv: List[str]) -> None:
+    """Run the named benchmarks, or all of them."""
+    names = argv or list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        print(f"Unknown benchmark(s): {unknown}. Available: {list(BENCHMARKS)}")
+        sys.exit(1)
+
+    print("⏱️  AI Meeting Scheduler - Benchmarks")
+    print("=" * 50)
+    for name in names:
+        print()
+        BENCHMARKS[name]()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,31 +1,378 @@
 import json
 import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timezone, timedelta
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
-
-def retrive_calendar_events(user, start, end):
-    events_list = []
-    # Fixed path to work from current directory
-    token_path = os.path.join("Keys", user.split("@")[0] + ".token")
-    user_creds = Credentials.from_authorized_user_file(token_path)
-    calendar_service = build("calendar", "v3", credentials=user_creds)
-    events_result = calendar_service.events().list(calendarId='primary', timeMin=start,timeMax=end,singleEvents=True,orderBy='startTime').execute()
-    events = events_result.get('items')
-    
-    for event in events : 
-        attendee_list = []
-        try:
-            for attendee in event["attendees"]: 
-                attendee_list.append(attendee['email'])
-        except: 
-            attendee_list.append("SELF")
-        start_time = event["start"]["dateTime"]
-        end_time = event["end"]["dateTime"]
-        events_list.append(
-            {"StartTime" : start_time, 
-             "EndTime": end_time, 
-             "NumAttendees" :len(set(attendee_list)), 
-             "Attendees" : list(set(attendee_list)),
-             "Summary" : event["summary"]})
-    return events_list
\ No newline at end of file
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from compact_events import CompactEvent, to_event_dicts, wall_seconds
+from timestamps import DEFAULT_TIMEZONE
+
+KEYS_DIR = "Keys"
+DEFAULT_PAGE_SIZE = 250  # events().list maxResults; the API caps it at 2500
+FREEBUSY_MAX_CALENDARS = 50  # Calendar API limit on calendars per freeBusy query
+
+# The Google client libraries are imported on first use so the rule-based path starts fast
+if TYPE_CHECKING:
+    import httplib2
+    from google.oauth2.credentials import Credentials
+
+
+class CalendarClientRegistry:
+    """Thread-safe per-user cache of Google Calendar service clients.
+
+    Each client is built once per token file. A client is rebuilt when its
+    token file changes on disk (mtime or size), and expired credentials are
+    refreshed under a per-user lock so concurrent Flask workers never refresh
+    the same token twice.
+    """
+
+    def __init__(self, keys_dir: str = KEYS_DIR, api_endpoint: Optional[str] = None):
+        self.keys_dir = keys_dir
+        self.api_endpoint = api_endpoint
+        self._clients: Dict[str, Dict[str, Any]] = {}
+        self._user_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.builds = 0
+        self.hits = 0
+
+    def token_path(self, user: str) -> str:
+        """Return the token file path for a user email."""
+        return os.path.join(self.keys_dir, user.split("@")[0] + ".token")
+
+    def _user_lock(self, user: str) -> threading.Lock:
+        with self._lock:
+            lock = self._user_locks.get(user)
+            if lock is None:
+                lock = self._user_locks[user] = threading.Lock()
+            return lock
+
+    def _thread_http(self) -> "httplib2.Http":
+        # httplib2.Http is not thread-safe, so every worker thread keeps its own
+        # keep-alive connection pool and shares only the parsed service object.
+        http = getattr(self._local, "http", None)
+        if http is None:
+            import httplib2
+            http = self._local.http = httplib2.Http()
+        return http
+
+    def _build(self, user: str, token_path: str) -> Tuple["Credentials", Any]:
+        import google_auth_httplib2
+        from google.oauth2.credentials import Credentials
+        from googleapiclient.discovery import build
+        from googleapiclient.http import HttpRequest
+
+        user_creds = Credentials.from_authorized_user_file(token_path)
+
+        def request_builder(http, *args, **kwargs):
+            authed_http = google_auth_httplib2.AuthorizedHttp(user_creds, http=self._thread_http())
+            return HttpRequest(authed_http, *args, **kwargs)
+
+        client_options = {"api_endpoint": self.api_endpoint} if self.api_endpoint else None
+        calendar_service = build(
+            "calendar", "v3",
+            credentials=user_creds,
+            requestBuilder=request_builder,
+            client_options=client_options,
+            cache_discovery=False,
+        )
+        self.builds += 1
+        return user_creds, calendar_service
+
+    def get(self, user: str):
+        """Return a ready-to-use Calendar service for the user, building it on first use."""
+        token_path = self.token_path(user)
+        stat = os.stat(token_path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        with self._user_lock(user):
+            entry = self._clients.get(user)
+            if entry is None or entry["signature"] != signature:
+                user_creds, calendar_service = self._build(user, token_path)
+                entry = {"signature": signature, "credentials": user_creds, "service": calendar_service}
+                self._clients[user] = entry
+            else:
+                self.hits += 1
+
+            user_creds = entry["credentials"]
+            if not user_creds.valid and user_creds.refresh_token:
+                from google.auth.transport.requests import Request
+                user_creds.refresh(Request())
+
+            return entry["service"]
+
+    def evict(self, user: str) -> None:
+        """Drop the cached client for a user."""
+        with self._user_lock(user):
+            self._clients.pop(user, None)
+
+    def clear(self) -> None:
+        """Drop every cached client."""
+        with self._lock:
+            users = list(self._clients)
+        for user in users:
+            self.evict(user)
+
+    def stats(self) -> Dict[str, int]:
+        """Return build/hit counters and the number of cached clients."""
+        return {"clients": len(self._clients), "builds": self.builds, "hits": self.hits}
+
+
+def _list_event_pages(calendar_service, **params):
+    """Yield every page of an events().list query, following nextPageToken."""
+    page_token = None
+    while True:
+        page = calendar_service.events().list(calendarId='primary', pageToken=page_token, **params).execute()
+        yield page
+        page_token = page.get('nextPageToken')
+        if not page_token:
+            break
+
+
+def _normalize_event(event):
+    """Convert a raw Calendar API event into the StartTime/EndTime/Attendees dict used everywhere."""
+    attendee_list = []
+    try:
+        for attendee in event["attendees"]: 
+            attendee_list.append(attendee['email'])
+    except: 
+        attendee_list.append("SELF")
+    start_time = event["start"]["dateTime"]
+    end_time = event["end"]["dateTime"]
+    return {"StartTime" : start_time, 
+            "EndTime": end_time, 
+            "NumAttendees" :len(set(attendee_list)), 
+            "Attendees" : list(set(attendee_list)),
+            "Summary" : event["summary"]}
+
+
+def _parse_instant(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+def _instant_seconds(dt: datetime) -> Tuple[int, int]:
+    # (wall-clock, UTC epoch) seconds, so naive and aware windows compare without mixing the two;
+    # naive values are wall-clock time in the default timezone
+    aware = DEFAULT_TIMEZONE.localize(dt) if dt.tzinfo is None else dt
+    return wall_seconds(dt), int(aware.timestamp())
+
+
+class CalendarEventCache:
+    """Per-user event cache kept fresh with Calendar API incremental sync tokens.
+
+    The first read for a user does a full sync of the requested window (extended
+    by horizon_days) and stores the nextSyncToken. Later reads inside the synced
+    window are served locally for sync_interval seconds and then refreshed with
+    an incremental sync that only downloads changed events. Entries expire ttl
+    seconds after their full sync, the least recently used user is evicted past
+    max_users, and an invalidated sync token (HTTP 410) triggers a full resync.
+    """
+
+    def __init__(self, max_users: int = 256, ttl: float = 3600.0, sync_interval: float = 30.0,
+                 horizon_days: int = 14, page_size: int = DEFAULT_PAGE_SIZE,
+                 registry: Optional[CalendarClientRegistry] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_users = max_users
+        self.ttl = ttl
+        self.sync_interval = sync_interval
+        self.horizon_days = horizon_days
+        self.page_size = page_size
+        self.registry = registry
+        self.clock = clock
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._user_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.counters = {"hits": 0, "misses": 0, "incremental_syncs": 0, "resyncs": 0, "evictions": 0}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.counters[name] += 1
+
+    def _user_lock(self, user: str) -> threading.Lock:
+        with self._lock:
+            lock = self._user_locks.get(user)
+            if lock is None:
+                lock = self._user_locks[user] = threading.Lock()
+            return lock
+
+    def _service(self, user: str):
+        return (self.registry or calendar_clients).get(user)
+
+    @staticmethod
+    def _prepare(event: Dict[str, Any]) -> CompactEvent:
+        # Normalize and parse once at sync time so cached reads only compare integers
+        return CompactEvent.from_dict(_normalize_event(event))
+
+    def _full_sync(self, user: str, start: str, end: str) -> Dict[str, Any]:
+        start_dt, end_dt = _parse_instant(start), _parse_instant(end)
+        end_dt = max(end_dt, start_dt + timedelta(days=self.horizon_days))
+        events, sync_token = {}, None
+        for page in _list_event_pages(self._service(user), timeMin=start, timeMax=end_dt.isoformat(),
+                                      singleEvents=True, maxResults=self.page_size):
+            for event in page.get('items', []):
+                if event.get('status') != 'cancelled':
+                    events[event['id']] = self._prepare(event)
+            sync_token = page.get('nextSyncToken', sync_token)
+        now = self.clock()
+        return {"events": events, "sync_token": sync_token,
+                "window": (_instant_seconds(start_dt), _instant_seconds(end_dt)),
+                "full_sync_at": now, "synced_at": now}
+
+    def _incremental_sync(self, user: str, entry: Dict[str, Any]) -> None:
+        sync_token = entry["sync_token"]
+        for page in _list_event_pages(self._service(user), syncToken=sync_token, singleEvents=True,
+                                      maxResults=self.page_size):
+            for event in page.get('items', []):
+                if event.get('status') == 'cancelled':
+                    entry["events"].pop(event['id'], None)
+                else:
+                    entry["events"][event['id']] = self._prepare(event)
+            sync_token = page.get('nextSyncToken', sync_token)
+        entry["sync_token"] = sync_token
+        entry["synced_at"] = self.clock()
+
+    def _covers(self, entry: Dict[str, Any], start: str, end: str) -> bool:
+        # Naive request times are compared on wall-clock time, like the slot finder does, aware ones in UTC
+        window_start, window_end = entry["window"]
+        start_dt, end_dt = _parse_instant(start), _parse_instant(end)
+        start_scale, end_scale = int(start_dt.tzinfo is not None), int(end_dt.tzinfo is not None)
+        return (window_start[start_scale] <= _instant_seconds(start_dt)[start_scale] and
+                _instant_seconds(end_dt)[end_scale] <= window_end[end_scale])
+
+    def _store(self, user: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[user] = entry
+            self._entries.move_to_end(user)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+                self.counters["evictions"] += 1
+
+    def get_events(self, user: str, start: str, end: str, compact: bool = False) -> List[Any]:
+        """Return the user's events overlapping [start, end), sorted by start time.
+
+        Events are normalized dicts, or the cached CompactEvents when compact is True.
+        """
+        with self._user_lock(user):
+            with self._lock:
+                entry = self._entries.get(user)
+                if entry is not None:
+                    self._entries.move_to_end(user)
+            now = self.clock()
+
+            if (entry is None or now - entry["full_sync_at"] > self.ttl or
+                    not entry["sync_token"] or not self._covers(entry, start, end)):
+                self._count("misses")
+                entry = self._full_sync(user, start, end)
+            elif now - entry["synced_at"] >= self.sync_interval:
+                try:
+                    self._incremental_sync(user, entry)
+                    self._count("incremental_syncs")
+                except Exception as e:
+                    from googleapiclient.errors import HttpError
+                    if not isinstance(e, HttpError) or e.resp.status != 410:
+                        raise
+                    # Sync token invalidated by the server: start over with a full sync
+                    self._count("resyncs")
+                    entry = self._full_sync(user, start, end)
+            else:
+                self._count("hits")
+            self._store(user, entry)
+
+            start_dt, end_dt = _parse_instant(start), _parse_instant(end)
+            if start_dt.tzinfo is None:
+                # Naive windows are compared on wall-clock time, like the slot finder does
+                window_start, window_end = wall_seconds(start_dt), wall_seconds(end_dt)
+                events_list = [event for event in entry["events"].values()
+                               if event.wall_start < window_end and event.wall_end > window_start]
+                events_list.sort(key=lambda event: event.wall_start)
+            else:
+                window_start, window_end = int(start_dt.timestamp()), int(end_dt.timestamp())
+                events_list = [event for event in entry["events"].values()
+                               if event.start < window_end and event.end > window_start]
+                events_list.sort(key=lambda event: event.start)
+            return events_list if compact else to_event_dicts(events_list)
+
+    def invalidate(self, user: str) -> None:
+        """Forget a user's cached events so the next read does a full sync."""
+        with self._lock:
+            self._entries.pop(user, None)
+
+    def clear(self) -> None:
+        """Forget every cached calendar."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters, the hit rate and the number of cached users."""
+        with self._lock:
+            stats = dict(self.counters)
+            stats["users"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"] + stats["incremental_syncs"] + stats["resyncs"]
+        stats["hit_rate"] = (stats["hits"] + stats["incremental_syncs"]) / lookups if lookups else 0.0
+        return stats
+
+
+calendar_clients = CalendarClientRegistry()
+event_cache = CalendarEventCache()
+
+
+def retrive_calendar_events(user, start, end, registry: Optional[CalendarClientRegistry] = None,
+                            cache: Optional[CalendarEventCache] = None, use_cache: bool = True,
+                            page_size: int = DEFAULT_PAGE_SIZE, compact: bool = False):
+    """Return the user's events in [start, end) as a list.
+
+    Reads go through the module-level sync-token cache unless a specific cache is
+    passed, an explicit client registry is given, or use_cache is False; uncached
+    reads collect every page of iter_calendar_events. With compact=True events
+    come back as pre-parsed CompactEvents instead of dicts.
+    """
+    if cache is None and registry is None and use_cache:
+        cache = event_cache
+    if cache is not None:
+        return cache.get_events(user, start, end, compact=compact)
+
+    events = iter_calendar_events(user, start, end, page_size=page_size, registry=registry)
+    return [CompactEvent.from_dict(event) for event in events] if compact else list(events)
+
+
+def iter_calendar_events(user, start, end, page_size: int = DEFAULT_PAGE_SIZE,
+                         registry: Optional[CalendarClientRegistry] = None) -> Iterator[Dict[str, Any]]:
+    """Yield the user's normalized events in [start, end) as each page arrives.
+
+    Follows nextPageToken until the last page, requesting page_size events at a
+    time, so consumers can start work before the whole window has downloaded.
+    """
+    calendar_service = (registry or calendar_clients).get(user)
+    for page in _list_event_pages(calendar_service, timeMin=start, timeMax=end, singleEvents=True,
+                                  orderBy='startTime', maxResults=page_size):
+        for event in page.get('items', []):
+            yield _normalize_event(event)
+
+
+def retrive_busy_intervals(users, start, end, requester=None, time_zone=None,
+                           registry: Optional[CalendarClientRegistry] = None):
+    """Fetch busy intervals for many calendars with FreeBusy queries instead of listing events.
+
+    One query covers up to FREEBUSY_MAX_CALENDARS calendars and is issued with the
+    requester's credentials (the first user by default). Intervals are reported in
+    time_zone (for example "Asia/Kolkata") when given, otherwise in UTC. Returns a
+    dict mapping each user to a list of {"start", "end"} intervals, or to
+    {"error": ...} when the API reports an error for that calendar.
+    """
+    calendar_service = (registry or calendar_clients).get(requester or users[0])
+    busy = {}
+    for offset in range(0, len(users), FREEBUSY_MAX_CALENDARS):
+        chunk = users[offset:offset + FREEBUSY_MAX_CALENDARS]
+        body = {"timeMin": start, "timeMax": end, "items": [{"id": user} for user in chunk]}
+        if time_zone:
+            body["timeZone"] = time_zone
+        calendars = calendar_service.freebusy().query(body=body).execute().get("calendars", {})
+        for user in chunk:
+            calendar = calendars.get(user, {})
+            if calendar.get("errors"):
+                busy[user] = {"error": ", ".join(error.get("reason", "unknown") for error in calendar["errors"])}
+            else:
+                busy[user] = calendar.get("busy", [])
+    return busy
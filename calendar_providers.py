@@ -0,0 +1,207 @@
+import json
+import random
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+import pytz
+
+from compact_events import CompactEvent
+from timestamps import timestamps
+
+DEFAULT_TIMEZONE = pytz.timezone('Asia/Kolkata')
+
+
+def _parse_window_time(value: str, tz=DEFAULT_TIMEZONE) -> datetime:
+    """Parse an ISO timestamp, treating naive values as wall-clock time in tz."""
+    return timestamps.aware(value, tz)
+
+
+class CalendarProvider:
+    """Source of attendee calendars for MeetingScheduler.
+
+    Subclasses implement get_events; get_compact_events and get_busy_intervals
+    default to deriving their results from get_events and can be overridden by
+    backends that store pre-parsed events or have a cheaper bulk query.
+    """
+
+    name = "base"
+
+    def get_events(self, user: str, start: str, end: str) -> List[Dict[str, Any]]:
+        """Return the user's events overlapping [start, end) as StartTime/EndTime/Attendees/Summary dicts."""
+        raise NotImplementedError
+
+    def get_compact_events(self, user: str, start: str, end: str) -> List[CompactEvent]:
+        """Return the same events as pre-parsed CompactEvents."""
+        return [CompactEvent.from_dict(event) for event in self.get_events(user, start, end)]
+
+    def get_busy_intervals(self, users: List[str], start: str, end: str,
+                           time_zone: Optional[str] = None) -> Dict[str, Any]:
+        """Return {user: [{"start", "end"}]} or {user: {"error": ...}} for every user."""
+        busy = {}
+        for user in users:
+            try:
+                busy[user] = [{"start": event["StartTime"], "end": event["EndTime"]}
+                              for event in self.get_events(user, start, end)]
+            except Exception as e:
+                busy[user] = {"error": str(e)}
+        return busy
+
+
+class GoogleCalendarProvider(CalendarProvider):
+    """Google Calendar API backend (needs tokens in Keys/ and network access)."""
+
+    name = "google"
+
+    def __init__(self, registry=None, cache=None, use_cache: bool = True):
+        self.registry = registry
+        self.cache = cache
+        self.use_cache = use_cache
+
+    def get_events(self, user: str, start: str, end: str) -> List[Dict[str, Any]]:
+        from calendar_extractor import retrive_calendar_events
+        return retrive_calendar_events(user, start, end, registry=self.registry, cache=self.cache,
+                                       use_cache=self.use_cache)
+
+    def get_compact_events(self, user: str, start: str, end: str) -> List[CompactEvent]:
+        from calendar_extractor import retrive_calendar_events
+        return retrive_calendar_events(user, start, end, registry=self.registry, cache=self.cache,
+                                       use_cache=self.use_cache, compact=True)
+
+    def get_busy_intervals(self, users: List[str], start: str, end: str,
+                           time_zone: Optional[str] = None) -> Dict[str, Any]:
+        from calendar_extractor import retrive_busy_intervals
+        return retrive_busy_intervals(users, start, end, time_zone=time_zone, registry=self.registry)
+
+
+class LocalCalendarProvider(CalendarProvider):
+    """SQLite-backed calendar store for offline runs and load tests.
+
+    Seed it from files shaped like 3_Output_Event.json with load_output_event_file,
+    or add events directly. Uses an in-memory database unless db_path is given.
+    """
+
+    name = "local"
+
+    def __init__(self, db_path: str = ":memory:", tz=DEFAULT_TIMEZONE):
+        self.tz = tz
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS events ("
+            " user TEXT NOT NULL, start_ts REAL NOT NULL, end_ts REAL NOT NULL, payload TEXT NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS events_user_start ON events (user, start_ts)")
+        self._conn.commit()
+
+    @classmethod
+    def from_json(cls, path: str, db_path: str = ":memory:") -> "LocalCalendarProvider":
+        """Create a provider seeded from a 3_Output_Event.json-shaped file."""
+        provider = cls(db_path)
+        provider.load_output_event_file(path)
+        return provider
+
+    def add_event(self, user: str, event: Dict[str, Any]) -> None:
+        """Store one event for a user."""
+        self.add_events(user, [event])
+
+    def add_events(self, user: str, events: Iterable[Dict[str, Any]]) -> None:
+        """Store events for a user in one transaction."""
+        rows = []
+        for event in events:
+            start_ts = _parse_window_time(event["StartTime"], self.tz).timestamp()
+            end_ts = _parse_window_time(event["EndTime"], self.tz).timestamp()
+            rows.append((user, start_ts, end_ts, json.dumps(event)))
+        with self._lock:
+            self._conn.executemany("INSERT INTO events VALUES (?, ?, ?, ?)", rows)
+            self._conn.commit()
+
+    def load_output_event_file(self, path: str) -> int:
+        """Load every attendee's events from a 3_Output_Event.json-shaped file; returns the count."""
+        with open(path, "r") as f:
+            data = json.load(f)
+        loaded = 0
+        for attendee in data.get("Attendees", []):
+            events = attendee.get("events", [])
+            self.add_events(attendee["email"], events)
+            loaded += len(events)
+        return loaded
+
+    def get_events(self, user: str, start: str, end: str) -> List[Dict[str, Any]]:
+        start_ts = _parse_window_time(start, self.tz).timestamp()
+        end_ts = _parse_window_time(end, self.tz).timestamp()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT payload FROM events WHERE user = ? AND start_ts < ? AND end_ts > ? ORDER BY start_ts",
+                (user, end_ts, start_ts),
+            ).fetchall()
+        return [json.loads(payload) for (payload,) in rows]
+
+
+class SyntheticCalendarProvider(CalendarProvider):
+    """Deterministic generated calendars with configurable latency and event density.
+
+    Every (user, day) pair gets events_per_day weekday events placed on a
+    15-minute grid inside business hours, so repeated queries over any window
+    see the same calendar. latency seconds are slept per get_events call and
+    once per get_busy_intervals call, mimicking one round trip each.
+    """
+
+    name = "synthetic"
+
+    def __init__(self, events_per_day: int = 4, latency: float = 0.0, seed: int = 0,
+                 business_start: int = 9, business_end: int = 18, tz=DEFAULT_TIMEZONE):
+        self.events_per_day = events_per_day
+        self.latency = latency
+        self.seed = seed
+        self.business_start = business_start
+        self.business_end = business_end
+        self.tz = tz
+
+    def _events_for_day(self, user: str, day: datetime) -> List[Dict[str, Any]]:
+        rng = random.Random(f"{self.seed}:{user}:{day.date().isoformat()}")
+        slots_per_day = (self.business_end - self.business_start) * 4
+        events = []
+        for i in range(self.events_per_day):
+            duration = rng.choice((15, 30, 30, 45, 60))
+            offset = rng.randrange(max(1, slots_per_day - duration // 15 + 1)) * 15
+            start = self.tz.localize(day.replace(hour=self.business_start, minute=0) + timedelta(minutes=offset))
+            end = start + timedelta(minutes=duration)
+            events.append({
+                "StartTime": start.isoformat(),
+                "EndTime": end.isoformat(),
+                "NumAttendees": 1,
+                "Attendees": [user],
+                "Summary": f"Synthetic event {i + 1}"
+            })
+        events.sort(key=lambda event: event["StartTime"])
+        return events
+
+    def _generate(self, user: str, start: str, end: str) -> List[Dict[str, Any]]:
+        start_dt = _parse_window_time(start, self.tz).astimezone(self.tz)
+        end_dt = _parse_window_time(end, self.tz).astimezone(self.tz)
+        day = start_dt.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+        events = []
+        while self.tz.localize(day) < end_dt:
+            if day.weekday() < 5:
+                for event in self._events_for_day(user, day):
+                    if (timestamps.parse(event["StartTime"]) < end_dt and
+                            timestamps.parse(event["EndTime"]) > start_dt):
+                        events.append(event)
+            day += timedelta(days=1)
+        return events
+
+    def get_events(self, user: str, start: str, end: str) -> List[Dict[str, Any]]:
+        if self.latency:
+            time.sleep(self.latency)
+        return self._generate(user, start, end)
+
+    def get_busy_intervals(self, users: List[str], start: str, end: str,
+                           time_zone: Optional[str] = None) -> Dict[str, Any]:
+        if self.latency:
+            time.sleep(self.latency)
+        return {user: [{"start": event["StartTime"], "end": event["EndTime"]}
+                       for event in self._generate(user, start, end)]
+                for user in users}
@@ -0,0 +1,239 @@
+import os
+import threading
+import time
+import urllib.request
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, Optional
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+BREAKER_FAILURES_ENV = "LLM_BREAKER_FAILURES"
+BREAKER_RESET_ENV = "LLM_BREAKER_RESET"
+PROBE_INTERVAL_ENV = "LLM_PROBE_INTERVAL"
+# httpx and openai transport errors, matched by class name so neither library has to be imported here
+TRANSPORT_ERROR_NAMES = {"TransportError", "TimeoutException", "APIConnectionError", "APITimeoutError"}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the model while the circuit breaker is open."""
+
+
+def is_transport_error(error: BaseException) -> bool:
+    """True for failures that say the model server is unreachable or broken: connection errors, timeouts and 5xx.
+
+    Anything else (a validation error, a 4xx, a bug in the caller) says nothing
+    about the server's health and must not trip the breaker.
+    """
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    if any(cls.__name__ in TRANSPORT_ERROR_NAMES for cls in type(error).__mro__):
+        return True
+    response = getattr(error, "response", None)
+    status = getattr(error, "status_code", None) or getattr(response, "status_code", None)
+    return isinstance(status, int) and status >= 500
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker around model-server calls.
+
+    failure_threshold consecutive failures open the circuit, and while it is
+    open callers skip the model entirely. After reset_timeout seconds it goes
+    half-open and lets a single trial call through: success closes it, failure
+    opens it again. A health prober can also open or close it directly. Only
+    transport failures (see is_transport_error) count; other errors and
+    cancelled calls (e.g. a missed latency budget) count as neither.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._last_error: Optional[str] = None
+        self._lock = threading.Lock()
+        self.counters = {"successes": 0, "failures": 0, "rejected": 0, "opened": 0}
+
+    @classmethod
+    def from_env(cls) -> "CircuitBreaker":
+        """Breaker configured by $LLM_BREAKER_FAILURES (default 3) and $LLM_BREAKER_RESET seconds (default 30)."""
+        return cls(failure_threshold=int(os.environ.get(BREAKER_FAILURES_ENV, "3")),
+                   reset_timeout=float(os.environ.get(BREAKER_RESET_ENV, "30")))
+
+    def _refresh(self) -> None:
+        if self._state == OPEN and self.clock() - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._trial_in_flight = False
+
+    def _open(self, error: Optional[str]) -> None:
+        if self._state != OPEN:
+            self.counters["opened"] += 1
+        self._state = OPEN
+        self._opened_at = self.clock()
+        self._trial_in_flight = False
+        self._last_error = error
+
+    @property
+    def state(self) -> str:
+        """Current state: "closed", "open" or "half_open"."""
+        with self._lock:
+            self._refresh()
+            return self._state
+
+    def available(self) -> bool:
+        """True if a call would be let through right now; unlike allow(), reserves nothing."""
+        with self._lock:
+            self._refresh()
+            return self._state == CLOSED or (self._state == HALF_OPEN and not self._trial_in_flight)
+
+    def allow(self) -> bool:
+        """Admit one call: always when closed, once as the trial when half-open, never when open."""
+        with self._lock:
+            self._refresh()
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self.counters["rejected"] += 1
+            return False
+
+    def record_success(self) -> None:
+        """Close the circuit and reset the failure count."""
+        with self._lock:
+            self.counters["successes"] += 1
+            self._state = CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self, error: Any = None) -> None:
+        """Count a failure; opens the circuit at the threshold or when the half-open trial fails."""
+        with self._lock:
+            self.counters["failures"] += 1
+            self._failures += 1
+            self._refresh()
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._open(str(error) if error is not None else None)
+
+    def trip(self, error: Any = None) -> None:
+        """Open the circuit immediately, e.g. when the health probe fails."""
+        with self._lock:
+            self._failures = max(self._failures, self.failure_threshold)
+            self._open(str(error) if error is not None else None)
+
+    def recover(self) -> None:
+        """Close an open or half-open circuit, e.g. when the health probe succeeds; no-op when closed."""
+        with self._lock:
+            if self._state != CLOSED:
+                self._state = CLOSED
+                self._failures = 0
+                self._trial_in_flight = False
+
+    def _release_trial(self) -> None:
+        with self._lock:
+            self._trial_in_flight = False
+
+    @asynccontextmanager
+    async def guard(self):
+        """Wrap one model call: raise CircuitOpenError if not admitted, else record how it ended.
+
+        Transport failures are counted; any other exception is re-raised
+        without touching the failure count.
+        """
+        if not self.allow():
+            raise CircuitOpenError(f"LLM circuit open: {self._last_error or 'model server unavailable'}")
+        try:
+            yield
+        except Exception as e:
+            if is_transport_error(e):
+                self.record_failure(e)
+            else:
+                self._release_trial()
+            raise
+        except BaseException:
+            self._release_trial()
+            raise
+        else:
+            self.record_success()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the state, consecutive failures, seconds until half-open, last error and counters."""
+        with self._lock:
+            self._refresh()
+            stats = dict(self.counters)
+            stats.update(state=self._state, consecutive_failures=self._failures, last_error=self._last_error,
+                         retry_in=max(0.0, self.reset_timeout - (self.clock() - self._opened_at))
+                         if self._state == OPEN else 0.0)
+        return stats
+
+
+class HealthProber:
+    """Daemon thread that polls the model server's /v1/models and feeds the result to a breaker.
+
+    A failed probe opens the circuit at once, so requests stop paying the
+    connect timeout even before any of them fail; a successful probe closes it
+    again as soon as the server is back.
+    """
+
+    def __init__(self, breaker: CircuitBreaker, url: str, interval: float = 10.0, timeout: float = 2.0,
+                 headers: Optional[Dict[str, str]] = None):
+        self.breaker = breaker
+        self.url = url
+        self.interval = interval
+        self.timeout = timeout
+        self.headers = headers or {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.last_probe: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_env(cls, breaker: CircuitBreaker, url: str, **kwargs) -> "HealthProber":
+        """Prober polling every $LLM_PROBE_INTERVAL seconds (default 10)."""
+        return cls(breaker, url, interval=float(os.environ.get(PROBE_INTERVAL_ENV, "10")), **kwargs)
+
+    def probe_once(self) -> bool:
+        """Probe the endpoint once and update the breaker; returns whether the server answered 2xx."""
+        started = time.perf_counter()
+        try:
+            request = urllib.request.Request(self.url, headers=self.headers)
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                ok, error = 200 <= response.status < 300, f"HTTP {response.status}"
+        except Exception as e:
+            ok, error = False, str(e)
+        self.last_probe = {"ok": ok, "at": time.time(), "latency_ms": (time.perf_counter() - started) * 1000,
+                           "error": None if ok else error}
+        if ok:
+            self.breaker.recover()
+        else:
+            self.breaker.trip(f"health probe failed: {error}")
+        return ok
+
+    def start(self) -> None:
+        """Start probing in the background; does nothing if already running."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="llm-health-probe", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.probe_once()
+            self._stop.wait(self.interval)
+
+    def stop(self) -> None:
+        """Stop the probe thread."""
+        self._stop.set()
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=self.timeout + 1)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the probed URL, interval, whether the thread runs and the last probe result."""
+        return {"url": self.url, "interval": self.interval,
+                "running": self._thread is not None and self._thread.is_alive(), "last_probe": self.last_probe}
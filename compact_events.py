@@ -0,0 +1,133 @@
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from timestamps import timestamps, wall_seconds
+
+EPOCH = datetime(1970, 1, 1)
+EVENT_KEYS = ("StartTime", "EndTime", "NumAttendees", "Attendees", "Summary")
+
+
+class AttendeeInterner:
+    """Thread-safe two-way mapping between attendee emails and small integer IDs."""
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._emails: List[str] = []
+        self._lock = threading.Lock()
+
+    def intern(self, email: str) -> int:
+        """Return the ID for an email, assigning the next one on first sight."""
+        attendee_id = self._ids.get(email)
+        if attendee_id is None:
+            with self._lock:
+                attendee_id = self._ids.get(email)
+                if attendee_id is None:
+                    attendee_id = self._ids[email] = len(self._emails)
+                    self._emails.append(email)
+        return attendee_id
+
+    def email(self, attendee_id: int) -> str:
+        """Return the email behind an ID."""
+        return self._emails[attendee_id]
+
+    def __len__(self) -> int:
+        return len(self._emails)
+
+
+attendee_ids = AttendeeInterner()
+
+_timezones: Dict[int, timezone] = {}
+
+
+def _format(epoch: int, offset: Optional[int]) -> str:
+    if offset is None:
+        return (EPOCH + timedelta(seconds=epoch)).isoformat()
+    tz = _timezones.get(offset)
+    if tz is None:
+        tz = _timezones[offset] = timezone(timedelta(seconds=offset))
+    return datetime.fromtimestamp(epoch, tz).isoformat()
+
+
+class CompactEvent:
+    """Pre-parsed calendar event: epoch-second bounds, interned attendee IDs and summary.
+
+    Times are parsed once, when the event enters the system; start/end hold UTC
+    epoch seconds and offset the original UTC offset (None for naive times) so
+    the ISO strings can be rebuilt for responses. Supports event["StartTime"]
+    style reads for code that still expects the dict shape.
+    """
+
+    __slots__ = ("start", "end", "offset", "attendee_ids", "summary")
+
+    def __init__(self, start: int, end: int, offset: Optional[int], attendee_ids: Tuple[int, ...], summary: str):
+        self.start = start
+        self.end = end
+        self.offset = offset
+        self.attendee_ids = attendee_ids
+        self.summary = summary
+
+    @classmethod
+    def from_dict(cls, event: Dict[str, Any], interner: AttendeeInterner = attendee_ids) -> "CompactEvent":
+        """Build from a StartTime/EndTime/Attendees/Summary dict."""
+        start, offset = timestamps.epoch_offset(event["StartTime"])
+        end, _ = timestamps.epoch_offset(event["EndTime"])
+        return cls(start, end, offset,
+                   tuple(interner.intern(email) for email in event.get("Attendees", ())),
+                   sys.intern(event.get("Summary", "")))
+
+    @property
+    def wall_start(self) -> int:
+        """Start as wall-clock seconds in the event's own offset (what the slot finder compares)."""
+        return self.start + (self.offset or 0)
+
+    @property
+    def wall_end(self) -> int:
+        """End as wall-clock seconds in the event's own offset."""
+        return self.end + (self.offset or 0)
+
+    def attendees(self, interner: AttendeeInterner = attendee_ids) -> List[str]:
+        """Attendee emails."""
+        return [interner.email(attendee_id) for attendee_id in self.attendee_ids]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Rebuild the StartTime/EndTime/NumAttendees/Attendees/Summary dict."""
+        return {
+            "StartTime": _format(self.start, self.offset),
+            "EndTime": _format(self.end, self.offset),
+            "NumAttendees": len(self.attendee_ids),
+            "Attendees": self.attendees(),
+            "Summary": self.summary
+        }
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "StartTime":
+            return _format(self.start, self.offset)
+        if key == "EndTime":
+            return _format(self.end, self.offset)
+        if key == "NumAttendees":
+            return len(self.attendee_ids)
+        if key == "Attendees":
+            return self.attendees()
+        if key == "Summary":
+            return self.summary
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self[key] if key in EVENT_KEYS else default
+
+    def __repr__(self) -> str:
+        return f"CompactEvent({_format(self.start, self.offset)}, {_format(self.end, self.offset)}, {self.summary!r})"
+
+
+def event_wall_bounds(event) -> Tuple[int, int]:
+    """(start, end) wall-clock seconds for a CompactEvent or an event dict."""
+    if isinstance(event, CompactEvent):
+        return event.wall_start, event.wall_end
+    return timestamps.wall(event["StartTime"]), timestamps.wall(event["EndTime"])
+
+
+def to_event_dicts(events: Iterable[Any]) -> List[Dict[str, Any]]:
+    """Convert CompactEvents (and pass through dicts) for JSON responses."""
+    return [event.to_dict() if isinstance(event, CompactEvent) else event for event in events]
@@ -0,0 +1,129 @@
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from extraction_cache import ExtractionCache, default_extraction_cache
+
+URGENCY_KEYWORDS = ("urgent", "asap", "critical")
+
+# Keyword cue -> (kind, value)
+_KEYWORDS: Dict[str, Tuple[str, Any]] = {
+    "monday": ("weekday", 0), "tuesday": ("weekday", 1), "wednesday": ("weekday", 2),
+    "thursday": ("weekday", 3), "friday": ("weekday", 4),
+    "tomorrow": ("relative_day", "tomorrow"), "today": ("relative_day", "today"),
+    "morning": ("part_of_day", "morning"), "afternoon": ("part_of_day", "afternoon"),
+    "urgent": ("priority", "high"), "asap": ("priority", "high"),
+    "immediately": ("priority", "high"), "critical": ("priority", "high"),
+    "when convenient": ("priority", "low"), "flexible": ("priority", "low"), "no rush": ("priority", "low"),
+    "half hour": ("duration", 30), "half an hour": ("duration", 30),
+}
+
+# Every cue in one alternation, scanned once with findall. Capture groups are left
+# out on purpose (they halve sre's speed) and number tokens are split up afterwards;
+# the leading lookahead lets sre skip every position that can't start a cue.
+_EMAIL_CUES = re.compile(
+    "(?=[%s0-9])(?:%s" % ("".join(sorted({key[0] for key in _KEYWORDS})),
+                          "|".join(re.escape(key) for key in sorted(_KEYWORDS, key=len, reverse=True)))
+    + r"""|(?:0|1|2|3|4|5|6|7|8|9)\d*(?:[.:]\d+)?(?:
+          \s*-?\s*(?:hours?|hrs?|h)\b(?:\s*(?:and\s+)?\d+\s*-?\s*(?:minutes?|mins?|m)\b)?
+        | \s*-?\s*(?:minutes?|mins?)\b
+        | \s*[ap]\.?m\b
+    )?)""", re.VERBOSE)
+
+_NUMBER_CUE = re.compile(r"""
+    (?P<value>\d+)(?:(?P<sep>[.:])(?P<fraction>\d+))?\s*-?\s*
+    (?:(?P<hours>hours?|hrs?|h)(?:\s*(?:and\s+)?(?P<extra>\d+)\D*)?
+     | (?P<minutes>minutes?|mins?)
+     | (?P<meridiem>[ap])\.?m)?
+""", re.VERBOSE)
+
+PART_OF_DAY_TIMES = {"morning": (10, 0), "afternoon": (14, 0)}
+
+
+@lru_cache(maxsize=4096)
+def _number_cue(token: str) -> Tuple[Optional[str], Any]:
+    # "1.5 hours" / "1 hour 30 min" / "45-minute" -> duration, "2:30 pm" / "14:00" -> clock time
+    match = _NUMBER_CUE.fullmatch(token)
+    if match is None:
+        return None, None
+    value, sep, fraction = int(match.group("value")), match.group("sep"), match.group("fraction")
+    if match.group("hours"):
+        hours = float(f"{value}.{fraction}") if sep == "." else value
+        return "duration", int(round(hours * 60)) + int(match.group("extra") or 0)
+    if match.group("minutes"):
+        return ("duration", value) if sep is None else (None, None)
+    if match.group("meridiem"):
+        minute = int(fraction) if fraction else 0
+        if not 1 <= value <= 12 or minute > 59:
+            return None, None
+        return "clock", (value % 12 + (12 if match.group("meridiem") == "p" else 0), minute)
+    if sep == ":" and value <= 23 and len(fraction) == 2 and int(fraction) <= 59:
+        return "clock", (value, int(fraction))
+    return None, None
+
+
+def extract_email_details(email_content: str) -> Dict[str, Any]:
+    """Scan an email once and return every scheduling cue found in it.
+
+    Returns duration_minutes (first duration mentioned, None if none), weekday
+    (0-4 for the earliest weekday named, None if none), relative_day ("tomorrow"
+    beats "today"), meeting_time ((hour, minute) of the first explicit clock
+    time, else of "morning"/"afternoon", else None), part_of_day, priority
+    ("high", "low" or "medium") and urgency_keywords. Precedence between cues
+    matches the keyword chains this replaces.
+    """
+    duration = clock_time = part_of_day = None
+    weekdays: List[int] = []
+    relative_days = set()
+    priorities = set()
+    keywords = set()
+
+    for token in _EMAIL_CUES.findall(email_content.lower()):
+        cue = _KEYWORDS.get(token)
+        kind, value = cue if cue else _number_cue(token)
+        if kind == "duration":
+            if duration is None and value:
+                duration = value
+        elif kind == "clock":
+            if clock_time is None:
+                clock_time = value
+        elif kind == "weekday":
+            weekdays.append(value)
+        elif kind == "relative_day":
+            relative_days.add(value)
+        elif kind == "part_of_day":
+            if part_of_day is None:
+                part_of_day = value
+        elif kind == "priority":
+            priorities.add(value)
+            keywords.add(token)
+
+    if "tomorrow" in relative_days:
+        relative_day = "tomorrow"
+    else:
+        relative_day = "today" if "today" in relative_days else None
+    if "high" in priorities:
+        priority = "high"
+    else:
+        priority = "low" if "low" in priorities else "medium"
+
+    return {
+        "duration_minutes": duration,
+        "weekday": min(weekdays) if weekdays else None,
+        "relative_day": relative_day,
+        "meeting_time": clock_time or PART_OF_DAY_TIMES.get(part_of_day),
+        "part_of_day": part_of_day,
+        "priority": priority,
+        "urgency_keywords": [word for word in URGENCY_KEYWORDS if word in keywords],
+    }
+
+
+def cached_email_details(email_content: str,
+                         cache: Optional[ExtractionCache] = default_extraction_cache) -> Dict[str, Any]:
+    """extract_email_details through the extraction cache (the cues only depend on the text).
+
+    Results come back JSON-decoded, so meeting_time is a list here.
+    """
+    if cache is None:
+        return extract_email_details(email_content)
+    return cache.get_or_compute("rules", email_content, lambda: extract_email_details(email_content))
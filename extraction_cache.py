@@ -0,0 +1,160 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from timestamps import timestamps
+
+EXTRACTION_CACHE_ENV = "EXTRACTION_CACHE_DB"
+
+
+def normalize_email(email_content: str) -> str:
+    """Case- and whitespace-insensitive form of an email body, what cache keys are built from."""
+    return " ".join(email_content.lower().split())
+
+
+def reference_day(datetime_ref: str) -> str:
+    """The calendar day of a request Datetime, as the anchor for results that resolve relative dates."""
+    try:
+        return timestamps.parse_wall(datetime_ref).date().isoformat()
+    except ValueError:
+        return datetime_ref or ""
+
+
+class ExtractionCache:
+    """LRU/TTL cache of extraction results keyed by normalized email text and a reference anchor.
+
+    Templated senders send the same bodies over and over, so both the rule-based
+    extractor and the date-range agent are cached here under separate namespaces.
+    The anchor is whatever the result depends on besides the text: empty for
+    text-only cues, the reference day for answers with resolved dates. Values
+    are stored as JSON, so every lookup returns a fresh, JSON-decoded copy. With db_path, entries
+    are also written to SQLite and read back after a restart; expired rows are
+    dropped when they are next looked up.
+    """
+
+    def __init__(self, max_entries: int = 4096, ttl: Optional[float] = 86400.0, db_path: Optional[str] = None,
+                 clock: Callable[[], float] = time.time):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.db_path = db_path
+        self.clock = clock
+        self._entries: "OrderedDict[Tuple[str, str, str], Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        if db_path:
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS extractions (key TEXT PRIMARY KEY, payload TEXT NOT NULL,"
+                " stored_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+        self.counters = {"hits": 0, "disk_hits": 0, "misses": 0, "expired": 0, "evictions": 0, "stores": 0}
+
+    @classmethod
+    def from_env(cls) -> "ExtractionCache":
+        """Cache persisted to the SQLite file named by $EXTRACTION_CACHE_DB, or memory-only."""
+        return cls(db_path=os.environ.get(EXTRACTION_CACHE_ENV) or None)
+
+    @staticmethod
+    def key(namespace: str, email_content: str, anchor: str = "") -> Tuple[str, str, str]:
+        """In-memory cache key."""
+        return namespace, anchor, normalize_email(email_content)
+
+    @staticmethod
+    def _disk_key(key: Tuple[str, str, str]) -> str:
+        # Email bodies are only stored on disk as a digest
+        namespace, anchor, normalized = key
+        return f"{namespace}:{anchor}:{hashlib.sha256(normalized.encode()).hexdigest()}"
+
+    def _expired(self, stored_at: float) -> bool:
+        return self.ttl is not None and self.clock() - stored_at > self.ttl
+
+    def _remember(self, key: Tuple[str, str, str], payload: str, stored_at: float) -> None:
+        # Caller holds self._lock
+        self._entries[key] = (payload, stored_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.counters["evictions"] += 1
+
+    def get(self, namespace: str, email_content: str, anchor: str = "") -> Optional[Any]:
+        """Cached result, or None on a miss."""
+        key = self.key(namespace, email_content, anchor)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if not self._expired(entry[1]):
+                    self._entries.move_to_end(key)
+                    self.counters["hits"] += 1
+                    return json.loads(entry[0])
+                del self._entries[key]
+                self.counters["expired"] += 1
+            if self._conn is not None:
+                disk_key = self._disk_key(key)
+                row = self._conn.execute("SELECT payload, stored_at FROM extractions WHERE key = ?",
+                                         (disk_key,)).fetchone()
+                if row is not None:
+                    if not self._expired(row[1]):
+                        self._remember(key, row[0], row[1])
+                        self.counters["disk_hits"] += 1
+                        return json.loads(row[0])
+                    self._conn.execute("DELETE FROM extractions WHERE key = ?", (disk_key,))
+                    self._conn.commit()
+                    self.counters["expired"] += 1
+            self.counters["misses"] += 1
+            return None
+
+    def put(self, namespace: str, email_content: str, value: Any, anchor: str = "") -> str:
+        """Store a JSON-serializable result; returns its JSON payload."""
+        key = self.key(namespace, email_content, anchor)
+        payload = json.dumps(value)
+        stored_at = self.clock()
+        with self._lock:
+            self._remember(key, payload, stored_at)
+            self.counters["stores"] += 1
+            if self._conn is not None:
+                self._conn.execute("INSERT OR REPLACE INTO extractions VALUES (?, ?, ?)",
+                                   (self._disk_key(key), payload, stored_at))
+                self._conn.commit()
+        return payload
+
+    def get_or_compute(self, namespace: str, email_content: str, compute: Callable[[], Any],
+                       anchor: str = "") -> Any:
+        """Cached result, computing and storing it on a miss; JSON-decoded either way."""
+        value = self.get(namespace, email_content, anchor)
+        if value is None:
+            value = json.loads(self.put(namespace, email_content, compute(), anchor))
+        return value
+
+    def clear(self) -> None:
+        """Drop every entry, in memory and on disk."""
+        with self._lock:
+            self._entries.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM extractions")
+                self._conn.commit()
+
+    def close(self) -> None:
+        """Close the SQLite connection; the cache keeps working from memory."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters, the hit rate and the number of entries in memory."""
+        with self._lock:
+            stats = dict(self.counters)
+            stats["entries"] = len(self._entries)
+            stats["persistent"] = self._conn is not None
+        lookups = stats["hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        return stats
+
+
+default_extraction_cache = ExtractionCache.from_env()
@@ -0,0 +1,120 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from extraction_cache import ExtractionCache
+
+LLM_CACHE_ENV = "LLM_CACHE_DB"
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Whitespace-insensitive form of a prompt; JSON prompts are also re-serialized with sorted keys."""
+    try:
+        value = json.loads(prompt)
+    except (TypeError, ValueError):
+        return " ".join(str(prompt).split())
+    if isinstance(value, dict):
+        value = {key: " ".join(item.split()) if isinstance(item, str) else item for key, item in value.items()}
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def agent_identity(name: str, agent: Any) -> str:
+    """Cache namespace for an agent: its name, model and a digest of its system prompts."""
+    model = getattr(getattr(agent, "model", None), "model_name", "")
+    prompts = "\n".join(str(prompt) for prompt in getattr(agent, "_system_prompts", ()))
+    return f"{name}:{model}:{hashlib.sha256(prompts.encode()).hexdigest()[:16]}"
+
+
+def is_json(output: Any) -> bool:
+    """True for outputs that parse as JSON, the only ones worth caching for JSON-answering agents."""
+    try:
+        json.loads(output)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+class LLMResponseCache(ExtractionCache):
+    """LRU/TTL cache of agent outputs with single-flight de-duplication.
+
+    Entries are keyed by agent identity (name, model, system prompt digest) and
+    the normalized prompt, and persisted to SQLite with db_path like
+    ExtractionCache. run() makes concurrent calls for the same key share one
+    model call, also across threads and event loops: the first caller runs it
+    and the others await its result. Failures are passed to every waiter and
+    not cached; if the running caller is cancelled, a waiter takes over.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = 3600.0, db_path: Optional[str] = None,
+                 clock: Callable[[], float] = time.time):
+        super().__init__(max_entries=max_entries, ttl=ttl, db_path=db_path, clock=clock)
+        self._inflight: Dict[Tuple[str, str, str], Future] = {}
+        self.counters["coalesced"] = 0
+
+    @classmethod
+    def from_env(cls) -> "LLMResponseCache":
+        """Cache persisted to the SQLite file named by $LLM_CACHE_DB, or memory-only."""
+        return cls(db_path=os.environ.get(LLM_CACHE_ENV) or None)
+
+    @staticmethod
+    def key(namespace: str, prompt: str, anchor: str = "") -> Tuple[str, str, str]:
+        """In-memory cache key."""
+        return namespace, anchor, normalize_prompt(prompt)
+
+    async def run(self, identity: str, prompt: str, call: Callable[[], Awaitable[str]],
+                  cacheable: Optional[Callable[[str], bool]] = None, anchor: str = "") -> str:
+        """Cached output for (identity, anchor, prompt), else await call() once for all concurrent callers.
+
+        prompt is only the cache key; call() sends whatever the model needs.
+        Only non-empty string outputs accepted by cacheable (if given) are stored.
+        """
+        key = self.key(identity, prompt, anchor)
+        while True:
+            cached = self.get(identity, prompt, anchor)
+            if cached is not None:
+                return cached
+            with self._lock:
+                pending = self._inflight.get(key)
+                if pending is None:
+                    if key in self._entries:
+                        continue  # stored between our lookup and now
+                    pending = self._inflight[key] = Future()
+                    break
+                self.counters["coalesced"] += 1
+            try:
+                return await asyncio.wrap_future(pending)
+            except asyncio.CancelledError:
+                if pending.cancelled() and not asyncio.current_task().cancelling():
+                    continue  # the caller running the model was cancelled, not us
+                raise
+
+        try:
+            output = await call()
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            if isinstance(e, asyncio.CancelledError):
+                pending.cancel()
+            else:
+                pending.set_exception(e)
+            raise
+        if isinstance(output, str) and output and (cacheable is None or cacheable(output)):
+            self.put(identity, prompt, output, anchor)
+        with self._lock:
+            self._inflight.pop(key, None)
+        pending.set_result(output)
+        return output
+
+    def stats(self) -> Dict[str, Any]:
+        """ExtractionCache stats plus coalesced calls and calls in flight."""
+        stats = super().stats()
+        with self._lock:
+            stats["in_flight"] = len(self._inflight)
+        return stats
+
+
+default_llm_cache = LLMResponseCache.from_env()
@@ -0,0 +1,106 @@
+import asyncio
+import os
+import threading
+import weakref
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import httpx
+
+# httpx needs h2 for HTTP/2; checked without importing either, to keep imports cheap
+HTTP2_AVAILABLE = find_spec("h2") is not None
+
+MAX_CONNECTIONS_ENV = "LLM_MAX_CONNECTIONS"
+BATCH_WINDOW_ENV = "LLM_BATCH_WINDOW_MS"
+
+
+def shared_http_client(max_connections: Optional[int] = None, keepalive_expiry: float = 60.0,
+                       timeout: float = 120.0, http2: Optional[bool] = None) -> "httpx.AsyncClient":
+    """Async HTTP client for the model server: keep-alive pool, connection cap and HTTP/2 when h2 is installed.
+
+    One client serves every agent. Its pooled connections belong to the event
+    loop that opened them, which is the shared background loop for all
+    scheduling entry points.
+    """
+    import httpx
+
+    if max_connections is None:
+        max_connections = int(os.environ.get(MAX_CONNECTIONS_ENV, "16"))
+    limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections,
+                          keepalive_expiry=keepalive_expiry)
+    return httpx.AsyncClient(limits=limits, timeout=httpx.Timeout(timeout, connect=10.0),
+                             http2=HTTP2_AVAILABLE if http2 is None else http2 and HTTP2_AVAILABLE)
+
+
+class PromptBatcher:
+    """Collects prompts that arrive within window seconds and sends them to the model as one concurrent batch.
+
+    vLLM-style servers batch whatever is in flight together, so prompts that
+    trickle in a few milliseconds apart are held back briefly and released at
+    once. Each caller awaits only its own result (or exception). A batch is
+    flushed early once it reaches max_batch prompts. Batches are kept per event
+    loop; with window 0 submit() calls the model directly.
+    """
+
+    def __init__(self, call: Callable[[str], Awaitable[Any]], window: float = 0.005, max_batch: int = 32):
+        self.call = call
+        self.window = window
+        self.max_batch = max_batch
+        self._lock = threading.Lock()
+        self._pending: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, List[Tuple[str, asyncio.Future]]]" = \
+            weakref.WeakKeyDictionary()
+        self._dispatching: set = set()
+        self.counters = {"prompts": 0, "batches": 0, "largest_batch": 0}
+
+    @classmethod
+    def from_env(cls, call: Callable[[str], Awaitable[Any]]) -> "PromptBatcher":
+        """Batcher whose window is $LLM_BATCH_WINDOW_MS milliseconds (default 0, batching off)."""
+        return cls(call, window=float(os.environ.get(BATCH_WINDOW_ENV, "0")) / 1000)
+
+    async def submit(self, prompt: str) -> Any:
+        """Queue prompt for the next batch and await its own result."""
+        if self.window <= 0:
+            return await self.call(prompt)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            self.counters["prompts"] += 1
+            batch = self._pending.get(loop)
+            if batch is None:
+                batch = self._pending[loop] = []
+                loop.call_later(self.window, self._flush, loop, batch)
+            batch.append((prompt, future))
+            full = len(batch) >= self.max_batch
+        if full:
+            self._flush(loop, batch)
+        return await future
+
+    def _flush(self, loop: asyncio.AbstractEventLoop, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        with self._lock:
+            if self._pending.get(loop) is not batch:
+                return
+            del self._pending[loop]
+            self.counters["batches"] += 1
+            self.counters["largest_batch"] = max(self.counters["largest_batch"], len(batch))
+        task = loop.create_task(self._dispatch(batch))
+        self._dispatching.add(task)
+        task.add_done_callback(self._dispatching.discard)
+
+    async def _dispatch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        results = await asyncio.gather(*[self.call(prompt) for prompt, _ in batch], return_exceptions=True)
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return prompt and batch counters, the mean batch size and the current window in milliseconds."""
+        with self._lock:
+            stats = dict(self.counters)
+        stats["mean_batch"] = stats["prompts"] / stats["batches"] if stats["batches"] else 0.0
+        stats["window_ms"] = self.window * 1000
+        return stats
@@ -1,44 +1,41 @@
 import os
 import json
 import asyncio
+import functools
+import threading
 from datetime import datetime, timedelta
-from typing import Dict, Any
-from pydantic_ai import Agent, Tool
-from pydantic_ai.models.openai import OpenAIModel
-from pydantic_ai.providers.openai import OpenAIProvider
+from typing import Dict, Any, Awaitable, Callable, Optional
+
+from background_loop import background_loop
+from circuit_breaker import CircuitBreaker, HealthProber
+from email_extraction import cached_email_details
+from extraction_cache import reference_day
+from llm_cache import LLMResponseCache, agent_identity, default_llm_cache, is_json
+from llm_client import PromptBatcher, shared_http_client
+from meeting_utils import process_meeting_request
+from reservations import ReservationTable, tentative_reservations
+from timestamps import timestamps
 
-@Tool
 def get_current_datetime() -> str:
     """Get the current date and time in ISO format with timezone."""
     return datetime.now().strftime("%Y-%m-%dT%H:%M:%S+05:30")
 
-@Tool
 def extract_meeting_time_from_email(email_content: str, current_datetime: str) -> Dict[str, Any]:
     """Extract meeting timing details from email content with detailed logging and weekend/off-hours handling."""
     print(f"\nLLM TOOL: extract_meeting_time_from_email")
     print(f"Email content: '{email_content}'")
     print(f"Current time: {current_datetime}")
     
-    email_lower = email_content.lower()
+    details = cached_email_details(email_content)
     
     # Parse current datetime
-    current_dt = datetime.fromisoformat(current_datetime.replace('+05:30', ''))
+    current_dt = timestamps.parse_wall(current_datetime)
     print(f"Parsed current datetime: {current_dt}")
     
     # Extract duration
-    duration = 30  # default
-    if "30 min" in email_lower or "30 minutes" in email_lower:
-        duration = 30
-        print(f"Detected duration: 30 minutes from '30 min/minutes'")
-    elif "1 hour" in email_lower or "60 min" in email_lower:
-        duration = 60
-        print(f"Detected duration: 60 minutes from '1 hour/60 min'")
-    elif "15 min" in email_lower:
-        duration = 15
-        print(f"Detected duration: 15 minutes")
-    elif "45 min" in email_lower:
-        duration = 45
-        print(f"Detected duration: 45 minutes")
+    duration = details["duration_minutes"] or 30
+    if details["duration_minutes"]:
+        print(f"Detected duration: {duration} minutes")
     else:
         print(f"Using default duration: 30 minutes (no specific duration found)")
     
@@ -51,46 +48,22 @@ def extract_meeting_time_from_email(email_content: str, current_datetime: str) -
         return next_day
     
     # Extract day
+    day_names = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
     target_date = None
-    if "thursday" in email_lower:
-        # Find next Thursday
-        days_ahead = 3 - current_dt.weekday()  # Thursday = 3
-        if days_ahead <= 0:
-            days_ahead += 7
-        target_date = current_dt + timedelta(days=days_ahead)
-        print(f"Detected day: Thursday ({days_ahead} days ahead)")
-    elif "tuesday" in email_lower:
-        days_ahead = 1 - current_dt.weekday()  # Tuesday = 1
-        if days_ahead <= 0:
-            days_ahead += 7
-        target_date = current_dt + timedelta(days=days_ahead)
-        print(f"Detected day: Tuesday ({days_ahead} days ahead)")
-    elif "friday" in email_lower:
-        days_ahead = 4 - current_dt.weekday()  # Friday = 4
-        if days_ahead <= 0:
-            days_ahead += 7
-        target_date = current_dt + timedelta(days=days_ahead)
-        print(f"Detected day: Friday ({days_ahead} days ahead)")
-    elif "monday" in email_lower:
-        days_ahead = 0 - current_dt.weekday()  # Monday = 0
+    if details["weekday"] is not None:
+        days_ahead = details["weekday"] - current_dt.weekday()
         if days_ahead <= 0:
             days_ahead += 7
         target_date = current_dt + timedelta(days=days_ahead)
-        print(f"Detected day: Monday ({days_ahead} days ahead)")
-    elif "wednesday" in email_lower:
-        days_ahead = 2 - current_dt.weekday()  # Wednesday = 2
-        if days_ahead <= 0:
-            days_ahead += 7
-        target_date = current_dt + timedelta(days=days_ahead)
-        print(f"Detected day: Wednesday ({days_ahead} days ahead)")
-    elif "tomorrow" in email_lower:
+        print(f"Detected day: {day_names[details['weekday']]} ({days_ahead} days ahead)")
+    elif details["relative_day"] == "tomorrow":
         target_date = current_dt + timedelta(days=1)
         # Check if tomorrow is a weekend
         if target_date.weekday() >= 5:
             target_date = find_next_business_day(target_date)
             print(f"Tomorrow is weekend, moving to next business day")
         print(f"Detected day: Tomorrow")
-    elif "today" in email_lower:
+    elif details["relative_day"] == "today":
         target_date = current_dt
         # Check if today is a weekend
         if target_date.weekday() >= 5:
@@ -115,38 +88,9 @@ def extract_meeting_time_from_email(email_content: str, current_datetime: str) -
     meeting_hour = 10  # Default to 10:30 AM
     meeting_minute = 30
     
-    if "2 pm" in email_lower or "2:00 pm" in email_lower or "14:00" in email_lower:
-        meeting_hour = 14
-        meeting_minute = 0
-        print(f"Detected time: 2:00 PM from email content")
-    elif "10 am" in email_lower or "10:00 am" in email_lower:
-        meeting_hour = 10
-        meeting_minute = 0
-        print(f"Detected time: 10:00 AM from email content")
-    elif "3 pm" in email_lower or "15:00" in email_lower:
-        meeting_hour = 15
-        meeting_minute = 0
-        print(f"Detected time: 3:00 PM from email content")
-    elif "11 am" in email_lower or "11:00 am" in email_lower:
-        meeting_hour = 11
-        meeting_minute = 0
-        print(f"Detected time: 11:00 AM from email content")
-    elif "9 am" in email_lower or "9:00 am" in email_lower:
-        meeting_hour = 9
-        meeting_minute = 0
-        print(f"Detected time: 9:00 AM from email content")
-    elif "4 pm" in email_lower or "4:00 pm" in email_lower or "16:00" in email_lower:
-        meeting_hour = 16
-        meeting_minute = 0
-        print(f"Detected time: 4:00 PM from email content")
-    elif "morning" in email_lower:
-        meeting_hour = 10
-        meeting_minute = 0
-        print(f"Detected time: Morning (10:00 AM)")
-    elif "afternoon" in email_lower:
-        meeting_hour = 14
-        meeting_minute = 0
-        print(f"Detected time: Afternoon (2:00 PM)")
+    if details["meeting_time"]:
+        meeting_hour, meeting_minute = details["meeting_time"]
+        print(f"Detected time: {meeting_hour:02d}:{meeting_minute:02d} from email content")
     else:
         print(f"Using default time: 10:30 AM (no specific time found)")
     
@@ -209,7 +153,6 @@ def extract_meeting_time_from_email(email_content: str, current_datetime: str) -
     
     return result
 
-@Tool
 def create_meeting_response(request_data: Dict[str, Any], start_time: str, end_time: str) -> Dict[str, Any]:
     """Create the final meeting response in the exact required format matching 3_Output_Event.json."""
     print(f"\nLLM TOOL: create_meeting_response")
@@ -271,12 +214,31 @@ BASE_URL = "http://localhost:8000/v1"
 os.environ["BASE_URL"] = BASE_URL
 os.environ["OPENAI_API_KEY"] = "abc-123"
 
-try:
+# Outages trip the breaker (on failed calls or a failed /v1/models probe) so requests skip the model
+llm_breaker = CircuitBreaker.from_env()
+llm_prober = HealthProber.from_env(llm_breaker, BASE_URL + "/models",
+                                   headers={"Authorization": f"Bearer {os.environ['OPENAI_API_KEY']}"})
+
+# Agents are built on first use, so importing this module (and the rule-based
+# path behind it) never pays for pydantic_ai, openai or the HTTP client
+_agents: Dict[str, Any] = {}
+_agents_lock = threading.Lock()
+_agents_error: Optional[str] = None
+
+def _build_agents() -> Dict[str, Any]:
+    """Build the shared model client and the three agents."""
+    from pydantic_ai import Agent, Tool
+    from pydantic_ai.models.openai import OpenAIModel
+    from pydantic_ai.providers.openai import OpenAIProvider
+    
+    # All three agents share one pooled keep-alive client toward the model server
+    llm_http_client = shared_http_client()
     agent_model = OpenAIModel(
         'Qwen3-30B-A3B',
         provider=OpenAIProvider(
             base_url=os.environ["BASE_URL"], 
-            api_key=os.environ["OPENAI_API_KEY"]
+            api_key=os.environ["OPENAI_API_KEY"],
+            http_client=llm_http_client
         ),
     )
 
@@ -377,7 +339,7 @@ try:
     # Create the meeting scheduler agent with working pattern
     meeting_agent = Agent(
         model=agent_model,
-        tools=[get_current_datetime, extract_meeting_time_from_email, create_meeting_response],
+        tools=[Tool(get_current_datetime), Tool(extract_meeting_time_from_email), Tool(create_meeting_response)],
         system_prompt=(
             "You are an AI Meeting Scheduler. Your job is to:\n"
             "1. Extract meeting details from email content using tools\n"
@@ -394,47 +356,119 @@ try:
         )
     )
     
-    print(f"LLM Agent initialized successfully")
-    LLM_AVAILABLE = True
-    
-except Exception as e:
-    print(f"LLM initialization failed: {e}")
-    LLM_AVAILABLE = False
-    meeting_agent = None
+    return {"llm_http_client": llm_http_client, "agent_model": agent_model, "date_range_agent": date_range_agent,
+            "optimal_time_agent": optimal_time_agent, "meeting_agent": meeting_agent}
 
-async def date_range_run(prompt: str) -> str:
-    """Extract date range using your working pattern"""
-    if not LLM_AVAILABLE or not date_range_agent:
-        raise Exception("Date range agent not available")
-    
-    async with date_range_agent.run_mcp_servers():
+def get_agents() -> Optional[Dict[str, Any]]:
+    """The model client and agents, built once on first call; None if construction failed."""
+    global _agents_error
+    with _agents_lock:
+        if not _agents and _agents_error is None:
+            try:
+                _agents.update(_build_agents())
+                print(f"LLM Agent initialized successfully")
+                llm_prober.start()
+            except Exception as e:
+                print(f"LLM initialization failed: {e}")
+                _agents_error = str(e)
+        return _agents or None
+
+def llm_available() -> bool:
+    """Build the agents if needed and report whether that succeeded."""
+    return get_agents() is not None
+
+def llm_status() -> Dict[str, Any]:
+    """Circuit breaker state and last health probe, for the /health endpoint."""
+    return {"agents_built": bool(_agents), "init_error": _agents_error,
+            "breaker": llm_breaker.stats(), "probe": llm_prober.stats()}
+
+def get_date_range_agent():
+    """The date range extraction agent, or None when the LLM is unavailable."""
+    return (get_agents() or {}).get("date_range_agent")
+
+def get_optimal_time_agent():
+    """The optimal time finder agent, or None when the LLM is unavailable."""
+    return (get_agents() or {}).get("optimal_time_agent")
+
+def get_meeting_agent():
+    """The tool-using meeting scheduler agent, or None when the LLM is unavailable."""
+    return (get_agents() or {}).get("meeting_agent")
+
+def __getattr__(name: str) -> Any:
+    # Old module attributes (LLM_AVAILABLE, meeting_agent, ...) resolve lazily too
+    if name == "LLM_AVAILABLE":
+        return llm_available()
+    if name in ("llm_http_client", "agent_model", "date_range_agent", "optimal_time_agent", "meeting_agent"):
+        return (get_agents() or {}).get(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+async def _date_range_call(prompt: str) -> str:
+    """One date range agent run, holding a model-call slot."""
+    date_range_agent = get_date_range_agent()
+    async with llm_breaker.guard(), background_loop.limit(), date_range_agent.run_mcp_servers():
         result = await date_range_agent.run(prompt)
         return result.output
 
-async def optimal_time_run(prompt: str) -> str:
+# Date range prompts arriving within $LLM_BATCH_WINDOW_MS of each other go out together (off by default)
+date_range_batcher = PromptBatcher.from_env(_date_range_call)
+
+async def date_range_run(prompt: str, cache: Optional[LLMResponseCache] = default_llm_cache,
+                         key: Optional[str] = None, anchor: str = "") -> str:
+    """Extract date range using your working pattern
+    
+    The answer is cached under key (default: the prompt) and anchor, e.g. the
+    email body and its reference day rather than a prompt carrying the exact
+    request time.
+    """
+    date_range_agent = get_date_range_agent()
+    if not date_range_agent:
+        raise Exception("Date range agent not available")
+    
+    async def call() -> str:
+        return await date_range_batcher.submit(prompt)
+    if cache is None:
+        return await call()
+    return await cache.run(agent_identity("date_range", date_range_agent), prompt if key is None else key, call,
+                           cacheable=is_json, anchor=anchor)
+
+async def optimal_time_run(prompt: str, cache: Optional[LLMResponseCache] = default_llm_cache) -> str:
     """Find optimal meeting time considering business hours and off-hours"""
-    if not LLM_AVAILABLE or not optimal_time_agent:
+    optimal_time_agent = get_optimal_time_agent()
+    if not optimal_time_agent:
         raise Exception("Optimal time agent not available")
     
-    async with optimal_time_agent.run_mcp_servers():
-        result = await optimal_time_agent.run(prompt)
-        return result.output
+    async def call() -> str:
+        async with llm_breaker.guard(), background_loop.limit(), optimal_time_agent.run_mcp_servers():
+            result = await optimal_time_agent.run(prompt)
+            return result.output
+    if cache is None:
+        return await call()
+    return await cache.run(agent_identity("optimal_time", optimal_time_agent), prompt, call, cacheable=is_json)
 
-async def run_async(prompt: str) -> str:
-    """Helper function to run LLM async operations"""
-    if not LLM_AVAILABLE or not meeting_agent:
+async def run_async(prompt: str, cache: Optional[LLMResponseCache] = None) -> str:
+    """Helper function to run LLM async operations
+    
+    Not cached by default: the meeting agent's answer depends on the current
+    time and calendar state, neither of which is part of the prompt.
+    """
+    meeting_agent = get_meeting_agent()
+    if not meeting_agent:
         raise Exception("LLM not available")
     
-    async with meeting_agent.run_mcp_servers():
-        result = await meeting_agent.run(prompt)
-        return result.output
+    async def call() -> str:
+        async with llm_breaker.guard(), background_loop.limit(), meeting_agent.run_mcp_servers():
+            result = await meeting_agent.run(prompt)
+            return result.output
+    if cache is None:
+        return await call()
+    return await cache.run(agent_identity("meeting", meeting_agent), prompt, call)
 
 async def schedule_meeting_async(request_data: Dict[str, Any]) -> Dict[str, Any]:
     """Enhanced meeting scheduling with date range extraction and optimal time finding."""
     print(f"\nENHANCED LLM SCHEDULING: schedule_meeting_async")
     print(f"Request data keys: {list(request_data.keys())}")
     
-    if not LLM_AVAILABLE:
+    if not llm_available():
         print(f"LLM server not available")
         return {"status": "error", "error": "LLM server not available"}
     
@@ -455,7 +489,10 @@ async def schedule_meeting_async(request_data: Dict[str, Any]) -> Dict[str, Any]
         print(f"   Datetime: {datetime_ref}")
         print(f"   Email: {email_content[:100]}...")
         
-        date_range_result = await date_range_run(date_range_prompt)
+        # Same email on the same reference day resolves to the same range; concurrent
+        # identical requests share one model call
+        date_range_result = await date_range_run(date_range_prompt, key=email_content,
+                                                 anchor=reference_day(datetime_ref))
         print(f"Date range result: {date_range_result}")
         
         # Parse the date range result
@@ -529,7 +566,7 @@ async def schedule_meeting_async(request_data: Dict[str, Any]) -> Dict[str, Any]
                 return next_day
             
             try:
-                start_dt = datetime.fromisoformat(start_range.replace('+05:30', ''))
+                start_dt = timestamps.parse_wall(start_range)
                 # Find next business day from start range
                 business_day = find_next_business_day_fallback(start_dt)
                 # Default to 10:30 AM on the business day
@@ -573,26 +610,18 @@ def schedule_meeting(request_data: Dict[str, Any]) -> Dict[str, Any]:
     print(f"\n🔗 LLM WRAPPER: schedule_meeting")
     print(f"Request ID: {request_data.get('Request_id', 'Unknown')}")
     
-    if not LLM_AVAILABLE:
+    if not llm_available():
         print(f"LLM not available")
         return {"status": "error", "error": "LLM server not available"}
     
+    if not llm_breaker.available():
+        print(f"LLM circuit {llm_breaker.state}, skipping the model")
+        return {"status": "error", "error": "LLM circuit open: model server unavailable"}
+    
     try:
-        print(f"Setting up async event loop...")
-        import asyncio
-        
-        # Use new event loop pattern
-        try:
-            loop = asyncio.get_event_loop()
-            if loop.is_closed():
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-        
+        # Runs on the shared background loop so agents and connections are reused across requests
         print(f"Executing LLM async function...")
-        result = loop.run_until_complete(schedule_meeting_async(request_data))
+        result = background_loop.run(schedule_meeting_async(request_data))
         
         print(f"LLM wrapper result:")
         print(f"   Status: {result.get('status', 'Unknown')}")
@@ -606,3 +635,125 @@ def schedule_meeting(request_data: Dict[str, Any]) -> Dict[str, Any]:
     except Exception as e:
         print(f"LLM wrapper error: {str(e)}")
         return {"status": "error", "error": str(e)}
+
+# End-to-end budget for schedule_meeting_speculative, in seconds
+LATENCY_BUDGET_ENV = "SCHEDULING_LATENCY_BUDGET"
+DEFAULT_LATENCY_BUDGET = float(os.environ.get(LATENCY_BUDGET_ENV, "8.0"))
+
+def valid_llm_schedule(result: Dict[str, Any]) -> bool:
+    """True when an LLM answer is usable: success, parseable times, weekday, inside 9 AM - 6 PM."""
+    if not isinstance(result, dict) or result.get("status") != "success":
+        return False
+    try:
+        start = timestamps.parse_wall(result["event_start"])
+        end = timestamps.parse_wall(result["event_end"])
+    except (KeyError, ValueError):
+        return False
+    return (start < end and start.weekday() < 5 and start.date() == end.date()
+            and start.hour >= 9 and (end.hour, end.minute) <= (18, 0))
+
+async def schedule_meeting_speculative_async(request_data: Dict[str, Any], budget: Optional[float] = None,
+                                             rule_based: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+                                             llm: Optional[Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]] = None,
+                                             reservations: Optional[ReservationTable] = None,
+                                             breaker: Optional[CircuitBreaker] = None) -> Dict[str, Any]:
+    """Run the LLM and rule-based schedulers side by side under one deadline.
+    
+    The rule-based answer (process_meeting_request) is computed in a worker
+    thread while the LLM path runs. A valid LLM answer that arrives within
+    budget seconds wins; otherwise the rule-based response is returned under
+    "response". If neither is ready at the deadline the result is an error, so
+    latency is bounded by the budget, not by the model server. Nothing is held
+    by default; given a reservations table, both paths use it: when the LLM
+    wins, the rule-based path's tentative hold is swapped for the LLM's slot,
+    and if the LLM slot can't be held the rule-based answer is returned
+    instead. Requests without a Request_id are never held. While the circuit breaker is open the LLM is not started at all.
+    """
+    budget = DEFAULT_LATENCY_BUDGET if budget is None else budget
+    rule_based = rule_based or process_meeting_request
+    breaker = llm_breaker if breaker is None else breaker
+    if breaker.available():
+        llm = llm or (schedule_meeting_async if llm_available() else None)
+    else:
+        print(f"LLM circuit {breaker.state}, taking the rule-based path")
+        llm = None
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + budget
+    print(f"\nSPECULATIVE SCHEDULING: budget {budget:.1f}s, LLM {'on' if llm else 'off'}")
+    
+    request_id = request_data.get("Request_id")
+    if not request_id:
+        reservations = None
+    rule_call = functools.partial(rule_based, reservations=reservations)
+    rule_task = asyncio.ensure_future(asyncio.to_thread(rule_call, dict(request_data)))
+    llm_task = asyncio.ensure_future(llm(dict(request_data))) if llm else None
+    
+    llm_result = None
+    if llm_task is not None:
+        done, _ = await asyncio.wait({llm_task}, timeout=max(0.0, deadline - loop.time()))
+        if llm_task in done and not llm_task.cancelled() and llm_task.exception() is None:
+            llm_result = llm_task.result()
+        else:
+            llm_task.cancel()
+            print(f"LLM path missed the {budget:.1f}s budget")
+    
+    elapsed = budget - max(0.0, deadline - loop.time())
+    if llm_result is not None and valid_llm_schedule(llm_result):
+        held = True
+        if reservations is not None:
+            attendees = [request_data.get("From")] + [att["email"] for att in request_data.get("Attendees", [])]
+            attendees = [a for a in attendees if a]
+            
+            def hold_llm_slot() -> bool:
+                # Replaces the rule-based path's hold; fails (keeping that hold) if another request has the slot
+                return reservations.try_reserve(request_id, attendees, llm_result["event_start"],
+                                                llm_result["event_end"])
+            
+            # Let the rule-based path place its own hold first so it can't overwrite the LLM's
+            await asyncio.wait({rule_task}, timeout=max(0.0, deadline - loop.time()))
+            held = hold_llm_slot()
+            if held and not rule_task.done():
+                rule_task.add_done_callback(lambda _: hold_llm_slot() or print(
+                    f"LLM slot for {request_id} was taken while the rule-based path finished"))
+        elapsed = budget - max(0.0, deadline - loop.time())
+        if held:
+            print(f"LLM answer accepted after {elapsed:.2f}s")
+            return dict(llm_result, method="llm_speculative", elapsed_seconds=elapsed)
+        print(f"LLM slot is held by another request, using the rule-based answer")
+    elif llm_result is not None:
+        print(f"LLM answer rejected: {llm_result.get('error', 'invalid times')}")
+    
+    done, _ = await asyncio.wait({rule_task}, timeout=max(0.0, deadline - loop.time()))
+    elapsed = budget - max(0.0, deadline - loop.time())
+    if rule_task not in done:
+        print(f"Rule-based path missed the {budget:.1f}s budget")
+        return {"status": "error", "error": f"No schedule within the {budget:.1f}s latency budget",
+                "method": "speculative", "elapsed_seconds": elapsed}
+    try:
+        response = rule_task.result()
+    except Exception as e:
+        return {"status": "error", "error": str(e), "method": "rule_based", "elapsed_seconds": elapsed}
+    if "error" in response:
+        return {"status": "error", "error": response["error"], "method": "rule_based", "elapsed_seconds": elapsed}
+    print(f"Rule-based answer returned after {elapsed:.2f}s")
+    return {"status": "success", "response": response, "method": "rule_based", "elapsed_seconds": elapsed}
+
+def schedule_meeting_speculative(request_data: Dict[str, Any], budget: Optional[float] = None) -> Dict[str, Any]:
+    """Synchronous wrapper for schedule_meeting_speculative_async, run on the shared background loop.
+    
+    Slots are held in the shared tentative_reservations table, so concurrent
+    requests for the same attendees are handed different slots.
+    """
+    return background_loop.run(schedule_meeting_speculative_async(request_data, budget,
+                                                                  reservations=tentative_reservations))
+
+async def schedule_meeting_shared_async(request_data: Dict[str, Any], budget: Optional[float] = None
+                                        ) -> Dict[str, Any]:
+    """Async entry point for servers: await speculative scheduling on the shared background loop.
+    
+    Safe to await from any event loop (e.g. one created per request by an
+    async view); the work itself always runs where the agents' connections live.
+    Slots are held in tentative_reservations, as in schedule_meeting_speculative.
+    """
+    return await background_loop.call(schedule_meeting_speculative_async(request_data, budget,
+                                                                         reservations=tentative_reservations))
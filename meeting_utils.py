@@ -1,83 +1,92 @@
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Tuple
 import pytz
-from calendar_extractor import retrive_calendar_events
+from calendar_providers import CalendarProvider, GoogleCalendarProvider
+from compact_events import to_event_dicts
+from email_extraction import cached_email_details
+from extraction_cache import ExtractionCache, default_extraction_cache
+from reservations import ReservationTable
+from slot_scoring import SlotScoring, default_scoring
+from slot_engines import (NUMPY_AVAILABLE, find_recurring_slots, find_slots_bitmap, find_slots_quorum,
+                          find_slots_sweep, find_slots_topk, find_slots_tz)
+from timestamps import timestamps
+from working_hours import WorkingHours, utc_seconds
+
+AVAILABILITY_MODES = ("full", "busy")
 
 class MeetingScheduler:
-    def __init__(self):
+    def __init__(self, max_workers: int = 8, attendee_timeout: Optional[float] = 10.0,
+                 fetch_events: Optional[Callable[[str, str, str], List[Dict[str, Any]]]] = None,
+                 availability_mode: str = "full",
+                 fetch_busy: Optional[Callable[..., Dict[str, Any]]] = None,
+                 provider: Optional[CalendarProvider] = None,
+                 slot_engine: str = "topk",
+                 working_hours: Optional[Dict[str, WorkingHours]] = None,
+                 scoring: Optional[SlotScoring] = None,
+                 extraction_cache: Optional[ExtractionCache] = default_extraction_cache,
+                 compact_events: bool = False):
+        if availability_mode not in AVAILABILITY_MODES:
+            raise ValueError(f"availability_mode must be one of {AVAILABILITY_MODES}, got {availability_mode!r}")
         self.timezone = pytz.timezone('Asia/Kolkata')
         self.business_start = 9  # 9 AM
         self.business_end = 18   # 6 PM
+        self.max_workers = max_workers  # 1 = sequential calendar fetches
+        self.attendee_timeout = attendee_timeout  # seconds per attendee fetch, None = no limit
+        # Calendar source; fetch_events/fetch_busy override individual calls.
+        # With compact_events, events are fetched pre-parsed (CompactEvent) so slot search
+        # never re-parses them; detailed_events then holds CompactEvents instead of dicts,
+        # so only internal callers that don't serialize it opt in.
+        self.provider = provider or GoogleCalendarProvider()
+        self.fetch_events = fetch_events or (self.provider.get_compact_events if compact_events
+                                             else self.provider.get_events)
+        # "full" lists every event (needed to echo calendars in the response),
+        # "busy" only asks FreeBusy for busy intervals of all attendees in one call
+        self.availability_mode = availability_mode
+        self.fetch_busy = fetch_busy or self.provider.get_busy_intervals
+        self.slot_engine = slot_engine
+        # Per-attendee timezone/working hours; attendees listed here get tz-aware slot search
+        self.working_hours = dict(working_hours or {})
+        # Slot scoring weights; default_scoring honours $SLOT_SCORING_CONFIG
+        self.scoring = scoring or default_scoring
+        # Cache of email cues by normalized text, None = always re-extract
+        self.extraction_cache = extraction_cache
+    
+    @property
+    def default_working_hours(self) -> WorkingHours:
+        """Working hours of attendees without a profile: business hours in the scheduler's timezone."""
+        return WorkingHours(self.timezone.zone, f"{self.business_start:02d}:00", f"{self.business_end:02d}:00")
         
     def parse_email_content(self, email_content: str, current_time: str) -> Dict[str, Any]:
         """Parse email content to extract meeting preferences using simple NLP."""
-        email_lower = email_content.lower()
-        
-        # Extract duration
-        duration = 30  # default
-        if "30 min" in email_lower or "half hour" in email_lower:
-            duration = 30
-        elif "1 hour" in email_lower or "60 min" in email_lower:
-            duration = 60
-        elif "15 min" in email_lower:
-            duration = 15
-        elif "45 min" in email_lower:
-            duration = 45
-        
-        # Extract day preference with improved date parsing
+        details = cached_email_details(email_content, self.extraction_cache)
+        duration = details["duration_minutes"] or 30
+        
+        # Extract day preference relative to the request's Datetime ("02-07-2025T12:34:55" or ISO)
         try:
-            # Handle different date formats
             if 'T' in current_time:
-                # Format: "02-07-2025T12:34:55" -> "2025-07-02T12:34:55"
-                if '-' in current_time and len(current_time.split('-')[0]) == 2:
-                    parts = current_time.split('T')
-                    date_part = parts[0]
-                    time_part = parts[1] if len(parts) > 1 else "00:00:00"
-                    
-                    # Split date: "02-07-2025" -> ["02", "07", "2025"]
-                    date_components = date_part.split('-')
-                    if len(date_components) == 3:
-                        # Rearrange to ISO format: "2025-07-02"
-                        iso_date = f"{date_components[2]}-{date_components[1]}-{date_components[0]}"
-                        current_time = f"{iso_date}T{time_part}"
-                
-                current_dt = datetime.fromisoformat(current_time)
+                current_dt = timestamps.parse(current_time)
             else:
                 # Fallback to current time if parsing fails
                 current_dt = datetime.now()
-        except (ValueError, IndexError) as e:
+        except ValueError as e:
             print(f"Date parsing warning: {e}, using current time")
             current_dt = datetime.now()
         preferred_day = None
-        
-        if "monday" in email_lower:
-            preferred_day = self._get_next_weekday(current_dt, 0)
-        elif "tuesday" in email_lower:
-            preferred_day = self._get_next_weekday(current_dt, 1)
-        elif "wednesday" in email_lower:
-            preferred_day = self._get_next_weekday(current_dt, 2)
-        elif "thursday" in email_lower:
-            preferred_day = self._get_next_weekday(current_dt, 3)
-        elif "friday" in email_lower:
-            preferred_day = self._get_next_weekday(current_dt, 4)
-        elif "tomorrow" in email_lower:
+        if details["weekday"] is not None:
+            preferred_day = self._get_next_weekday(current_dt, details["weekday"])
+        elif details["relative_day"] == "tomorrow":
             preferred_day = current_dt + timedelta(days=1)
-        elif "today" in email_lower:
+        elif details["relative_day"] == "today":
             preferred_day = current_dt
         
-        # Extract urgency/priority
-        priority = "medium"
-        if any(word in email_lower for word in ["urgent", "asap", "immediately", "critical"]):
-            priority = "high"
-        elif any(word in email_lower for word in ["when convenient", "flexible", "no rush"]):
-            priority = "low"
-        
         return {
             "duration_minutes": duration,
             "preferred_day": preferred_day.isoformat() if preferred_day else None,
-            "priority": priority,
-            "urgency_keywords": [word for word in ["urgent", "asap", "critical"] if word in email_lower]
+            "priority": details["priority"],
+            "urgency_keywords": details["urgency_keywords"]
         }
     
     def _get_next_weekday(self, current_date: datetime, weekday: int) -> datetime:
@@ -89,45 +98,184 @@ class MeetingScheduler:
     
     def get_availability_for_all(self, attendees: List[str], start_time: str, end_time: str) -> Dict[str, Any]:
         """Get calendar events for all attendees and analyze availability."""
+        return self.summarize_availability(attendees, self.fetch_all_events(attendees, start_time, end_time))
+    
+    def fetch_all_events(self, attendees: List[str], start_time: str, end_time: str) -> Dict[str, Any]:
+        """Fetch every attendee's events as {attendee: events or the exception that stopped the fetch}."""
+        if self.availability_mode == "busy":
+            return self._fetch_busy_events(attendees, start_time, end_time)
+        if self.max_workers > 1 and len(attendees) > 1:
+            return self._fetch_events_concurrently(attendees, start_time, end_time)
+        return {attendee: self._fetch_events_safely(attendee, start_time, end_time) for attendee in attendees}
+    
+    def summarize_availability(self, attendees: List[str], fetched: Dict[str, Any]) -> Dict[str, Any]:
+        """Build detailed_events and availability_summary from fetch_all_events results."""
         all_events = {}
         availability_summary = {}
         
         for attendee in attendees:
-            try:
-                events = retrive_calendar_events(attendee, start_time, end_time)
-                all_events[attendee] = events
-                
-                # Calculate busy hours
-                busy_slots = []
-                for event in events:
-                    busy_slots.append({
-                        "start": event["StartTime"],
-                        "end": event["EndTime"],
-                        "summary": event["Summary"]
-                    })
-                
-                availability_summary[attendee] = {
-                    "total_events": len(events),
-                    "busy_slots": busy_slots,
-                    "status": "available" if len(events) < 5 else "busy"
-                }
-                
-            except Exception as e:
-                all_events[attendee] = {"error": str(e)}
+            events = fetched[attendee]
+            if isinstance(events, Exception):
+                all_events[attendee] = {"error": str(events)}
                 availability_summary[attendee] = {
                     "status": "unavailable",
-                    "error": str(e)
+                    "error": str(events)
                 }
+                continue
+            
+            all_events[attendee] = events
+            
+            # Calculate busy hours
+            busy_slots = []
+            for event in events:
+                busy_slots.append({
+                    "start": event["StartTime"],
+                    "end": event["EndTime"],
+                    "summary": event["Summary"]
+                })
+            
+            availability_summary[attendee] = {
+                "total_events": len(events),
+                "busy_slots": busy_slots,
+                "status": "available" if len(events) < 5 else "busy"
+            }
         
         return {
             "detailed_events": all_events,
             "availability_summary": availability_summary
         }
     
+    def _fetch_events_safely(self, attendee: str, start_time: str, end_time: str):
+        """Fetch one attendee's events, returning the exception instead of raising it."""
+        try:
+            return self.fetch_events(attendee, start_time, end_time)
+        except Exception as e:
+            return e
+    
+    def _fetch_busy_events(self, attendees: List[str], start_time: str, end_time: str) -> Dict[str, Any]:
+        """Fetch busy intervals for all attendees in one FreeBusy call, shaped like events."""
+        try:
+            busy = self.fetch_busy(attendees, start_time, end_time, time_zone=self.timezone.zone)
+        except Exception as e:
+            return {attendee: e for attendee in attendees}
+        
+        fetched = {}
+        for attendee in attendees:
+            intervals = busy.get(attendee, [])
+            if isinstance(intervals, dict) and "error" in intervals:
+                fetched[attendee] = RuntimeError(intervals["error"])
+            else:
+                fetched[attendee] = [
+                    {"StartTime": interval["start"], "EndTime": interval["end"], "Summary": "Busy"}
+                    for interval in intervals
+                ]
+        return fetched
+    
+    def _fetch_events_concurrently(self, attendees: List[str], start_time: str, end_time: str) -> Dict[str, Any]:
+        """Fetch all attendees' events on a thread pool, bounded by max_workers and attendee_timeout."""
+        workers = min(self.max_workers, len(attendees))
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="calendar-fetch")
+        started = time.monotonic()
+        futures = {attendee: executor.submit(self._fetch_events_safely, attendee, start_time, end_time)
+                   for attendee in attendees}
+        
+        fetched = {}
+        for position, (attendee, future) in enumerate(futures.items()):
+            timeout = None
+            if self.attendee_timeout is not None:
+                # Attendees queued behind a full pool get one extra timeout per wave ahead of them
+                deadline = started + self.attendee_timeout * (position // workers + 1)
+                timeout = max(0.0, deadline - time.monotonic())
+            try:
+                fetched[attendee] = future.result(timeout=timeout)
+            except FutureTimeoutError:
+                future.cancel()
+                fetched[attendee] = TimeoutError(f"Calendar fetch timed out after {self.attendee_timeout}s")
+        
+        # Don't block the request on fetches that already timed out
+        executor.shutdown(wait=False, cancel_futures=True)
+        return fetched
+    
     def find_best_time_slots(self, attendees_availability: Dict[str, Any], 
                            duration_minutes: int, start_range: str, end_range: str,
-                           preferred_day: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Find the best available time slots for the meeting."""
+                           preferred_day: Optional[str] = None,
+                           engine: Optional[str] = None, top_k: int = 5) -> List[Dict[str, Any]]:
+        """Find the best available time slots for the meeting.
+        
+        engine picks the slot search implementation from SLOT_ENGINES and
+        defaults to self.slot_engine; every engine returns the same top_k slots.
+        """
+        engine = engine or self.slot_engine
+        if engine not in SLOT_ENGINES:
+            raise ValueError(f"Unknown slot engine {engine!r}, expected one of {list(SLOT_ENGINES)}")
+        start_dt, end_dt = self._search_window(start_range, end_range, preferred_day)
+        detailed_events = attendees_availability.get("detailed_events", {})
+        return SLOT_ENGINES[engine](self, detailed_events, duration_minutes, start_dt, end_dt, top_k)
+    
+    def find_quorum_slots(self, attendees_availability: Dict[str, Any], duration_minutes: int,
+                          start_range: str, end_range: str, required: List[str],
+                          optional: Optional[List[str]] = None, quorum: Optional[int] = None,
+                          preferred_day: Optional[str] = None, top_k: int = 5) -> List[Dict[str, Any]]:
+        """Find slots where all required attendees and at least quorum invitees are free.
+        
+        Slots are ranked by quorum met, then how many optional attendees can
+        make it, then the usual score; see slot_engines.find_slots_quorum.
+        """
+        start_dt, end_dt = self._search_window(start_range, end_range, preferred_day)
+        detailed_events = attendees_availability.get("detailed_events", {})
+        return find_slots_quorum(self, detailed_events, duration_minutes, start_dt, end_dt,
+                                 required, optional or [], quorum, top_k)
+    
+    def find_tz_slots(self, attendees_availability: Dict[str, Any], duration_minutes: int,
+                      start_range: str, end_range: str,
+                      working_hours: Optional[Dict[str, WorkingHours]] = None,
+                      preferred_day: Optional[str] = None, top_k: int = 5) -> List[Dict[str, Any]]:
+        """Find slots inside every attendee's own working hours, comparing real instants.
+        
+        working_hours adds to (and overrides) self.working_hours for this search;
+        see slot_engines.find_slots_tz. preferred_day narrows the search to that
+        day in the scheduler's timezone.
+        """
+        start_utc = utc_seconds(self._parse_aware_datetime(start_range))
+        end_utc = utc_seconds(self._parse_aware_datetime(end_range))
+        if preferred_day:
+            day = self.timezone.localize(timestamps.parse(preferred_day).replace(
+                hour=0, minute=0, second=0, microsecond=0, tzinfo=None))
+            start_utc = max(start_utc, utc_seconds(day))
+            end_utc = min(end_utc, utc_seconds(day + timedelta(days=1)))
+        profiles = dict(self.working_hours)
+        profiles.update(working_hours or {})
+        detailed_events = attendees_availability.get("detailed_events", {})
+        return find_slots_tz(self, detailed_events, duration_minutes, start_utc, end_utc, profiles, top_k)
+    
+    def recurrence_window(self, start_range: str, occurrences: int = 12, interval_weeks: int = 1) -> Tuple[str, str]:
+        """Start/End covering every occurrence of a weekly series, to fetch calendars once."""
+        try:
+            # Keep the caller's UTC offset so the end is as valid a Calendar API bound as the start
+            start_dt = timestamps.parse(start_range)
+        except ValueError:
+            start_dt = self._parse_flexible_datetime(start_range)
+        end_dt = start_dt.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(
+            weeks=interval_weeks * (occurrences - 1), days=7)
+        return start_range, end_dt.isoformat()
+    
+    def find_recurring_slots(self, attendees_availability: Dict[str, Any], duration_minutes: int,
+                             start_range: str, occurrences: int = 12, interval_weeks: int = 1,
+                             preferred_day: Optional[str] = None, top_k: int = 5) -> List[Dict[str, Any]]:
+        """Find the weekly patterns (weekday and time) with the fewest conflicted occurrences.
+        
+        attendees_availability must cover recurrence_window(start_range, ...);
+        preferred_day restricts patterns to that weekday.
+        """
+        start_dt = self._parse_flexible_datetime(start_range)
+        weekday = timestamps.parse(preferred_day).weekday() if preferred_day else None
+        detailed_events = attendees_availability.get("detailed_events", {})
+        return find_recurring_slots(self, detailed_events, duration_minutes, start_dt, occurrences,
+                                    interval_weeks, weekday, top_k)
+    
+    def _search_window(self, start_range: str, end_range: str,
+                       preferred_day: Optional[str] = None) -> Tuple[datetime, datetime]:
+        """Naive start/end datetimes to search, narrowed to the preferred day's business hours."""
         try:
             # Parse start and end times with flexible format handling
             start_dt = self._parse_flexible_datetime(start_range)
@@ -140,12 +288,15 @@ class MeetingScheduler:
         
         # If preferred day is specified, narrow down the range
         if preferred_day:
-            pref_dt = datetime.fromisoformat(preferred_day)
+            pref_dt = timestamps.parse(preferred_day)
             start_dt = max(start_dt, pref_dt.replace(hour=self.business_start, minute=0))
             end_dt = min(end_dt, pref_dt.replace(hour=self.business_end, minute=0))
-        
+        return start_dt, end_dt
+    
+    def _find_slots_scan(self, detailed_events: Dict[str, Any], duration_minutes: int,
+                         start_dt: datetime, end_dt: datetime, top_k: int = 5) -> List[Dict[str, Any]]:
+        """Reference engine: check every event of every attendee for each 15-minute candidate."""
         available_slots = []
-        detailed_events = attendees_availability.get("detailed_events", {})
         
         # Generate potential time slots
         current = start_dt.replace(hour=self.business_start, minute=0, second=0, microsecond=0)
@@ -224,56 +375,168 @@ class MeetingScheduler:
         # Sort by score and availability
         available_slots.sort(key=lambda x: (x["all_available"], x["score"]), reverse=True)
         
-        return available_slots[:5]  # Return top 5 options
+        return available_slots[:top_k]  # Return top 5 options by default
     
     def _calculate_slot_score(self, slot_time: datetime, all_available: bool, conflicts: List) -> float:
-        """Calculate a score for the time slot based on various factors."""
-        score = 0.0
-        
-        # Base score for availability
-        if all_available:
-            score += 100
-        else:
-            score -= len(conflicts) * 20
-        
-        # Time preference scoring
-        hour = slot_time.hour
-        if 9 <= hour <= 11:  # Morning preferred
-            score += 20
-        elif 14 <= hour <= 16:  # Early afternoon
-            score += 15
-        elif 11 <= hour <= 12:  # Late morning
-            score += 10
-        elif 16 <= hour <= 17:  # Late afternoon
-            score += 5
-        else:  # Less preferred times
-            score -= 10
-        
-        # Day preference (Tuesday-Thursday preferred)
-        weekday = slot_time.weekday()
-        if weekday in [1, 2, 3]:  # Tue, Wed, Thu
-            score += 10
-        elif weekday in [0, 4]:  # Mon, Fri
-            score += 5
-        
-        # Avoid lunch time
-        if 12 <= hour <= 13:
-            score -= 15
-        
-        return score
+        """Calculate a score for the time slot from the scoring weight table."""
+        return self.scoring.score(slot_time, all_available, len(conflicts))
     
     def _get_time_preference(self, hour: int) -> str:
         """Get time preference label."""
-        if 9 <= hour <= 11:
-            return "morning_preferred"
-        elif 11 <= hour <= 13:
-            return "late_morning"
-        elif 13 <= hour <= 15:
-            return "early_afternoon"
-        elif 15 <= hour <= 17:
-            return "late_afternoon"
+        return self.scoring.time_preference(hour)
+    
+    def request_attendees(self, request_data: Dict[str, Any]) -> List[str]:
+        """Organizer followed by every invited attendee."""
+        attendee_emails = [request_data["From"]]
+        for attendee in request_data.get("Attendees", []):
+            attendee_emails.append(attendee["email"])
+        return attendee_emails
+    
+    def request_attendee_roles(self, request_data: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+        """(required, optional) attendees; invitees marked {"optional": true} are optional."""
+        required = [request_data["From"]]
+        optional = []
+        for attendee in request_data.get("Attendees", []):
+            (optional if attendee.get("optional") else required).append(attendee["email"])
+        return required, optional
+    
+    def request_working_hours(self, request_data: Dict[str, Any]) -> Dict[str, WorkingHours]:
+        """Working-hour profiles given in the request.
+        
+        "Timezone"/"Working_hours" describe the organizer; attendee entries may
+        carry "timezone", "working_hours" ("09:00-17:00") and "workdays".
+        """
+        profiles = {}
+        default = self.default_working_hours
+        if request_data.get("Timezone") or request_data.get("Working_hours"):
+            profiles[request_data["From"]] = WorkingHours.from_dict(
+                {"timezone": request_data.get("Timezone"), "working_hours": request_data.get("Working_hours")}, default)
+        for attendee in request_data.get("Attendees", []):
+            if attendee.get("timezone") or attendee.get("working_hours"):
+                profiles[attendee["email"]] = WorkingHours.from_dict(attendee, default)
+        return profiles
+    
+    def request_window(self, request_data: Dict[str, Any]) -> Tuple[str, str]:
+        """Start/End of the search window, defaulting to the coming week."""
+        start_time = request_data.get("Start")
+        end_time = request_data.get("End")
+        
+        # If no time range provided, create a default range for next week
+        if not start_time or not end_time:
+            now = datetime.now()
+            next_week = now + timedelta(days=7)
+            start_time = now.replace(hour=0, minute=0, second=0).isoformat()
+            end_time = next_week.replace(hour=23, minute=59, second=59).isoformat()
+        return start_time, end_time
+    
+    def schedule_from_availability(self, request_data: Dict[str, Any], email_analysis: Dict[str, Any],
+                                   availability: Dict[str, Any], start_time: str, end_time: str,
+                                   reservations: Optional[ReservationTable] = None) -> Dict[str, Any]:
+        """Pick a slot from already fetched availability and build the response.
+        
+        With a reservation table, other requests' tentative holds count as busy
+        time and the chosen slot is held for this request, so concurrent and
+        batched requests don't get handed the same slot. A request without a
+        Request_id is never held, since its hold could not be told apart from
+        other anonymous requests' or replaced later.
+        """
+        request_id = request_data.get("Request_id")
+        if not request_id:
+            reservations = None
+        duration = int(request_data.get("Duration_mins", email_analysis["duration_minutes"]))
+        attendee_emails = self.request_attendees(request_data)
+        
+        search_availability = availability
+        if reservations is not None:
+            search_availability = {
+                "detailed_events": reservations.overlay(
+                    availability["detailed_events"], self._parse_flexible_datetime(start_time),
+                    self._parse_flexible_datetime(end_time), exclude=request_id)
+            }
+        
+        # Optional attendees or a quorum switch to partial-availability ranking
+        required, optional = self.request_attendee_roles(request_data)
+        quorum = request_data.get("Quorum")
+        partial = bool(optional) or quorum is not None
+        profiles = self.request_working_hours(request_data)
+        tz_aware = not partial and any(email in profiles or email in self.working_hours for email in attendee_emails)
+        
+        # Find best time slots
+        if partial:
+            time_slots = self.find_quorum_slots(
+                search_availability,
+                duration,
+                start_time,
+                end_time,
+                required,
+                optional,
+                None if quorum is None else int(quorum),
+                email_analysis.get("preferred_day")
+            )
+        elif tz_aware:
+            time_slots = self.find_tz_slots(
+                search_availability,
+                duration,
+                start_time,
+                end_time,
+                profiles,
+                email_analysis.get("preferred_day")
+            )
         else:
-            return "non_business_hours"
+            time_slots = self.find_best_time_slots(
+                search_availability,
+                duration,
+                start_time,
+                end_time,
+                email_analysis.get("preferred_day")
+            )
+        
+        if not time_slots:
+            # No available slots found
+            return {
+                "error": "No available time slots found for all attendees",
+                "availability_summary": availability["availability_summary"]
+            }
+        
+        # Priority boost is the same for every slot of a request, so it only shifts reported scores
+        boost = self.scoring.priority_boost.get(email_analysis.get("priority"), 0.0)
+        if boost:
+            for slot in time_slots:
+                slot["score"] += boost
+        
+        # Select the best available slot, holding it if another request hasn't taken it meanwhile
+        best_slot = fallback_slot = None
+        for slot in time_slots:
+            if not (slot["quorum_met"] if partial else slot["all_available"]):
+                continue
+            attending = [email for email in attendee_emails if email not in slot.get("unavailable_attendees", [])]
+            if reservations is None or reservations.try_reserve(
+                    request_id, attending, slot["start_time"], slot["end_time"]):
+                best_slot = slot
+                break
+        if best_slot is None:
+            best_slot = fallback_slot = time_slots[0]
+        
+        # Create the final response
+        meeting_response = self.create_meeting_response(request_data, best_slot, availability)
+        
+        # Add metadata
+        meeting_response["scheduling_metadata"] = {
+            "email_analysis": email_analysis,
+            "slot_score": best_slot["score"],
+            "conflicts_resolved": not best_slot["all_available"],
+            "alternative_slots": len([s for s in time_slots if s["all_available"]]),
+            "tentative_hold": reservations is not None and best_slot is not fallback_slot,
+            "processing_timestamp": datetime.now().isoformat()
+        }
+        if partial:
+            meeting_response["scheduling_metadata"].update({
+                "quorum_met": best_slot["quorum_met"],
+                "optional_available": best_slot["optional_available"],
+                "unavailable_attendees": best_slot["unavailable_attendees"]
+            })
+        
+        return meeting_response
     
     def create_meeting_response(self, request_data: Dict[str, Any], 
                               best_slot: Dict[str, Any], 
@@ -281,9 +544,7 @@ class MeetingScheduler:
         """Create the final meeting response in the required format."""
         
         # Extract attendee emails
-        attendee_emails = [request_data["From"]]
-        for attendee in request_data.get("Attendees", []):
-            attendee_emails.append(attendee["email"])
+        attendee_emails = self.request_attendees(request_data)
         
         # Create the response structure
         response = {
@@ -321,7 +582,7 @@ class MeetingScheduler:
             if attendee_email in all_availability.get("detailed_events", {}):
                 existing_events = all_availability["detailed_events"][attendee_email]
                 if not isinstance(existing_events, dict) or "error" not in existing_events:
-                    attendee_events.extend(existing_events)
+                    attendee_events.extend(to_event_dicts(existing_events))
             
             # Add the new scheduled meeting
             attendee_events.append(scheduled_event)
@@ -333,56 +594,47 @@ class MeetingScheduler:
         
         return response
 
+    def _parse_aware_datetime(self, datetime_str: str) -> datetime:
+        """Parse keeping the UTC offset; naive values are wall-clock time in the scheduler's timezone."""
+        try:
+            return timestamps.aware(datetime_str, self.timezone)
+        except ValueError:
+            return self.timezone.localize(self._parse_flexible_datetime(datetime_str))
+    
     def _parse_flexible_datetime(self, datetime_str: str) -> datetime:
-        """Parse datetime string with flexible format handling."""
+        """Parse ISO or DD-MM-YYYY[THH:MM:SS] to a naive wall-clock datetime; unparseable values give now."""
         if not datetime_str:
             return datetime.now()
-        
-        # Remove timezone info for consistent handling
-        clean_str = datetime_str.replace('Z', '').replace('+00:00', '').replace('+05:30', '')
-        
-        # Handle different formats
-        try:
-            # Try standard ISO format first
-            dt = datetime.fromisoformat(clean_str)
-            # Ensure timezone-naive for consistent comparison
-            return dt.replace(tzinfo=None) if dt.tzinfo else dt
-        except ValueError:
-            pass
-        
         try:
-            # Handle DD-MM-YYYY format: "02-07-2025T12:34:55"
-            if 'T' in clean_str:
-                date_part, time_part = clean_str.split('T')
-                if '-' in date_part and len(date_part.split('-')[0]) == 2:
-                    # Convert "02-07-2025" to "2025-07-02"
-                    day, month, year = date_part.split('-')
-                    iso_date = f"{year}-{month}-{day}"
-                    return datetime.fromisoformat(f"{iso_date}T{time_part}")
+            return timestamps.parse_wall(datetime_str)
         except ValueError:
-            pass
-        
-        try:
-            # Handle date only formats
-            if '-' in clean_str and 'T' not in clean_str:
-                parts = clean_str.split('-')
-                if len(parts) == 3 and len(parts[0]) == 2:
-                    # DD-MM-YYYY format
-                    day, month, year = parts
-                    return datetime(int(year), int(month), int(day))
-                elif len(parts) == 3 and len(parts[0]) == 4:
-                    # YYYY-MM-DD format
-                    return datetime.fromisoformat(clean_str)
-        except ValueError:
-            pass
-        
-        # Fallback to current time
-        print(f"Warning: Could not parse datetime '{datetime_str}', using current time")
-        return datetime.now()
+            # Fallback to current time
+            print(f"Warning: Could not parse datetime '{datetime_str}', using current time")
+            return datetime.now()
 
-def process_meeting_request(request_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Main function to process a meeting request and return the scheduled meeting."""
-    scheduler = MeetingScheduler()
+# Slot search engines by name; "scan" is the original per-candidate loop
+SLOT_ENGINES = {
+    "scan": MeetingScheduler._find_slots_scan,
+    "sweep": find_slots_sweep,
+    "topk": find_slots_topk,
+}
+if NUMPY_AVAILABLE:
+    SLOT_ENGINES["bitmap"] = find_slots_bitmap
+
+def process_meeting_request(request_data: Dict[str, Any], availability_mode: str = "full",
+                            provider: Optional[CalendarProvider] = None,
+                            reservations: Optional[ReservationTable] = None) -> Dict[str, Any]:
+    """Main function to process a meeting request and return the scheduled meeting.
+    
+    Use availability_mode="busy" when the response doesn't need to echo each
+    attendee's existing events; it fetches only FreeBusy intervals. Pass a
+    provider (e.g. LocalCalendarProvider) to run without Google Calendar.
+    Nothing is held by default; pass a ReservationTable (e.g. the shared
+    reservations.tentative_reservations) to hold the chosen slot so later
+    requests avoid it.
+    """
+    scheduler = MeetingScheduler(availability_mode=availability_mode, provider=provider,
+                                 compact_events=True)
     
     try:
         # Parse email content for additional details
@@ -391,24 +643,9 @@ def process_meeting_request(request_data: Dict[str, Any]) -> Dict[str, Any]:
             request_data.get("Datetime", "")
         )
         
-        # Get duration from analysis or request
-        duration = int(request_data.get("Duration_mins", email_analysis["duration_minutes"]))
-        
-        # Get all attendees
-        attendee_emails = [request_data["From"]]
-        for attendee in request_data.get("Attendees", []):
-            attendee_emails.append(attendee["email"])
-        
-        # Handle the case where Start/End might not be provided
-        start_time = request_data.get("Start")
-        end_time = request_data.get("End")
-        
-        # If no time range provided, create a default range for next week
-        if not start_time or not end_time:
-            now = datetime.now()
-            next_week = now + timedelta(days=7)
-            start_time = now.replace(hour=0, minute=0, second=0).isoformat()
-            end_time = next_week.replace(hour=23, minute=59, second=59).isoformat()
+        # Get all attendees and the search window
+        attendee_emails = scheduler.request_attendees(request_data)
+        start_time, end_time = scheduler.request_window(request_data)
         
         # Get availability for all attendees
         availability = scheduler.get_availability_for_all(
@@ -417,45 +654,19 @@ def process_meeting_request(request_data: Dict[str, Any]) -> Dict[str, Any]:
             end_time
         )
         
-        # Find best time slots
-        time_slots = scheduler.find_best_time_slots(
-            availability,
-            duration,
-            start_time,
-            end_time,
-            email_analysis.get("preferred_day")
-        )
-        
-        if not time_slots:
-            # No available slots found
-            return {
-                "error": "No available time slots found for all attendees",
-                "availability_summary": availability["availability_summary"]
-            }
-        
-        # Select the best available slot
-        best_slot = next((slot for slot in time_slots if slot["all_available"]), time_slots[0])
-        
-        # Create the final response
-        meeting_response = scheduler.create_meeting_response(request_data, best_slot, availability)
-        
-        # Add metadata
-        meeting_response["scheduling_metadata"] = {
-            "email_analysis": email_analysis,
-            "slot_score": best_slot["score"],
-            "conflicts_resolved": not best_slot["all_available"],
-            "alternative_slots": len([s for s in time_slots if s["all_available"]]),
-            "processing_timestamp": datetime.now().isoformat()
-        }
-        
-        return meeting_response
+        return scheduler.schedule_from_availability(request_data, email_analysis, availability,
+                                                    start_time, end_time, reservations)
         
     except Exception as e:
-        return {
-            "error": f"Failed to process meeting request: {str(e)}",
-            "request_id": request_data.get("Request_id", "unknown"),
-            "debug_info": {
-                "original_datetime": request_data.get("Datetime", ""),
-                "error_type": type(e).__name__
-            }
+        return request_failure_response(request_data, e)
+
+def request_failure_response(request_data: Dict[str, Any], error: Exception) -> Dict[str, Any]:
+    """Error response for a request that could not be processed."""
+    return {
+        "error": f"Failed to process meeting request: {str(error)}",
+        "request_id": request_data.get("Request_id", "unknown"),
+        "debug_info": {
+            "original_datetime": request_data.get("Datetime", ""),
+            "error_type": type(error).__name__
         }
+    }
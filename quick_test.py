@@ -39,6 +39,908 @@ def test_meeting_utils():
         print(f"❌ Meeting utils error: {e}")
         return False
 
+def test_concurrent_availability():
+    """Test that attendee calendars are fetched concurrently with per-attendee errors."""
+    import time
+    from meeting_utils import MeetingScheduler
+    
+    def slow_fetch(user, start, end):
+        time.sleep(0.2)
+        if user.startswith("broken"):
+            raise RuntimeError("token expired")
+        return [{"StartTime": start, "EndTime": end, "Summary": "Busy", "Attendees": [user]}]
+    
+    attendees = [f"user{i}@example.com" for i in range(11)] + ["broken@example.com"]
+    scheduler = MeetingScheduler(max_workers=12, fetch_events=slow_fetch)
+    
+    started = time.perf_counter()
+    result = scheduler.get_availability_for_all(attendees, "2025-07-17T00:00:00", "2025-07-17T23:59:59")
+    elapsed = time.perf_counter() - started
+    
+    assert elapsed < 0.2 * 2, f"fan-out took {elapsed:.2f}s for {len(attendees)} attendees"
+    assert result["detailed_events"]["broken@example.com"] == {"error": "token expired"}
+    assert len(result["detailed_events"]["user0@example.com"]) == 1
+    
+    scheduler = MeetingScheduler(max_workers=4, attendee_timeout=0.05, fetch_events=slow_fetch)
+    result = scheduler.get_availability_for_all(attendees[:2], "2025-07-17T00:00:00", "2025-07-17T23:59:59")
+    assert "timed out" in result["detailed_events"]["user0@example.com"]["error"]
+    
+    print(f"✅ Concurrent fan-out: {len(attendees)} attendees in {elapsed:.2f}s (one fetch = 0.20s)")
+
+def test_calendar_client_registry():
+    """Test that Calendar clients are reused per token and rebuilt only when the token file changes."""
+    import tempfile
+    import threading
+    import time
+    from benchmark import write_fake_tokens
+    from calendar_extractor import CalendarClientRegistry
+    
+    class SlowRegistry(CalendarClientRegistry):
+        def _build(self, user, token_path):
+            time.sleep(0.05)
+            return super()._build(user, token_path)
+    
+    user = "userone.amd@gmail.com"
+    with tempfile.TemporaryDirectory() as keys_dir:
+        write_fake_tokens(keys_dir, [user])
+        registry = SlowRegistry(keys_dir=keys_dir)
+        
+        # Concurrent first use builds the client once
+        barrier = threading.Barrier(8)
+        clients = []
+        
+        def worker():
+            barrier.wait()
+            clients.append(registry.get(user))
+        
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert registry.builds == 1 and len({id(client) for client in clients}) == 1, registry.builds
+        
+        # Same token, same client
+        client = registry.get(user)
+        assert client is clients[0] and registry.builds == 1 and registry.hits == 8
+        
+        # A refreshed token (new contents) or a touched file rebuilds the client
+        token_path = registry.token_path(user)
+        with open(token_path) as f:
+            token = json.load(f)
+        token["token"] = "refreshed-access-token"
+        with open(token_path, "w") as f:
+            json.dump(token, f)
+        refreshed = registry.get(user)
+        assert refreshed is not client and registry.builds == 2
+        stat = os.stat(token_path)
+        os.utime(token_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert registry.get(user) is not refreshed and registry.builds == 3
+        assert registry.get(user) is registry.get(user) and registry.builds == 3
+    
+    print(f"✅ Calendar client registry: {registry.builds} builds, {registry.hits} hits")
+
+def test_busy_only_availability():
+    """Test the FreeBusy backend against a local fake Calendar endpoint."""
+    import tempfile
+    from benchmark import sample_events_page, start_stub_calendar_server, write_fake_tokens
+    from calendar_extractor import CalendarClientRegistry
+    from calendar_providers import GoogleCalendarProvider
+    from meeting_utils import MeetingScheduler
+    
+    users = ["userone.amd@gmail.com", "usertwo.amd@gmail.com"]
+    server = start_stub_calendar_server(sample_events_page(4))
+    endpoint = f"http://127.0.0.1:{server.server_address[1]}/calendar/v3/"
+    try:
+        with tempfile.TemporaryDirectory() as keys_dir:
+            write_fake_tokens(keys_dir, users)
+            registry = CalendarClientRegistry(keys_dir=keys_dir, api_endpoint=endpoint)
+            scheduler = MeetingScheduler(availability_mode="busy",
+                                         provider=GoogleCalendarProvider(registry=registry))
+            result = scheduler.get_availability_for_all(users, "2025-07-17T00:00:00+05:30", "2025-07-17T23:59:59+05:30")
+    finally:
+        server.shutdown()
+    
+    busy = result["detailed_events"]["usertwo.amd@gmail.com"]
+    assert len(busy) == 4 and busy[0]["StartTime"] == "2025-07-17T09:00:00+05:30"
+    assert result["availability_summary"]["userone.amd@gmail.com"]["total_events"] == 4
+    print(f"✅ Busy-only availability: {len(busy)} busy intervals per attendee from one FreeBusy call")
+
+def test_event_sync_cache():
+    """Test full sync, cached hits, incremental sync, 410 resync and LRU eviction."""
+    import tempfile
+    from benchmark import sample_events_page, start_stub_calendar_server, write_fake_tokens
+    from calendar_extractor import CalendarClientRegistry, CalendarEventCache, retrive_calendar_events
+    
+    users = ["userone.amd@gmail.com", "usertwo.amd@gmail.com"]
+    start, end = "2025-07-17T00:00:00+05:30", "2025-07-17T23:59:59+05:30"
+    server = start_stub_calendar_server(sample_events_page(4))
+    handler = server.RequestHandlerClass
+    endpoint = f"http://127.0.0.1:{server.server_address[1]}/calendar/v3/"
+    now = [0.0]
+    try:
+        with tempfile.TemporaryDirectory() as keys_dir:
+            write_fake_tokens(keys_dir, users)
+            registry = CalendarClientRegistry(keys_dir=keys_dir, api_endpoint=endpoint)
+            cache = CalendarEventCache(max_users=1, sync_interval=30, registry=registry, clock=lambda: now[0])
+            
+            assert len(retrive_calendar_events(users[0], start, end, cache=cache)) == 4
+            assert len(retrive_calendar_events(users[0], start, end, cache=cache)) == 4
+            assert cache.stats()["misses"] == 1 and cache.stats()["hits"] == 1
+            
+            handler.changes.append({"id": "event0", "status": "cancelled"})
+            now[0] = 60.0
+            assert len(retrive_calendar_events(users[0], start, end, cache=cache)) == 3
+            assert "syncToken" in handler.requests_seen[-1]
+            
+            handler.expired_sync_tokens.add("sync-0+")
+            now[0] = 120.0
+            assert len(retrive_calendar_events(users[0], start, end, cache=cache)) == 4
+            assert cache.stats()["resyncs"] == 1
+            
+            retrive_calendar_events(users[1], start, end, cache=cache)
+            stats = cache.stats()
+            assert stats["users"] == 1 and stats["evictions"] == 1
+            
+            # A naive window synced first still serves a later aware read for the same user
+            mixed = CalendarEventCache(registry=registry, clock=lambda: now[0])
+            assert len(retrive_calendar_events(users[0], "2025-07-17T00:00:00", "2025-07-17T23:59:59",
+                                               cache=mixed)) == 4
+            assert len(retrive_calendar_events(users[0], start, end, cache=mixed)) == 4
+            assert mixed.stats()["hits"] == 1, mixed.stats()
+    finally:
+        server.shutdown()
+    
+    print(f"✅ Event sync cache: {stats}")
+
+def test_paginated_events():
+    """Test that event retrieval follows every page and streams as pages arrive."""
+    import tempfile
+    from benchmark import sample_events_page, start_stub_calendar_server, write_fake_tokens
+    from calendar_extractor import CalendarClientRegistry, iter_calendar_events, retrive_calendar_events
+    
+    user = "userone.amd@gmail.com"
+    start, end = "2025-07-17T00:00:00+05:30", "2025-07-17T23:59:59+05:30"
+    server = start_stub_calendar_server(sample_events_page(600))
+    handler = server.RequestHandlerClass
+    endpoint = f"http://127.0.0.1:{server.server_address[1]}/calendar/v3/"
+    try:
+        with tempfile.TemporaryDirectory() as keys_dir:
+            write_fake_tokens(keys_dir, [user])
+            registry = CalendarClientRegistry(keys_dir=keys_dir, api_endpoint=endpoint)
+            
+            stream = iter_calendar_events(user, start, end, page_size=250, registry=registry)
+            first = next(stream)
+            assert first["Summary"] == "Event 0" and len(handler.requests_seen) == 1
+            assert 1 + sum(1 for _ in stream) == 600 and len(handler.requests_seen) == 3
+            
+            events = retrive_calendar_events(user, start, end, registry=registry, page_size=100)
+            assert len(events) == 600
+    finally:
+        server.shutdown()
+    
+    print(f"✅ Paginated retrieval: {len(events)} events across {len(handler.requests_seen) - 3} pages")
+
+def test_local_providers():
+    """Test the offline calendar providers with the rule-based scheduler."""
+    from calendar_providers import LocalCalendarProvider, SyntheticCalendarProvider
+    from meeting_utils import process_meeting_request
+    
+    provider = LocalCalendarProvider.from_json("3_Output_Event.json")
+    events = provider.get_events("usertwo.amd@gmail.com", "2025-07-17T00:00:00+05:30", "2025-07-17T23:59:59+05:30")
+    assert [event["Summary"] for event in events][0] == "Team Meet"
+    
+    with open("1_Input_Request.json", "r") as f:
+        request = json.load(f)
+    request.update({"Datetime": "16-07-2025T12:34:55",
+                    "Start": "2025-07-17T00:00:00+05:30", "End": "2025-07-17T23:59:59+05:30"})
+    result = process_meeting_request(request, provider=provider)
+    assert "error" not in result, result.get("error")
+    
+    synthetic = SyntheticCalendarProvider(events_per_day=6)
+    week = synthetic.get_events("userone.amd@gmail.com", "2025-07-14T00:00:00+05:30", "2025-07-20T23:59:59+05:30")
+    assert len(week) == 5 * 6
+    
+    from meeting_utils import MeetingScheduler
+    availability = MeetingScheduler(provider=provider).get_availability_for_all(
+        ["usertwo.amd@gmail.com"], "2025-07-17T00:00:00+05:30", "2025-07-17T23:59:59+05:30")
+    assert json.loads(json.dumps(availability["detailed_events"])), "detailed_events must stay JSON dicts"
+    
+    print(f"✅ Local providers: scheduled {result['Attendees'][0]['events'][-1]['StartTime']} offline")
+
+def test_slot_engines_agree():
+    """Test that every slot engine returns the same top 5 as the original scan."""
+    from benchmark import synthetic_availability
+    from meeting_utils import MeetingScheduler, SLOT_ENGINES
+    
+    start, end = "2025-07-14T00:00:00+05:30", "2025-07-25T23:59:59+05:30"
+    availability = synthetic_availability(8, 8, start, end)
+    availability["detailed_events"]["broken@example.com"] = {"error": "token expired"}
+    scheduler = MeetingScheduler()
+    
+    for duration in (15, 30, 60):
+        expected = scheduler.find_best_time_slots(availability, duration, start, end, engine="scan")
+        for engine in SLOT_ENGINES:
+            assert scheduler.find_best_time_slots(availability, duration, start, end, engine=engine) == expected, engine
+    
+    # Zero-length events (on and off the 5-minute grid) and off-tick events
+    def event(day, start_time, end_time):
+        return {"StartTime": f"2025-07-{day}T{start_time}:00+05:30", "EndTime": f"2025-07-{day}T{end_time}:00+05:30",
+                "Summary": "Edge"}
+    edges = {"detailed_events": {
+        "a@example.com": [event(17, "09:30", "09:30"), event(17, "11:07", "11:07"), event(18, "10:05", "10:05")],
+        "b@example.com": [event(17, "09:03", "09:22"), event(17, "14:58", "15:01"), event(18, "09:00", "09:00")],
+    }}
+    day_start, day_end = "2025-07-17T00:00:00+05:30", "2025-07-18T23:59:59+05:30"
+    for duration in (15, 20, 30, 45):
+        expected = scheduler.find_best_time_slots(edges, duration, day_start, day_end, engine="scan", top_k=40)
+        for engine in SLOT_ENGINES:
+            assert scheduler.find_best_time_slots(edges, duration, day_start, day_end, engine=engine,
+                                                  top_k=40) == expected, (engine, duration)
+    first = scheduler.find_best_time_slots(edges, 20, day_start, day_end, engine="scan")[0]
+    assert first["start_time"] == "2025-07-17T09:30:00", first
+    
+    print(f"✅ Slot engines agree: {list(SLOT_ENGINES)}")
+
+def test_quorum_scheduling():
+    """Test optional attendees and k-of-n quorum ranking."""
+    from benchmark import synthetic_availability
+    from meeting_utils import MeetingScheduler
+    
+    start, end = "2025-07-14T00:00:00+05:30", "2025-07-18T23:59:59+05:30"
+    availability = synthetic_availability(10, 14, start, end)
+    attendees = list(availability["detailed_events"])
+    scheduler = MeetingScheduler()
+    
+    assert not any(slot["all_available"] for slot in scheduler.find_best_time_slots(availability, 30, start, end))
+    slots = scheduler.find_quorum_slots(availability, 30, start, end, attendees[:2], attendees[2:], quorum=7)
+    best = slots[0]
+    assert best["quorum_met"] and best["required_available"], best
+    assert best["available_attendees"] >= 7
+    assert not set(best["unavailable_attendees"]) & set(attendees[:2])
+    assert [slot["optional_available"] for slot in slots] == sorted(
+        (slot["optional_available"] for slot in slots), reverse=True)
+    
+    # A zero-length event never blocks a slot, with or without numpy
+    import slot_engines
+    marker = {"StartTime": "2025-07-14T09:10:00+05:30", "EndTime": "2025-07-14T09:10:00+05:30",
+              "Summary": "Reminder"}
+    pair = {"detailed_events": {"a@example.com": [marker], "b@example.com": []}}
+    day_end = "2025-07-14T23:59:59+05:30"
+    paths = []
+    for use_numpy in [False] + ([True] if slot_engines.NUMPY_AVAILABLE else []):
+        slot_engines.NUMPY_AVAILABLE = use_numpy
+        try:
+            paths.append(scheduler.find_quorum_slots(pair, 30, start, day_end, ["a@example.com"],
+                                                     ["b@example.com"], top_k=100))
+        finally:
+            slot_engines.NUMPY_AVAILABLE = bool(slot_engines.np)
+    for quorum_slots in paths:
+        assert all(slot["all_available"] and slot["quorum_met"] for slot in quorum_slots), quorum_slots[0]
+        assert quorum_slots[0]["start_time"] == paths[0][0]["start_time"]
+    
+    print(f"✅ Quorum scheduling: {best['start_time']} with {best['available_attendees']}/10 free")
+
+def test_recurring_slots():
+    """Test the weekly recurring-meeting search against hand-built calendars."""
+    from meeting_utils import MeetingScheduler
+    
+    scheduler = MeetingScheduler()
+    start, end = scheduler.recurrence_window("2025-07-14T00:00:00+05:30", occurrences=4)
+    assert end == "2025-08-11T00:00:00+05:30", end
+    
+    # Busy every morning except Tuesdays, plus one Tuesday 9:00 clash in week 3
+    def event(day, start_hour, end_hour):
+        return {"StartTime": f"2025-{day}T{start_hour:02d}:00:00+05:30",
+                "EndTime": f"2025-{day}T{end_hour:02d}:00:00+05:30", "Summary": "Busy"}
+    mornings = [event(f"{(datetime(2025, 7, 14) + timedelta(days=d)):%m-%d}", 9, 12)
+                for d in range(28) if d % 7 != 1]
+    availability = {"detailed_events": {
+        "a@example.com": mornings,
+        "b@example.com": [event("07-29", 9, 10)],
+        "c@example.com": {"error": "token expired"},
+    }}
+    
+    slots = scheduler.find_recurring_slots(availability, 30, start, occurrences=4)
+    assert slots[0]["day_of_week"] == "Tuesday" and slots[0]["start_time"].endswith("T10:00:00"), slots[0]
+    assert slots[0]["conflicted_occurrences"] == 0 and len(slots[0]["occurrences"]) == 4
+    tuesday_nine = scheduler.find_recurring_slots(
+        availability, 30, start, occurrences=4, preferred_day="2025-07-15T00:00:00", top_k=100)
+    nine = next(slot for slot in tuesday_nine if slot["start_time"].endswith("T09:00:00"))
+    assert nine["conflicted_occurrences"] == 1
+    assert nine["occurrence_conflicts"][0]["start_time"] == "2025-07-29T09:00:00"
+    
+    print(f"✅ Recurring slots: {slots[0]['day_of_week']} {slots[0]['start_time'][11:16]} free all 4 weeks")
+
+def test_timezone_slots():
+    """Test tz-aware slots stay inside every attendee's local working hours."""
+    from meeting_utils import MeetingScheduler
+    from working_hours import WorkingHours, working_hour_masks
+    
+    scheduler = MeetingScheduler(working_hours={
+        "berlin@example.com": WorkingHours("Europe/Berlin", "09:00", "17:00"),
+        "newyork@example.com": WorkingHours("America/New_York", "07:00", "16:00"),
+    })
+    availability = {"detailed_events": {
+        "kolkata@example.com": [],
+        "berlin@example.com": [],
+        # 16:30-17:00 IST is 13:00-13:30 in Berlin (UTC+2 in July)
+        "newyork@example.com": [{"StartTime": "2025-07-15T13:00:00+02:00",
+                                 "EndTime": "2025-07-15T13:30:00+02:00", "Summary": "Standup"}],
+    }}
+    start, end = "2025-07-15T00:00:00+05:30", "2025-07-15T23:59:59+05:30"
+    
+    slots = scheduler.find_tz_slots(availability, 30, start, end, top_k=10)
+    # Common hours are 16:30-18:00 IST; the New York standup blocks 16:30 and 16:45
+    assert [slot["start_time"] for slot in slots] == [
+        "2025-07-15T17:00:00+05:30", "2025-07-15T17:15:00+05:30", "2025-07-15T17:30:00+05:30",
+        "2025-07-15T16:30:00+05:30", "2025-07-15T16:45:00+05:30"], [slot["start_time"] for slot in slots]
+    assert slots[0]["local_start_times"]["newyork@example.com"] == "2025-07-15T07:30:00-04:00"
+    
+    before = working_hour_masks.stats()["compiles"]
+    scheduler.find_tz_slots(availability, 30, start, end)
+    assert working_hour_masks.stats()["compiles"] == before, "masks should be cached"
+    
+    print(f"✅ Timezone slots: {slots[0]['start_time']} fits Kolkata, Berlin and New York hours")
+
+def test_slot_scoring():
+    """Test the scoring weight table matches the original scoring and can be reconfigured."""
+    import tempfile
+    from benchmark import legacy_slot_score
+    from compact_events import wall_seconds
+    from meeting_utils import MeetingScheduler
+    from slot_scoring import SlotScoring
+    
+    scoring = SlotScoring()
+    slots = [datetime(2025, 7, 14) + timedelta(days=day, hours=hour, minutes=30)
+             for day in range(7) for hour in range(24)]
+    for conflicts in ([], [None], [None] * 3):
+        expected = [legacy_slot_score(slot, not conflicts, conflicts) for slot in slots]
+        assert [scoring.score(slot, not conflicts, len(conflicts)) for slot in slots] == expected
+        assert scoring.scores([wall_seconds(slot) for slot in slots], [len(conflicts)] * len(slots)) == expected
+    
+    # Per-deployment weights: afternoons preferred, no lunch penalty
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+        json.dump({"hour_weights": {"9-11": 0, "14-16": 40}, "lunch_penalty": 0,
+                   "priority_boost": {"high": 50}}, f)
+    custom = SlotScoring.from_file(f.name)
+    os.unlink(f.name)
+    assert custom.score(datetime(2025, 7, 15, 14), True) == 150.0
+    assert custom.score(datetime(2025, 7, 15, 14), True, priority="high") == 200.0
+    
+    start, end = "2025-07-15T00:00:00", "2025-07-15T23:59:59"
+    best = MeetingScheduler(scoring=custom).find_best_time_slots({"detailed_events": {}}, 30, start, end)[0]
+    assert best["start_time"] == "2025-07-15T14:00:00", best
+    
+    print(f"✅ Slot scoring: defaults match the original for {len(slots) * 3} cases")
+
+def test_incremental_rescheduling():
+    """Test that calendar deltas on SchedulingState match a full re-run."""
+    from benchmark import synthetic_availability
+    from meeting_utils import MeetingScheduler
+    from rescheduling import SchedulingState
+    
+    start, end = "2025-07-14T00:00:00+05:30", "2025-07-18T23:59:59+05:30"
+    availability = synthetic_availability(6, 6, start, end)
+    scheduler = MeetingScheduler()
+    state = SchedulingState(scheduler, availability["detailed_events"], 30, start, end)
+    
+    def full_run():
+        calendars = {attendee: [event for _, event in state.event_keys(attendee)]
+                     for attendee in availability["detailed_events"]}
+        return scheduler.find_best_time_slots({"detailed_events": calendars}, 30, start, end)
+    
+    assert state.top_slots() == full_run()
+    best = state.best_slot()
+    blocker = {"StartTime": best["start_time"], "EndTime": best["end_time"], "Summary": "New conflict"}
+    key = state.add_event("user0@example.com", blocker)
+    assert state.best_slot()["start_time"] != best["start_time"]
+    assert state.top_slots() == full_run()
+    
+    moved = dict(blocker, StartTime="2025-07-14T07:00:00", EndTime="2025-07-14T08:00:00")
+    state.move_event("user0@example.com", key, moved)
+    assert state.best_slot() == best
+    first_key, _ = state.event_keys("user1@example.com")[0]
+    state.remove_event("user1@example.com", first_key)
+    assert state.top_slots() == full_run()
+    
+    print(f"✅ Incremental rescheduling: {state.stats()}")
+
+def test_batch_scheduling():
+    """Test that batched and single requests never get handed the same slot."""
+    from batch_scheduler import process_meeting_batch
+    from calendar_providers import LocalCalendarProvider
+    from meeting_utils import process_meeting_request
+    from reservations import ReservationTable
+    
+    provider = LocalCalendarProvider.from_json("3_Output_Event.json")
+    table = ReservationTable()
+    with open("1_Input_Request.json", "r") as f:
+        request = json.load(f)
+    request.update({"Datetime": "16-07-2025T12:34:55",
+                    "Start": "2025-07-17T00:00:00+05:30", "End": "2025-07-17T23:59:59+05:30"})
+    batch = [dict(request, Request_id=f"batch-{i}") for i in range(3)]
+    batch[2]["EmailContent"] += " It's urgent."
+    
+    responses = process_meeting_batch(batch, provider=provider, reservations=table)
+    single = process_meeting_request(dict(request, Request_id="single"), provider=provider, reservations=table)
+    starts = [response["Attendees"][0]["events"][-1]["StartTime"] for response in responses + [single]]
+    assert len(set(starts)) == 4, starts
+    assert starts[2] < starts[0] < starts[1], "urgent request should be placed first"
+    
+    again = process_meeting_request(dict(request, Request_id="single"), provider=provider, reservations=table)
+    assert again["Attendees"][0]["events"][-1]["StartTime"] == starts[3], "re-scheduling keeps its own hold"
+    assert table.stats()["holds"] == 4
+    
+    # Holds are opt-in, and never made for a request without an id
+    from reservations import tentative_reservations
+    shared_holds = tentative_reservations.stats()["holds"]
+    plain = process_meeting_request(dict(request, Request_id="plain"), provider=provider)
+    assert not plain["scheduling_metadata"]["tentative_hold"]
+    assert tentative_reservations.stats()["holds"] == shared_holds
+    anonymous = {key: value for key, value in request.items() if key != "Request_id"}
+    process_meeting_request(anonymous, provider=provider, reservations=table)
+    assert table.stats()["holds"] == 4, table.stats()
+    unshared = process_meeting_batch(batch, provider=provider, reservations=None)
+    assert len({response["Attendees"][0]["events"][-1]["StartTime"] for response in unshared}) == 3
+    assert tentative_reservations.stats()["holds"] == shared_holds
+    
+    # Two concurrent /receive calls share tentative_reservations through the serving entry point
+    import functools
+    import threading
+    import meeting_scheduler_agent as msa
+    from circuit_breaker import CircuitBreaker
+    
+    tripped = CircuitBreaker()
+    tripped.trip("model server down")
+    saved = msa.process_meeting_request, msa.llm_breaker
+    msa.process_meeting_request = functools.partial(process_meeting_request, provider=provider)
+    msa.llm_breaker = tripped
+    barrier = threading.Barrier(2)
+    received = {}
+    
+    def receive(request_id):
+        barrier.wait()
+        received[request_id] = msa.schedule_meeting_speculative(dict(request, Request_id=request_id), budget=10)
+    
+    try:
+        threads = [threading.Thread(target=receive, args=(f"receive-{i}",)) for i in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        msa.process_meeting_request, msa.llm_breaker = saved
+        for request_id in received:
+            tentative_reservations.release(request_id)
+    slots = {result["response"]["Attendees"][0]["events"][-1]["StartTime"] for result in received.values()}
+    assert len(received) == 2 and len(slots) == 2, slots
+    
+    print(f"✅ Batch scheduling: {len(set(starts))} distinct slots, {table.stats()}")
+
+def test_email_extraction():
+    """Test the single-pass email extractor on arbitrary durations and clock times."""
+    from email_extraction import extract_email_details
+    from meeting_utils import MeetingScheduler
+    
+    details = extract_email_details("URGENT: can we do 1 hour 30 min on Friday or Tuesday at 2:30 p.m.?")
+    assert details["duration_minutes"] == 90 and details["weekday"] == 1, details
+    assert details["meeting_time"] == (14, 30) and details["priority"] == "high", details
+    assert details["urgency_keywords"] == ["urgent"]
+    
+    cases = {"90-minute review at 16:45": (90, (16, 45)), "1.5 hrs in the morning": (90, (10, 0)),
+             "Quick 20 min sync around 11am": (20, (11, 0)), "half an hour, no rush": (30, None),
+             "meet for 130 mins": (130, None), "nothing specific": (None, None)}
+    for email, expected in cases.items():
+        details = extract_email_details(email)
+        assert (details["duration_minutes"], details["meeting_time"]) == expected, (email, details)
+    assert extract_email_details("half an hour, no rush")["priority"] == "low"
+    
+    scheduler = MeetingScheduler()
+    result = scheduler.parse_email_content("Flexible, 45 mins tomorrow or today", "16-07-2025T12:34:55")
+    assert result == {"duration_minutes": 45, "preferred_day": "2025-07-17T12:34:55",
+                      "priority": "low", "urgency_keywords": []}, result
+    assert scheduler.parse_email_content("Let's talk", "16-07-2025T12:34:55")["duration_minutes"] == 30
+    
+    print(f"✅ Email extraction: {len(cases) + 2} emails parsed as expected")
+
+def test_timestamp_parsing():
+    """Test the memoized timestamp parser on request and event formats."""
+    import pytz
+    from meeting_utils import MeetingScheduler
+    from timestamps import TimestampParser
+    
+    parser = TimestampParser(max_entries=64)
+    assert parser.parse("16-07-2025T12:34:55") == datetime(2025, 7, 16, 12, 34, 55)
+    assert parser.parse("02-07-2025") == datetime(2025, 7, 2)
+    assert parser.parse_wall("2025-07-17T09:00:00+05:30") == datetime(2025, 7, 17, 9)
+    assert parser.epoch("2025-07-17T03:30:00Z") == parser.epoch("2025-07-17T09:00:00") == 1752723000
+    assert parser.epoch_offset("2025-07-17T09:00:00+05:30") == (1752723000, 19800)
+    assert parser.wall("2025-07-17T09:00:00+05:30") == parser.wall("2025-07-17T09:00:00")
+    aware = parser.aware("2025-07-17T09:00:00", pytz.timezone("Europe/Berlin"))
+    assert aware.utcoffset() == timedelta(hours=2)
+    for bad in ("not a date", "32-07-2025T12:00:00", None):
+        try:
+            parser.parse(bad)
+            raise AssertionError(f"{bad!r} should not parse")
+        except ValueError:
+            pass
+    for _ in range(3):
+        parser.wall("16-07-2025T12:34:55")
+    stats = parser.stats()
+    assert stats["hits"] >= 2 and stats["shapes"] >= 3, stats
+    
+    scheduler = MeetingScheduler()
+    assert scheduler._parse_flexible_datetime("16-07-2025T12:34:55Z") == datetime(2025, 7, 16, 12, 34, 55)
+    assert scheduler._parse_aware_datetime("16-07-2025T12:34:55").utcoffset() == timedelta(hours=5, minutes=30)
+    
+    print(f"✅ Timestamp parsing: {stats}")
+
+def test_extraction_cache():
+    """Test LRU/TTL eviction, normalization and SQLite persistence of the extraction cache."""
+    import tempfile
+    from email_extraction import cached_email_details
+    from extraction_cache import ExtractionCache
+    
+    now = [1000.0]
+    cache = ExtractionCache(max_entries=2, ttl=60, clock=lambda: now[0])
+    first = cached_email_details("Let's meet Thursday at 2 PM for 45 mins", cache)
+    again = cached_email_details("  let's MEET thursday at 2 pm   for 45 mins", cache)
+    assert first == again and again["duration_minutes"] == 45 and again["meeting_time"] == [14, 0], again
+    again["urgency_keywords"].append("mutated")
+    assert cached_email_details("Let's meet Thursday at 2 PM for 45 mins", cache)["urgency_keywords"] == []
+    
+    cache.put("date_range", "same email", {"Start": "a"}, anchor="2025-07-16")
+    cache.put("date_range", "same email", {"Start": "b"}, anchor="2025-07-17")
+    assert cache.get("date_range", "same email", "2025-07-16") == {"Start": "a"}
+    assert cache.get("rules", "Let's meet Thursday at 2 PM for 45 mins") is None, "LRU should have evicted it"
+    now[0] += 61
+    assert cache.get("date_range", "same email", "2025-07-16") is None, "entry should have expired"
+    stats = cache.stats()
+    assert stats["evictions"] >= 1 and stats["expired"] == 1 and stats["hits"] == 3, stats
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "extractions.db")
+        writer = ExtractionCache(db_path=db_path)
+        cached_email_details("Urgent: 1 hour tomorrow", writer)
+        writer.close()
+        reader = ExtractionCache(db_path=db_path)
+        assert reader.get("rules", "urgent: 1 hour tomorrow")["priority"] == "high"
+        assert reader.stats()["disk_hits"] == 1
+        reader.close()
+    
+    print(f"✅ Extraction cache: {stats}")
+
+def test_speculative_scheduling():
+    """Test that the speculative scheduler keeps to its latency budget and prefers valid LLM answers."""
+    import asyncio
+    import functools
+    import time
+    from calendar_providers import LocalCalendarProvider
+    from meeting_scheduler_agent import schedule_meeting_speculative_async
+    from meeting_utils import process_meeting_request
+    from reservations import ReservationTable
+    
+    provider = LocalCalendarProvider.from_json("3_Output_Event.json")
+    table = ReservationTable()
+    rule_based = functools.partial(process_meeting_request, provider=provider)
+    with open("1_Input_Request.json", "r") as f:
+        request = json.load(f)
+    request.update({"Datetime": "16-07-2025T12:34:55",
+                    "Start": "2025-07-17T00:00:00+05:30", "End": "2025-07-17T23:59:59+05:30"})
+    
+    def fake_llm(delay, start="2025-07-17T15:00:00+05:30", end="2025-07-17T15:30:00+05:30"):
+        async def run(_):
+            await asyncio.sleep(delay)
+            return {"status": "success", "event_start": start, "event_end": end}
+        return run
+    
+    started = time.perf_counter()
+    slow = asyncio.run(schedule_meeting_speculative_async(dict(request, Request_id="slow"), budget=0.5,
+                                                          rule_based=rule_based, llm=fake_llm(30),
+                                                          reservations=table))
+    assert time.perf_counter() - started < 1.5, "deadline not enforced"
+    assert slow["method"] == "rule_based" and "Attendees" in slow["response"], slow
+    
+    invalid = asyncio.run(schedule_meeting_speculative_async(
+        dict(request, Request_id="invalid"), budget=2, rule_based=rule_based, reservations=table,
+        llm=fake_llm(0, "2025-07-19T15:00:00+05:30", "2025-07-19T15:30:00+05:30")))
+    assert invalid["method"] == "rule_based", "weekend LLM slot should be rejected"
+    
+    fast = asyncio.run(schedule_meeting_speculative_async(dict(request, Request_id="fast"), budget=2,
+                                                          rule_based=rule_based, llm=fake_llm(0.2),
+                                                          reservations=table))
+    assert fast["method"] == "llm_speculative" and fast["event_start"] == "2025-07-17T15:00:00+05:30", fast
+    
+    def holders(request_id):
+        return [(start, end) for attendee in [request["From"]] + [a["email"] for a in request["Attendees"]]
+                for start, end, owner in table.holds_for(attendee, 0, 2 ** 40) if owner == request_id]
+    assert holders("slow") and holders("fast"), "both paths should hold slots in the caller's table"
+    
+    # The LLM's slot is already held by "fast", so the swap fails and the rule-based answer stands
+    taken = asyncio.run(schedule_meeting_speculative_async(dict(request, Request_id="taken"), budget=2,
+                                                           rule_based=rule_based, llm=fake_llm(0),
+                                                           reservations=table))
+    assert taken["method"] == "rule_based" and holders("taken"), taken
+    
+    print(f"✅ Speculative scheduling: rule-based answer at the deadline, LLM answer when valid, {table.stats()}")
+
+def test_llm_cache():
+    """Test prompt normalization, single-flight de-duplication and persistence of the LLM response cache."""
+    import asyncio
+    import tempfile
+    import time
+    from llm_cache import LLMResponseCache, is_json
+    
+    calls = []
+    
+    def fake_model(output, delay=0.05):
+        async def call():
+            calls.append(output)
+            await asyncio.sleep(delay)
+            return output
+        return call
+    
+    cache = LLMResponseCache(max_entries=8)
+    prompts = ['{"Datetime": "16-07-2025T12:34:55", "EmailContent": "Meet  Thursday"}',
+               '{"EmailContent": "Meet Thursday ", "Datetime": "16-07-2025T12:34:55"}']
+    
+    async def burst():
+        return await asyncio.gather(*[cache.run("date_range", prompts[i % 2], fake_model('{"Start": "x"}'))
+                                      for i in range(10)])
+    outputs = asyncio.run(burst())
+    assert len(calls) == 1 and set(outputs) == {'{"Start": "x"}'}, (calls, outputs)
+    other_agent = asyncio.run(cache.run("optimal_time", prompts[0], fake_model("{}")))
+    assert other_agent == "{}", "agents must not share entries"
+    assert len(calls) == 2 and cache.stats()["coalesced"] == 9, cache.stats()
+    
+    asyncio.run(cache.run("date_range", "not json", fake_model("sorry"), cacheable=is_json))
+    asyncio.run(cache.run("date_range", "not json", fake_model("sorry"), cacheable=is_json))
+    assert len(calls) == 4, "outputs rejected by cacheable must not be cached"
+    
+    async def cancelled_leader():
+        leader = asyncio.ensure_future(cache.run("meeting", "p", fake_model("first", delay=1)))
+        await asyncio.sleep(0.01)
+        follower = asyncio.ensure_future(cache.run("meeting", "p", fake_model("second")))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await follower
+    assert asyncio.run(cancelled_leader()) == "second", "a waiter should take over from a cancelled call"
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "llm.db")
+        writer = LLMResponseCache(db_path=db_path)
+        asyncio.run(writer.run("date_range", prompts[0], fake_model('{"Start": "y"}')))
+        writer.close()
+        reader = LLMResponseCache(db_path=db_path)
+        assert asyncio.run(reader.run("date_range", prompts[1], fake_model("unused"))) == '{"Start": "y"}'
+        assert reader.stats()["disk_hits"] == 1
+        reader.close()
+    
+    import contextlib
+    import meeting_scheduler_agent as msa
+    
+    class FakeAgent:
+        def __init__(self, output='{"EventStart": "x"}', delay=0.0):
+            self.output, self.delay = output, delay
+            self.runs = 0
+        
+        async def run(self, prompt):
+            self.runs += 1
+            await asyncio.sleep(self.delay)
+            return type("Result", (), {"output": self.output})()
+        
+        def run_mcp_servers(self):
+            return contextlib.AsyncExitStack()
+    
+    date_range = '{"Start": "2025-07-17T00:00:00+05:30", "End": "2025-07-17T23:59:59+05:30", "Duration_mins": "30"}'
+    fakes = {"date_range_agent": FakeAgent(date_range, delay=0.05), "optimal_time_agent": FakeAgent(),
+             "meeting_agent": FakeAgent()}
+    saved = dict(msa._agents)
+    msa._agents.clear()
+    msa._agents.update(fakes)
+    try:
+        agent_cache = LLMResponseCache()
+        for _ in range(2):
+            asyncio.run(msa.run_async("schedule it"))
+            asyncio.run(msa.optimal_time_run("find a time", cache=agent_cache))
+        
+        # A burst of identical requests, at different times on one day, makes one date range call
+        email = f"Let's meet Thursday ({time.time()})"
+        
+        async def requests_burst():
+            return await asyncio.gather(*[msa.schedule_meeting_async(
+                {"Datetime": f"16-07-2025T{9 + i:02d}:00:00", "EmailContent": email, "Attendees": []})
+                for i in range(6)])
+        results = asyncio.run(requests_burst())
+    finally:
+        msa._agents.clear()
+        msa._agents.update(saved)
+    assert fakes["meeting_agent"].runs == 2, "time- and calendar-dependent meeting agent must not be cached"
+    assert fakes["optimal_time_agent"].runs == 2
+    assert all(result["status"] == "success" for result in results), results
+    assert fakes["date_range_agent"].runs == 1 and results[0]["start_range"] == "2025-07-17T00:00:00+05:30"
+    
+    print(f"✅ LLM cache: {len(calls)} model calls, {cache.stats()}")
+
+def test_background_loop():
+    """Test that the shared background loop serves many threads and caps model calls in flight."""
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+    from background_loop import BackgroundLoop
+    
+    runner = BackgroundLoop(max_in_flight=4, name="test-loop")
+    loops = set()
+    
+    async def fake_call(i):
+        async with runner.limit():
+            loops.add(asyncio.get_running_loop())
+            await asyncio.sleep(0.02)
+            return i
+    
+    with ThreadPoolExecutor(max_workers=20) as pool:
+        results = list(pool.map(lambda i: runner.run(fake_call(i)), range(40)))
+    assert results == list(range(40)), results
+    assert len(loops) == 1, "every thread should share one event loop"
+    stats = runner.stats()
+    assert stats["peak_in_flight"] == 4 and stats["completed"] == 40 and stats["running"], stats
+    
+    async def from_other_loop():
+        return await runner.call(fake_call(99))
+    assert asyncio.run(from_other_loop()) == 99 and len(loops) == 1, "call() should hop onto the shared loop"
+    
+    async def boom():
+        raise ValueError("boom")
+    try:
+        runner.run(boom())
+        assert False, "exceptions should propagate to the caller"
+    except ValueError:
+        pass
+    assert runner.stats()["failed"] == 1
+    
+    runner.stop()
+    assert not runner.stats()["running"]
+    assert runner.run(fake_call(7)) == 7, "a stopped loop should restart on the next submit"
+    runner.stop()
+    
+    print(f"✅ Background loop: 40 calls from 20 threads on one loop, {stats}")
+
+def test_prompt_batching():
+    """Test micro-batching of prompts with per-caller result routing and the pooled model-server client."""
+    import asyncio
+    from llm_client import PromptBatcher, shared_http_client
+    
+    in_flight = []
+    peak = [0]
+    
+    async def fake_model(prompt):
+        in_flight.append(prompt)
+        peak[0] = max(peak[0], len(in_flight))
+        await asyncio.sleep(0.02)
+        in_flight.remove(prompt)
+        if prompt == "bad":
+            raise ValueError("model rejected prompt")
+        return prompt.upper()
+    
+    batcher = PromptBatcher(fake_model, window=0.01, max_batch=8)
+    
+    async def burst(prompts):
+        return await asyncio.gather(*[batcher.submit(prompt) for prompt in prompts], return_exceptions=True)
+    
+    results = asyncio.run(burst(["a", "b", "bad", "c"]))
+    assert results[:2] == ["A", "B"] and results[3] == "C", results
+    assert isinstance(results[2], ValueError), "a failure should only reach its own caller"
+    assert batcher.stats()["batches"] == 1 and peak[0] == 4, batcher.stats()
+    
+    asyncio.run(burst([f"p{i}" for i in range(20)]))
+    stats = batcher.stats()
+    assert stats["batches"] == 4 and stats["largest_batch"] == 8, stats
+    
+    direct = PromptBatcher(fake_model, window=0)
+    assert asyncio.run(direct.submit("x")) == "X" and direct.stats()["batches"] == 0
+    
+    client = shared_http_client(max_connections=4)
+    asyncio.run(client.aclose())
+    
+    print(f"✅ Prompt batching: {stats}")
+
+def test_lazy_imports():
+    """Test that importing the schedulers builds no agents and loads no model or Google client libraries."""
+    from benchmark import import_profile
+    
+    for module in ("meeting_utils", "calendar_extractor", "meeting_scheduler_agent"):
+        profile = import_profile(module)
+        assert not profile["lazy_loaded"], f"{module} eagerly imports {profile['lazy_loaded']}"
+    
+    import meeting_scheduler_agent
+    assert not meeting_scheduler_agent._agents, "agents should only be built on first use"
+    
+    print(f"✅ Lazy imports: meeting_scheduler_agent cold import {profile['ms']:.0f} ms, no agents built")
+
+def test_circuit_breaker():
+    """Test breaker state transitions, the health probe and the immediate rule-based path while open."""
+    import asyncio
+    import functools
+    import time
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from threading import Thread
+    from calendar_providers import LocalCalendarProvider
+    from circuit_breaker import CircuitBreaker, CircuitOpenError, HealthProber
+    from meeting_scheduler_agent import schedule_meeting_speculative_async
+    from meeting_utils import process_meeting_request
+    
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=lambda: now[0])
+    
+    async def model_call(fail, error=ConnectionError("connection refused")):
+        async with breaker.guard():
+            if fail:
+                raise error
+            return "ok"
+    
+    for _ in range(3):
+        try:
+            asyncio.run(model_call(True, ValueError("model output failed validation")))
+        except ValueError:
+            pass
+    assert breaker.state == "closed" and breaker.stats()["consecutive_failures"] == 0, breaker.stats()
+    
+    for _ in range(2):
+        try:
+            asyncio.run(model_call(True))
+        except ConnectionError:
+            pass
+    assert breaker.state == "open", breaker.stats()
+    try:
+        asyncio.run(model_call(False))
+        assert False, "an open breaker should reject calls"
+    except CircuitOpenError:
+        pass
+    
+    now[0] = 31
+    assert breaker.state == "half_open" and breaker.allow() and not breaker.allow(), "one trial when half-open"
+    breaker.record_failure("still down")
+    assert breaker.state == "open"
+    now[0] = 62
+    assert asyncio.run(model_call(False)) == "ok" and breaker.state == "closed", breaker.stats()
+    
+    class ModelsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200 if self.path == "/v1/models" else 503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        
+        def log_message(self, *args):
+            pass
+    
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ModelsHandler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        assert not HealthProber(breaker, base + "/down", timeout=1).probe_once() and breaker.state == "open"
+        assert HealthProber(breaker, base + "/v1/models", timeout=1).probe_once() and breaker.state == "closed"
+    finally:
+        server.shutdown()
+    
+    breaker.trip("model server down")
+    provider = LocalCalendarProvider.from_json("3_Output_Event.json")
+    with open("1_Input_Request.json", "r") as f:
+        request = json.load(f)
+    request.update({"Datetime": "16-07-2025T12:34:55", "Request_id": "breaker",
+                    "Start": "2025-07-17T00:00:00+05:30", "End": "2025-07-17T23:59:59+05:30"})
+    
+    async def stalled_llm(_):
+        await asyncio.sleep(30)
+    
+    started = time.perf_counter()
+    result = asyncio.run(schedule_meeting_speculative_async(
+        request, budget=5, rule_based=functools.partial(process_meeting_request, provider=provider),
+        llm=stalled_llm, reservations=None, breaker=breaker))
+    elapsed = time.perf_counter() - started
+    assert result["method"] == "rule_based" and elapsed < 2, (result.get("method"), elapsed)
+    
+    print(f"✅ Circuit breaker: rule-based answer in {elapsed:.2f}s while open, {breaker.stats()}")
+
 def test_sample_data():
     """Test with sample JSON data."""
     try:
@@ -75,6 +977,28 @@ def main():
     tests = [
         ("Calendar Extractor", test_calendar_extractor),
         ("Meeting Utils", test_meeting_utils), 
+        ("Concurrent Availability", test_concurrent_availability),
+        ("Calendar Client Registry", test_calendar_client_registry),
+        ("Busy-Only Availability", test_busy_only_availability),
+        ("Event Sync Cache", test_event_sync_cache),
+        ("Paginated Events", test_paginated_events),
+        ("Local Providers", test_local_providers),
+        ("Slot Engines", test_slot_engines_agree),
+        ("Quorum Scheduling", test_quorum_scheduling),
+        ("Recurring Slots", test_recurring_slots),
+        ("Timezone Slots", test_timezone_slots),
+        ("Slot Scoring", test_slot_scoring),
+        ("Incremental Rescheduling", test_incremental_rescheduling),
+        ("Batch Scheduling", test_batch_scheduling),
+        ("Email Extraction", test_email_extraction),
+        ("Timestamp Parsing", test_timestamp_parsing),
+        ("Extraction Cache", test_extraction_cache),
+        ("Speculative Scheduling", test_speculative_scheduling),
+        ("LLM Cache", test_llm_cache),
+        ("Background Loop", test_background_loop),
+        ("Prompt Batching", test_prompt_batching),
+        ("Lazy Imports", test_lazy_imports),
+        ("Circuit Breaker", test_circuit_breaker),
         ("Sample Data", test_sample_data),
         ("Flask Setup", test_flask_setup)
     ]
@@ -84,7 +1008,12 @@ def main():
     
     for test_name, test_func in tests:
         print(f"\n🔍 Testing {test_name}:")
-        if test_func():
+        try:
+            ok = test_func() is not False
+        except Exception as e:
+            print(f"❌ {test_name} error: {e!r}")
+            ok = False
+        if ok:
             passed += 1
         else:
             print(f"   ⚠️  {test_name} test failed")
@@ -0,0 +1,187 @@
+import heapq
+import itertools
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from compact_events import event_wall_bounds, wall_seconds
+from slot_engines import iter_candidate_starts
+
+
+class SchedulingState:
+    """Slot search state for one request that absorbs calendar changes without starting over.
+
+    Built once from fetched availability, it keeps every candidate slot, the
+    number of events each attendee has overlapping each candidate, the
+    conflicted-attendee count and score per candidate, and a lazy max-heap over
+    the ranking. Adding, moving or removing one event only touches the
+    candidates that event overlaps (a bisect range, since candidates are sorted
+    and share one duration), so best_slot() after a delta costs a few heap
+    operations. Rankings and result dicts match find_best_time_slots.
+    """
+
+    def __init__(self, scheduler, detailed_events: Dict[str, Any], duration_minutes: int,
+                 start_range: str, end_range: str, preferred_day: Optional[str] = None):
+        self.scheduler = scheduler
+        self.duration = duration_minutes * 60
+        start_dt, end_dt = scheduler._search_window(start_range, end_range, preferred_day)
+        self.candidates: List[Tuple[datetime, datetime]] = list(iter_candidate_starts(
+            start_dt, end_dt, duration_minutes, scheduler.business_start, scheduler.business_end))
+        self.starts = [wall_seconds(slot_start) for slot_start, _ in self.candidates]
+
+        # attendee -> {key: (start, end, event)} in calendar order, and per-candidate overlap counts
+        self.events: Dict[str, Dict[int, Tuple[int, int, Any]]] = {}
+        self.overlaps: Dict[str, List[int]] = {}
+        self.conflicts = [0] * len(self.candidates)
+        self._keys = itertools.count()
+        for attendee, events in detailed_events.items():
+            if isinstance(events, dict) and "error" in events:
+                continue
+            self.events[attendee] = {}
+            self.overlaps[attendee] = [0] * len(self.candidates)
+            for event in events:
+                self._insert(attendee, next(self._keys), event)
+
+        self.scores = scheduler.scoring.scores(self.starts, self.conflicts)
+        self._versions = [0] * len(self.candidates)
+        self._heap = [self._entry(i) for i in range(len(self.candidates))]
+        heapq.heapify(self._heap)
+        self.deltas = 0
+
+    @classmethod
+    def for_request(cls, scheduler, request_data: Dict[str, Any]) -> "SchedulingState":
+        """Fetch a request's calendars once and build its state (same inputs as process_meeting_request)."""
+        email_analysis = scheduler.parse_email_content(request_data.get("EmailContent", ""),
+                                                       request_data.get("Datetime", ""))
+        duration = int(request_data.get("Duration_mins", email_analysis["duration_minutes"]))
+        start_time, end_time = scheduler.request_window(request_data)
+        availability = scheduler.get_availability_for_all(scheduler.request_attendees(request_data),
+                                                          start_time, end_time)
+        return cls(scheduler, availability["detailed_events"], duration, start_time, end_time,
+                   email_analysis.get("preferred_day"))
+
+    def _entry(self, i: int) -> Tuple[bool, float, int, int]:
+        # Min-heap order for the engines' ranking: available, then score, then earliest
+        return (self.conflicts[i] != 0, -self.scores[i], i, self._versions[i])
+
+    def _range(self, start: int, end: int) -> range:
+        # Candidates [s, s + duration) overlapping [start, end)
+        return range(bisect_right(self.starts, start - self.duration), bisect_left(self.starts, end))
+
+    def _insert(self, attendee: str, key: int, event: Any) -> List[int]:
+        start, end = event_wall_bounds(event)
+        self.events[attendee][key] = (start, end, event)
+        if end < start:
+            return []  # malformed event, can't block anything sensible
+        overlaps, changed = self.overlaps[attendee], []
+        for i in self._range(start, end):
+            overlaps[i] += 1
+            if overlaps[i] == 1:
+                self.conflicts[i] += 1
+                changed.append(i)
+        return changed
+
+    def _delete(self, attendee: str, key: int) -> List[int]:
+        start, end, _ = self.events[attendee].pop(key)
+        if end < start:
+            return []
+        overlaps, changed = self.overlaps[attendee], []
+        for i in self._range(start, end):
+            overlaps[i] -= 1
+            if overlaps[i] == 0:
+                self.conflicts[i] -= 1
+                changed.append(i)
+        return changed
+
+    def _rescore(self, changed: List[int]) -> None:
+        self.deltas += 1
+        if not changed:
+            return
+        scores = self.scheduler.scoring.scores([self.starts[i] for i in changed],
+                                               [self.conflicts[i] for i in changed])
+        for i, score in zip(changed, scores):
+            self.scores[i] = score
+            self._versions[i] += 1
+            heapq.heappush(self._heap, self._entry(i))
+        if len(self._heap) > 4 * len(self.candidates) + 64:
+            # Drop stale entries once they outnumber live ones
+            self._heap = [self._entry(i) for i in range(len(self.candidates))]
+            heapq.heapify(self._heap)
+
+    def _attendee_events(self, attendee: str) -> Dict[int, Tuple[int, int, Any]]:
+        if attendee not in self.events:
+            self.events[attendee] = {}
+            self.overlaps[attendee] = [0] * len(self.candidates)
+        return self.events[attendee]
+
+    def add_event(self, attendee: str, event: Any) -> int:
+        """Add an event (dict or CompactEvent) to an attendee's calendar; returns its key."""
+        self._attendee_events(attendee)
+        key = next(self._keys)
+        self._rescore(self._insert(attendee, key, event))
+        return key
+
+    def remove_event(self, attendee: str, key: int) -> None:
+        """Remove an event by the key add_event or event_keys gave it."""
+        self._rescore(self._delete(attendee, key))
+
+    def move_event(self, attendee: str, key: int, event: Any) -> None:
+        """Replace an event (new times or details), keeping its key and calendar position."""
+        events = self.events[attendee]
+        order = list(events)
+        changed = set(self._delete(attendee, key))
+        changed.update(self._insert(attendee, key, event))
+        if order[-1] != key:
+            # Keep calendar order so conflict details name the same first overlapping event
+            self.events[attendee] = {k: events[k] for k in order}
+        self._rescore(sorted(changed))
+
+    def event_keys(self, attendee: str) -> List[Tuple[int, Any]]:
+        """(key, event) pairs of an attendee's calendar, in calendar order."""
+        return [(key, event) for key, (_, _, event) in self.events.get(attendee, {}).items()]
+
+    def top_slots(self, top_k: int = 5) -> List[Dict[str, Any]]:
+        """The current top_k slots, ranked and formatted like find_best_time_slots."""
+        heap, best = self._heap, []
+        while heap and len(best) < top_k:
+            entry = heapq.heappop(heap)
+            if entry[3] == self._versions[entry[2]]:
+                best.append(entry)
+        for entry in best:
+            heapq.heappush(heap, entry)
+        return [self._slot(i) for _, _, i, _ in best]
+
+    def best_slot(self) -> Optional[Dict[str, Any]]:
+        """The current best slot, or None when the window has no candidates."""
+        slots = self.top_slots(1)
+        return slots[0] if slots else None
+
+    def _slot(self, i: int) -> Dict[str, Any]:
+        slot_start, slot_end = self.candidates[i]
+        start, end = self.starts[i], self.starts[i] + self.duration
+        conflicts = []
+        for attendee, events in self.events.items():
+            if not self.overlaps[attendee][i]:
+                continue
+            for event_start, event_end, event in events.values():
+                if start < event_end and end > event_start and event_end >= event_start:
+                    conflicts.append({
+                        "attendee": attendee,
+                        "conflicting_event": event["Summary"],
+                        "event_time": f"{event['StartTime']} - {event['EndTime']}"
+                    })
+                    break
+        return {
+            "start_time": slot_start.isoformat(),
+            "end_time": slot_end.isoformat(),
+            "all_available": self.conflicts[i] == 0,
+            "conflicts": conflicts,
+            "score": self.scores[i],
+            "day_of_week": slot_start.strftime("%A"),
+            "time_preference": self.scheduler._get_time_preference(slot_start.hour)
+        }
+
+    def stats(self) -> Dict[str, int]:
+        """Return candidate, heap and delta counts."""
+        return {"candidates": len(self.candidates), "heap": len(self._heap), "deltas": self.deltas,
+                "attendees": len(self.events)}
@@ -0,0 +1,143 @@
+import heapq
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from compact_events import CompactEvent, attendee_ids, wall_seconds
+from timestamps import timestamps
+
+
+class ReservationTable:
+    """In-process tentative holds on slots that have been handed out but not yet booked.
+
+    Every scheduled request reserves its slot for all of its attendees, so a
+    concurrent or later request sees those holds as busy time and can't be
+    given the same slot. try_reserve checks and records a hold atomically;
+    holds are keyed by request id (re-scheduling a request replaces its hold)
+    and expire ttl seconds after they are made. Times are wall-clock seconds,
+    like the slot engines compare them.
+    """
+
+    def __init__(self, ttl: Optional[float] = 900.0, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.clock = clock
+        # attendee -> non-overlapping holds sorted by start, kept as parallel lists for bisect
+        self._starts: Dict[str, List[int]] = {}
+        self._ends: Dict[str, List[int]] = {}
+        self._owners: Dict[str, List[str]] = {}
+        self._holds: Dict[str, Tuple[Tuple[str, ...], int, int, float]] = {}
+        self._expiry: List[Tuple[float, str]] = []
+        self._lock = threading.Lock()
+        self.counters = {"reserved": 0, "rejected": 0, "released": 0, "expired": 0}
+
+    def _purge_expired(self) -> None:
+        now = self.clock()
+        while self._expiry and self._expiry[0][0] <= now:
+            expires, request_id = heapq.heappop(self._expiry)
+            hold = self._holds.get(request_id)
+            if hold is not None and hold[3] == expires:
+                self._remove(request_id)
+                self.counters["expired"] += 1
+
+    def _remove(self, request_id: str) -> None:
+        attendees, start, _, _ = self._holds.pop(request_id)
+        for attendee in attendees:
+            starts = self._starts[attendee]
+            i = bisect_left(starts, start)
+            del starts[i], self._ends[attendee][i], self._owners[attendee][i]
+
+    def _is_free(self, attendee: str, start: int, end: int, exclude: Optional[str]) -> bool:
+        ends = self._ends.get(attendee)
+        if not ends:
+            return True
+        starts, owners = self._starts[attendee], self._owners[attendee]
+        i = bisect_right(ends, start)
+        while i < len(starts) and starts[i] < end:
+            if owners[i] != exclude:
+                return False
+            i += 1
+        return True
+
+    def try_reserve(self, request_id: str, attendees: List[str], start_time: str, end_time: str) -> bool:
+        """Hold [start_time, end_time) for every attendee unless another request already holds part of it."""
+        start, end = timestamps.wall(start_time), timestamps.wall(end_time)
+        attendees = tuple(dict.fromkeys(attendees))
+        with self._lock:
+            self._purge_expired()
+            if not all(self._is_free(attendee, start, end, request_id) for attendee in attendees):
+                self.counters["rejected"] += 1
+                return False
+            if request_id in self._holds:
+                self._remove(request_id)
+            for attendee in attendees:
+                starts = self._starts.setdefault(attendee, [])
+                i = bisect_left(starts, start)
+                starts.insert(i, start)
+                self._ends.setdefault(attendee, []).insert(i, end)
+                self._owners.setdefault(attendee, []).insert(i, request_id)
+            expires = self.clock() + self.ttl if self.ttl is not None else float("inf")
+            self._holds[request_id] = (attendees, start, end, expires)
+            if self.ttl is not None:
+                heapq.heappush(self._expiry, (expires, request_id))
+            self.counters["reserved"] += 1
+            return True
+
+    def release(self, request_id: str) -> bool:
+        """Drop a request's hold; returns False if it had none."""
+        with self._lock:
+            if request_id not in self._holds:
+                return False
+            self._remove(request_id)
+            self.counters["released"] += 1
+            return True
+
+    def holds_for(self, attendee: str, start: int, end: int,
+                  exclude: Optional[str] = None) -> List[Tuple[int, int, str]]:
+        """(start, end, request_id) of the attendee's holds overlapping [start, end) in wall seconds."""
+        with self._lock:
+            self._purge_expired()
+            ends = self._ends.get(attendee)
+            if not ends:
+                return []
+            starts, owners = self._starts[attendee], self._owners[attendee]
+            i, stop = bisect_right(ends, start), bisect_left(starts, end)
+            return [(starts[j], ends[j], owners[j]) for j in range(i, stop) if owners[j] != exclude]
+
+    def overlay(self, detailed_events: Dict[str, Any], start_dt: datetime, end_dt: datetime,
+                exclude: Optional[str] = None) -> Dict[str, Any]:
+        """Copy of detailed_events with other requests' holds in the window added as busy events."""
+        start, end = wall_seconds(start_dt), wall_seconds(end_dt)
+        merged = {}
+        for attendee, events in detailed_events.items():
+            holds = [] if isinstance(events, dict) else self.holds_for(attendee, start, end, exclude)
+            if holds:
+                attendee_id = (attendee_ids.intern(attendee),)
+                events = list(events) + [CompactEvent(hold_start, hold_end, None, attendee_id,
+                                                      f"Tentative hold ({request_id})")
+                                         for hold_start, hold_end, request_id in holds]
+            merged[attendee] = events
+        return merged
+
+    def clear(self) -> None:
+        """Drop every hold."""
+        with self._lock:
+            self._starts.clear()
+            self._ends.clear()
+            self._owners.clear()
+            self._holds.clear()
+            self._expiry.clear()
+
+    def __len__(self) -> int:
+        return len(self._holds)
+
+    def stats(self) -> Dict[str, int]:
+        """Return reservation counters and the number of live holds."""
+        with self._lock:
+            stats = dict(self.counters)
+            stats["holds"] = len(self._holds)
+        return stats
+
+
+tentative_reservations = ReservationTable()
@@ -0,0 +1,544 @@
+import heapq
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from math import gcd
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from compact_events import event_wall_bounds, wall_seconds
+from working_hours import WorkingHours, WorkingHoursMasks, event_utc_bounds, working_hour_masks
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# (start, end) in wall-clock seconds: offsets are ignored, like the original slot finder
+Interval = Tuple[int, int]
+
+
+def merge_intervals(intervals: List[Interval]) -> List[Interval]:
+    """Sweep sorted intervals into a disjoint union; touching intervals are joined."""
+    merged: List[Interval] = []
+    for start, end in sorted(intervals):
+        if end < start:
+            continue  # malformed event, can't block anything sensible
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def iter_candidate_starts(start_dt: datetime, end_dt: datetime, duration_minutes: int,
+                          business_start: int, business_end: int) -> Iterator[Tuple[datetime, datetime]]:
+    """Yield (slot_start, slot_end) in the same order as the original 15-minute business-hours walk."""
+    current = start_dt.replace(hour=business_start, minute=0, second=0, microsecond=0)
+    duration = timedelta(minutes=duration_minutes)
+    step = timedelta(minutes=15)
+    one_day = timedelta(days=1)
+
+    while current <= end_dt:
+        # Skip weekends
+        if current.weekday() >= 5:
+            current += one_day
+            continue
+
+        # Check business hours
+        if current.hour < business_start or current.hour >= business_end:
+            if current.hour >= business_end:
+                current = current.replace(hour=business_start, minute=0) + one_day
+            else:
+                current = current.replace(hour=business_start, minute=0)
+            continue
+
+        slot_end = current + duration
+
+        # Skip if meeting would go beyond business hours
+        if slot_end.hour > business_end:
+            current = current.replace(hour=business_start, minute=0) + one_day
+            continue
+
+        yield current, slot_end
+        current += step
+
+
+class BusyIndex:
+    """Every attendee's busy intervals, read once and merged for binary-search overlap queries.
+
+    The union of all attendees answers "is everyone free?" with one bisect; the
+    per-attendee unions count conflicted attendees for slots that aren't free.
+    Attendees whose calendars failed to load ({"error": ...}) are ignored, as in
+    the original scan. CompactEvents are used as-is; event dicts are parsed here.
+    bounds maps an event to the integer (start, end) the *_between methods take:
+    wall-clock seconds by default, or e.g. UTC epoch seconds for tz-aware search.
+    """
+
+    def __init__(self, detailed_events: Dict[str, Any],
+                 bounds: Callable[[Any], Interval] = event_wall_bounds):
+        self.attendees: List[Tuple[str, List[Any], List[Interval], List[int], List[int]]] = []
+        everyone: List[Interval] = []
+        for attendee, events in detailed_events.items():
+            if isinstance(events, dict) and "error" in events:
+                continue
+            parsed = [bounds(event) for event in events]
+            merged = merge_intervals(parsed)
+            self.attendees.append((attendee, events, parsed,
+                                   [start for start, _ in merged], [end for _, end in merged]))
+            everyone.extend(parsed)
+        union = merge_intervals(everyone)
+        self.union_starts = [start for start, _ in union]
+        self.union_ends = [end for _, end in union]
+
+    @staticmethod
+    def _overlaps(starts: List[int], ends: List[int], slot_start: int, slot_end: int) -> bool:
+        # First interval ending after slot_start is the only candidate for overlap
+        i = bisect_right(ends, slot_start)
+        return i < len(starts) and starts[i] < slot_end
+
+    def free_between(self, start: int, end: int) -> bool:
+        """True when no attendee has anything overlapping [start, end)."""
+        return not self._overlaps(self.union_starts, self.union_ends, start, end)
+
+    def conflicted_between(self, start: int, end: int) -> List[int]:
+        """Indexes (into self.attendees) of attendees busy during [start, end)."""
+        if not self._overlaps(self.union_starts, self.union_ends, start, end):
+            return []
+        return [i for i, (_, _, _, starts, ends) in enumerate(self.attendees)
+                if self._overlaps(starts, ends, start, end)]
+
+    def is_free(self, slot_start: datetime, slot_end: datetime) -> bool:
+        """True when no attendee has anything overlapping the slot."""
+        return self.free_between(wall_seconds(slot_start), wall_seconds(slot_end))
+
+    def conflicted_attendees(self, slot_start: datetime, slot_end: datetime) -> List[int]:
+        """Indexes (into self.attendees) of attendees busy during the slot."""
+        return self.conflicted_between(wall_seconds(slot_start), wall_seconds(slot_end))
+
+    def conflict_details(self, slot_start: datetime, slot_end: datetime) -> List[Dict[str, Any]]:
+        """Conflict entries in the original format: each busy attendee's first overlapping event."""
+        return self.details_between(wall_seconds(slot_start), wall_seconds(slot_end))
+
+    def details_between(self, start: int, end: int) -> List[Dict[str, Any]]:
+        """conflict_details for [start, end) given in the index's own units."""
+        conflicts = []
+        for i in self.conflicted_between(start, end):
+            attendee, events, parsed, _, _ = self.attendees[i]
+            for event, (event_start, event_end) in zip(events, parsed):
+                if start < event_end and end > event_start:
+                    conflicts.append({
+                        "attendee": attendee,
+                        "conflicting_event": event["Summary"],
+                        "event_time": f"{event['StartTime']} - {event['EndTime']}"
+                    })
+                    break
+        return conflicts
+
+
+def find_slots_sweep(scheduler, detailed_events: Dict[str, Any], duration_minutes: int,
+                     start_dt: datetime, end_dt: datetime, top_k: int = 5) -> List[Dict[str, Any]]:
+    """Sweep-line engine: parse and merge busy intervals once, then bisect per candidate.
+
+    Ranks candidates exactly like the original scan (availability, then score,
+    ties in chronological order) and only builds result dicts for the top_k.
+    """
+    index = BusyIndex(detailed_events)
+    candidates = list(iter_candidate_starts(start_dt, end_dt, duration_minutes,
+                                            scheduler.business_start, scheduler.business_end))
+    wall_starts = [wall_seconds(slot_start) for slot_start, _ in candidates]
+    counts = [len(index.conflicted_between(start, start + duration_minutes * 60)) for start in wall_starts]
+    scores = scheduler.scoring.scores(wall_starts, counts)
+    ranked = [(count == 0, score, -position, slot_start, slot_end)
+              for position, ((slot_start, slot_end), count, score) in enumerate(zip(candidates, counts, scores))]
+
+    best = heapq.nlargest(top_k, ranked, key=lambda item: item[:3])
+    return [{
+        "start_time": slot_start.isoformat(),
+        "end_time": slot_end.isoformat(),
+        "all_available": all_available,
+        "conflicts": index.conflict_details(slot_start, slot_end),
+        "score": score,
+        "day_of_week": slot_start.strftime("%A"),
+        "time_preference": scheduler._get_time_preference(slot_start.hour)
+    } for all_available, score, _, slot_start, slot_end in best]
+
+
+def find_recurring_slots(scheduler, detailed_events: Dict[str, Any], duration_minutes: int,
+                         start_dt: datetime, occurrences: int = 12, interval_weeks: int = 1,
+                         weekday: Optional[int] = None, top_k: int = 5) -> List[Dict[str, Any]]:
+    """Weekly-pattern search: check every occurrence of each weekday/time pattern in one pass.
+
+    Patterns are the candidate slots of the first week from start_dt (only
+    weekday if given); occurrence k of a pattern is k * interval_weeks weeks
+    later. One BusyIndex over the preloaded calendars answers every occurrence,
+    so detailed_events must cover the whole series (see
+    MeetingScheduler.recurrence_window). Patterns are ranked by fewest
+    conflicted occurrences, then fewest attendee conflicts over the series,
+    then the usual time-of-day/weekday score of a free slot.
+    """
+    if occurrences < 1 or interval_weeks < 1:
+        raise ValueError("occurrences and interval_weeks must be at least 1")
+    index = BusyIndex(detailed_events)
+    first_day = start_dt.replace(hour=0, minute=0, second=0, microsecond=0)
+    period = timedelta(weeks=interval_weeks)
+
+    ranked = []
+    for position, (slot_start, slot_end) in enumerate(
+            iter_candidate_starts(start_dt, first_day + timedelta(days=7) - timedelta(seconds=1), duration_minutes,
+                                  scheduler.business_start, scheduler.business_end)):
+        if weekday is not None and slot_start.weekday() != weekday:
+            continue
+        conflicted_occurrences = attendee_conflicts = 0
+        for k in range(occurrences):
+            if not index.is_free(slot_start + k * period, slot_end + k * period):
+                conflicted_occurrences += 1
+                attendee_conflicts += len(index.conflicted_attendees(slot_start + k * period, slot_end + k * period))
+        score = scheduler._calculate_slot_score(slot_start, True, [])
+        ranked.append((-conflicted_occurrences, -attendee_conflicts, score, -position, slot_start, slot_end))
+
+    best = heapq.nlargest(top_k, ranked, key=lambda item: item[:4])
+    results = []
+    for negative_conflicted, _, score, _, slot_start, slot_end in best:
+        series = [(slot_start + k * period, slot_end + k * period) for k in range(occurrences)]
+        results.append({
+            "start_time": slot_start.isoformat(),
+            "end_time": slot_end.isoformat(),
+            "all_available": negative_conflicted == 0,
+            "conflicted_occurrences": -negative_conflicted,
+            "occurrences": [start.isoformat() for start, _ in series],
+            "occurrence_conflicts": [{
+                "start_time": start.isoformat(),
+                "end_time": end.isoformat(),
+                "conflicts": index.conflict_details(start, end)
+            } for start, end in series if not index.is_free(start, end)],
+            "score": score,
+            "day_of_week": slot_start.strftime("%A"),
+            "time_preference": scheduler._get_time_preference(slot_start.hour)
+        })
+    return results
+
+
+def max_slot_score(scheduler) -> float:
+    """Best score any slot can get: a fully available slot at the best hour and weekday."""
+    return scheduler.scoring.max_score()
+
+
+def find_slots_topk(scheduler, detailed_events: Dict[str, Any], duration_minutes: int,
+                    start_dt: datetime, end_dt: datetime, top_k: int = 5) -> List[Dict[str, Any]]:
+    """Streaming engine: bounded heap over the candidate generator with an early exit.
+
+    Keeps only the best top_k candidates seen so far. Once the heap is full of
+    available slots, busy candidates are dropped without counting conflicts, and
+    the walk stops as soon as the worst kept slot already has the best possible
+    score (later candidates could only tie, and ties go to the earlier slot).
+    Conflict details are built for the returned slots only. Same results as the scan.
+    """
+    index = BusyIndex(detailed_events)
+    best_possible = (True, max_slot_score(scheduler))
+    heap: List[Tuple[bool, float, int, datetime, datetime]] = []
+
+    for position, (slot_start, slot_end) in enumerate(
+            iter_candidate_starts(start_dt, end_dt, duration_minutes,
+                                  scheduler.business_start, scheduler.business_end)):
+        full = len(heap) >= top_k
+        all_available = index.is_free(slot_start, slot_end)
+        if full and not all_available and heap[0][0]:
+            continue
+
+        conflicted = [] if all_available else index.conflicted_attendees(slot_start, slot_end)
+        score = scheduler._calculate_slot_score(slot_start, all_available, conflicted)
+        item = (all_available, score, -position, slot_start, slot_end)
+        if not full:
+            heapq.heappush(heap, item)
+        elif item[:3] > heap[0][:3]:
+            heapq.heapreplace(heap, item)
+
+        if len(heap) >= top_k and heap[0][:2] >= best_possible:
+            break
+
+    best = sorted(heap, key=lambda item: item[:3], reverse=True)
+    return [{
+        "start_time": slot_start.isoformat(),
+        "end_time": slot_end.isoformat(),
+        "all_available": all_available,
+        "conflicts": index.conflict_details(slot_start, slot_end),
+        "score": score,
+        "day_of_week": slot_start.strftime("%A"),
+        "time_preference": scheduler._get_time_preference(slot_start.hour)
+    } for all_available, score, _, slot_start, slot_end in best]
+
+
+def conflict_matrix(detailed_events: Dict[str, Any], candidates: List[Tuple[datetime, datetime]],
+                    duration_minutes: int, tick_minutes: int = 5):
+    """Who is busy in which candidate slot, for every slot at once (needs numpy).
+
+    Returns (attendees, events_by_attendee, conflicted) where conflicted[row, i]
+    is True when attendees[row] has an event overlapping candidates[i]. Rows
+    follow detailed_events, skipping calendars that failed to load ({"error": ...}).
+    Each calendar becomes a busy bitmap over fixed ticks and every slot's busy-tick
+    count comes from one prefix-sum difference. The tick is shrunk to divide both
+    the 15-minute candidate step and the duration so no overlap is missed.
+    Zero-length events block the slots that strictly contain their instant, as
+    in the scan: off the tick grid that is every slot covering the instant's
+    tick, on it every slot spanning that tick boundary.
+    """
+    tick_minutes = gcd(gcd(tick_minutes, 15), duration_minutes) or 1
+    tick = tick_minutes * 60
+    origin = wall_seconds(candidates[0][0])
+    num_ticks = -(-(wall_seconds(candidates[-1][1]) - origin) // tick)
+    slot_ticks = duration_minutes // tick_minutes
+
+    attendees, events_by_attendee, rows, starts, ends = [], [], [], [], []
+    for attendee, events in detailed_events.items():
+        if isinstance(events, dict) and "error" in events:
+            continue
+        row = len(attendees)
+        attendees.append(attendee)
+        events_by_attendee.append(events)
+        for event in events:
+            rows.append(row)
+            event_start, event_end = event_wall_bounds(event)
+            starts.append(event_start)
+            ends.append(event_end)
+
+    rows = np.asarray(rows, dtype=np.int64)
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.asarray(ends, dtype=np.int64)
+
+    # A tick [t, t + tick) is busy when start < t + tick and end > t
+    starts -= origin
+    ends -= origin
+    first_tick = np.clip(starts // tick, 0, num_ticks)
+    last_tick = np.clip(-(-ends // tick), 0, num_ticks)
+    instants = (starts == ends) & (starts > 0) & (starts < num_ticks * tick)
+    on_grid = instants & (starts % tick == 0)
+    last_tick = np.where(instants & ~on_grid, first_tick + 1, last_tick)
+    blocking = last_tick > first_tick
+    diff = np.zeros((len(attendees), num_ticks + 1), dtype=np.int32)
+    np.add.at(diff, (rows[blocking], first_tick[blocking]), 1)
+    np.add.at(diff, (rows[blocking], last_tick[blocking]), -1)
+    busy = np.cumsum(diff[:, :num_ticks], axis=1) > 0
+
+    # Busy ticks inside [k, k + slot_ticks) for every k, via prefix sums
+    prefix = np.zeros((len(attendees), num_ticks + 1), dtype=np.int32)
+    np.cumsum(busy, axis=1, out=prefix[:, 1:])
+    offsets = np.fromiter(((wall_seconds(slot_start) - origin) // tick for slot_start, _ in candidates),
+                          dtype=np.int64, count=len(candidates))
+    conflicted = (prefix[:, offsets + slot_ticks] - prefix[:, offsets]) > 0
+
+    # On-grid instants inside (k, k + slot_ticks), i.e. strictly inside the slot
+    if on_grid.any():
+        boundaries = np.zeros((len(attendees), num_ticks + 2), dtype=np.int32)
+        np.add.at(boundaries, (rows[on_grid], starts[on_grid] // tick + 1), 1)
+        np.cumsum(boundaries, axis=1, out=boundaries)
+        conflicted |= (boundaries[:, offsets + slot_ticks] - boundaries[:, offsets + 1]) > 0
+    return attendees, events_by_attendee, conflicted
+
+
+def matrix_conflict_details(attendees: List[str], events_by_attendee: List[Any], rows: Iterable[int],
+                            slot_start: datetime, slot_end: datetime) -> List[Dict[str, Any]]:
+    """Conflict entries in the original format for the conflict_matrix rows busy in a slot."""
+    conflicts = []
+    start, end = wall_seconds(slot_start), wall_seconds(slot_end)
+    for row in rows:
+        for event in events_by_attendee[row]:
+            event_start, event_end = event_wall_bounds(event)
+            if start < event_end and end > event_start:
+                conflicts.append({
+                    "attendee": attendees[row],
+                    "conflicting_event": event["Summary"],
+                    "event_time": f"{event['StartTime']} - {event['EndTime']}"
+                })
+                break
+    return conflicts
+
+
+def find_slots_bitmap(scheduler, detailed_events: Dict[str, Any], duration_minutes: int,
+                      start_dt: datetime, end_dt: datetime, top_k: int = 5,
+                      tick_minutes: int = 5) -> List[Dict[str, Any]]:
+    """NumPy engine: conflicted-attendee counts for all candidates from conflict_matrix.
+
+    The number of conflicted attendees per slot is a column sum of the busy
+    matrix; only the top_k slots are turned into result dicts. Same results
+    as the scan.
+    """
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("The bitmap slot engine requires numpy")
+
+    candidates = list(iter_candidate_starts(start_dt, end_dt, duration_minutes,
+                                            scheduler.business_start, scheduler.business_end))
+    if not candidates:
+        return []
+
+    attendees, events_by_attendee, conflicted = conflict_matrix(detailed_events, candidates,
+                                                                duration_minutes, tick_minutes)
+    conflict_counts = conflicted.sum(axis=0)
+    scores = scheduler.scoring.scores([wall_seconds(slot_start) for slot_start, _ in candidates], conflict_counts)
+
+    ranked = [(count == 0, score, -position, slot_start, slot_end)
+              for position, ((slot_start, slot_end), count, score) in enumerate(
+                  zip(candidates, conflict_counts.tolist(), scores))]
+
+    best = heapq.nlargest(top_k, ranked, key=lambda item: item[:3])
+    results = []
+    for all_available, score, negative_position, slot_start, slot_end in best:
+        results.append({
+            "start_time": slot_start.isoformat(),
+            "end_time": slot_end.isoformat(),
+            "all_available": all_available,
+            "conflicts": matrix_conflict_details(attendees, events_by_attendee,
+                                                 np.flatnonzero(conflicted[:, -negative_position]),
+                                                 slot_start, slot_end),
+            "score": score,
+            "day_of_week": slot_start.strftime("%A"),
+            "time_preference": scheduler._get_time_preference(slot_start.hour)
+        })
+    return results
+
+
+def blocking_events(events: Any) -> Any:
+    """events without the zero-length ones; a failed calendar ({"error": ...}) is returned unchanged."""
+    if isinstance(events, dict) and "error" in events:
+        return events
+    kept = []
+    for event in events:
+        event_start, event_end = event_wall_bounds(event)
+        if event_end > event_start:
+            kept.append(event)
+    return kept
+
+
+def find_slots_quorum(scheduler, detailed_events: Dict[str, Any], duration_minutes: int,
+                      start_dt: datetime, end_dt: datetime, required: List[str],
+                      optional: List[str] = (), quorum: Optional[int] = None,
+                      top_k: int = 5) -> List[Dict[str, Any]]:
+    """Partial-availability search: every required attendee plus a quorum of all invitees.
+
+    quorum is the minimum number of invitees (required and optional) who must be
+    free and defaults to len(required). Free counts for all candidates come from
+    one conflict_matrix call (a bisect per attendee and slot without numpy).
+    Slots are ranked by quorum met, all required free, number of optional
+    attendees free, then the usual score, ties going to the earlier slot.
+    Invitees whose calendars couldn't be loaded count as free, like in the
+    other engines. Zero-length events are dropped up front, so they never block
+    a slot whether or not numpy is available.
+    """
+    required = list(dict.fromkeys(required))
+    optional = [attendee for attendee in dict.fromkeys(optional) if attendee not in required]
+    invitees = required + optional
+    quorum = len(required) if quorum is None else quorum
+    if not 0 <= quorum <= len(invitees):
+        raise ValueError(f"quorum must be between 0 and {len(invitees)}, got {quorum}")
+
+    candidates = list(iter_candidate_starts(start_dt, end_dt, duration_minutes,
+                                            scheduler.business_start, scheduler.business_end))
+    if not candidates:
+        return []
+
+    invited_events = {attendee: blocking_events(detailed_events[attendee])
+                      for attendee in invitees if attendee in detailed_events}
+    required_set = set(required)
+    if NUMPY_AVAILABLE:
+        attendees, events_by_attendee, conflicted = conflict_matrix(invited_events, candidates, duration_minutes)
+        required_rows = np.asarray([attendee in required_set for attendee in attendees], dtype=bool)
+        required_busy = conflicted[required_rows].sum(axis=0).tolist()
+        optional_busy = conflicted[~required_rows].sum(axis=0).tolist()
+
+        def details(position, slot_start, slot_end):
+            return matrix_conflict_details(attendees, events_by_attendee, np.flatnonzero(conflicted[:, position]),
+                                           slot_start, slot_end)
+    else:
+        index = BusyIndex(invited_events)
+        is_required = [attendee in required_set for attendee, _, _, _, _ in index.attendees]
+
+        def details(position, slot_start, slot_end):
+            return index.conflict_details(slot_start, slot_end)
+
+        required_busy, optional_busy = [], []
+        for slot_start, slot_end in candidates:
+            busy_rows = index.conflicted_attendees(slot_start, slot_end)
+            required_busy.append(sum(1 for row in busy_rows if is_required[row]))
+            optional_busy.append(len(busy_rows) - required_busy[-1])
+
+    busy_counts = [busy_required + busy_optional for busy_required, busy_optional in zip(required_busy, optional_busy)]
+    scores = scheduler.scoring.scores([wall_seconds(slot_start) for slot_start, _ in candidates], busy_counts)
+    ranked = []
+    for position, ((slot_start, slot_end), busy_required, busy_optional, busy, score) in enumerate(
+            zip(candidates, required_busy, optional_busy, busy_counts, scores)):
+        required_ok = busy_required == 0
+        ranked.append((required_ok and len(invitees) - busy >= quorum, required_ok, len(optional) - busy_optional,
+                       score, -position, slot_start, slot_end))
+
+    best = heapq.nlargest(top_k, ranked, key=lambda item: item[:5])
+    results = []
+    for quorum_met, required_ok, optional_free, score, negative_position, slot_start, slot_end in best:
+        conflicts = details(-negative_position, slot_start, slot_end)
+        unavailable = [conflict["attendee"] for conflict in conflicts]
+        results.append({
+            "start_time": slot_start.isoformat(),
+            "end_time": slot_end.isoformat(),
+            "all_available": not conflicts,
+            "conflicts": conflicts,
+            "score": score,
+            "day_of_week": slot_start.strftime("%A"),
+            "time_preference": scheduler._get_time_preference(slot_start.hour),
+            "quorum_met": quorum_met,
+            "required_available": required_ok,
+            "optional_available": optional_free,
+            "available_attendees": len(invitees) - len(unavailable),
+            "unavailable_attendees": unavailable
+        })
+    return results
+
+
+def find_slots_tz(scheduler, detailed_events: Dict[str, Any], duration_minutes: int,
+                  start_utc: int, end_utc: int, working_hours: Dict[str, WorkingHours],
+                  top_k: int = 5, masks: Optional[WorkingHoursMasks] = None) -> List[Dict[str, Any]]:
+    """Timezone-aware engine: candidates come from the attendees' common working hours in UTC.
+
+    Every attendee's profile (scheduler.default_working_hours if missing from
+    working_hours) is compiled to a cached UTC mask and the masks are intersected
+    once, so candidates are the 15-minute UTC grid points whose whole slot fits
+    in a common working interval inside [start_utc, end_utc]; no per-candidate
+    hour checks. Busy intervals are compared in UTC too (naive event times are
+    read in scheduler.timezone). Slots are scored and reported in
+    scheduler.timezone, with each attendee's local start time alongside.
+    """
+    masks = masks or working_hour_masks
+    default = scheduler.default_working_hours
+    profiles = {attendee: working_hours.get(attendee, default) for attendee in detailed_events}
+    common = masks.common(profiles.values(), start_utc, end_utc)
+    index = BusyIndex(detailed_events, bounds=lambda event: event_utc_bounds(event, scheduler.timezone))
+    duration = duration_minutes * 60
+    step = 15 * 60
+
+    ranked = []
+    position = 0
+    for mask_start, mask_end in common:
+        slot_start = -(-mask_start // step) * step
+        while slot_start + duration <= mask_end:
+            conflicted = index.conflicted_between(slot_start, slot_start + duration)
+            local_start = datetime.fromtimestamp(slot_start, scheduler.timezone)
+            score = scheduler._calculate_slot_score(local_start, not conflicted, conflicted)
+            ranked.append((not conflicted, score, -position, slot_start))
+            position += 1
+            slot_start += step
+
+    best = heapq.nlargest(top_k, ranked, key=lambda item: item[:3])
+    results = []
+    for all_available, score, _, slot_start in best:
+        local_start = datetime.fromtimestamp(slot_start, scheduler.timezone)
+        results.append({
+            "start_time": local_start.isoformat(),
+            "end_time": datetime.fromtimestamp(slot_start + duration, scheduler.timezone).isoformat(),
+            "all_available": all_available,
+            "conflicts": index.details_between(slot_start, slot_start + duration),
+            "score": score,
+            "day_of_week": local_start.strftime("%A"),
+            "time_preference": scheduler._get_time_preference(local_start.hour),
+            "local_start_times": {attendee: datetime.fromtimestamp(slot_start, profile.timezone).isoformat()
+                                  for attendee, profile in profiles.items()}
+        })
+    return results
@@ -6,6 +6,7 @@ Demonstrates core scheduling logic and calendar integration
 
 import json
 from datetime import datetime, timedelta
+from calendar_providers import LocalCalendarProvider
 from meeting_utils import MeetingScheduler, process_meeting_request
 
 def demo_email_parsing():
@@ -79,14 +80,15 @@ def demo_meeting_processing():
     print(f"   Subject: {sample_request['Subject']}")
     print(f"   Content: {sample_request['EmailContent']}")
     
-    # Note: This will attempt to access Google Calendar
-    # May fail if tokens are invalid, but will demonstrate the logic
+    # Calendars come from the local provider seeded with 3_Output_Event.json,
+    # so no Google Calendar tokens or network access are needed
     try:
-        result = process_meeting_request(sample_request)
+        provider = LocalCalendarProvider.from_json("3_Output_Event.json")
+        result = process_meeting_request(sample_request, provider=provider)
         
         if "error" in result:
-            print(f"   ⚠️  Calendar access limited (expected): {result['error']}")
-            print(f"   ℹ️  This is normal without valid Google Calendar tokens")
+            print(f"   ⚠️  Scheduling limited: {result['error']}")
+            print(f"   ℹ️  Check the request's date range and preferred day")
         else:
             print(f"   ✅ Meeting processed successfully!")
             if result.get("scheduling_metadata"):
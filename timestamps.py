@@ -0,0 +1,123 @@
+import threading
+from datetime import datetime
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple
+
+import pytz
+
+DEFAULT_TIMEZONE = pytz.timezone('Asia/Kolkata')
+
+
+def wall_seconds(dt: datetime) -> int:
+    """Wall-clock time in whole seconds since 1970-01-01, ignoring any UTC offset."""
+    return (dt.toordinal() - 719163) * 86400 + dt.hour * 3600 + dt.minute * 60 + dt.second
+
+
+def _shape(value: str) -> Tuple[int, str, str, str]:
+    # Length plus the characters that tell the accepted formats apart:
+    # "16-07-2025T12:34:55" and "02-07-2025T09:00:00" share a shape, "2025-07-16T12:34:55Z" doesn't
+    return len(value), value[2:3], value[4:5], value[-1:]
+
+
+def _iso(value: str) -> datetime:
+    return datetime.fromisoformat(value)
+
+
+def _iso_zulu(value: str) -> datetime:
+    return datetime.fromisoformat(value[:-1] + "+00:00")
+
+
+def _day_first(value: str) -> datetime:
+    # "DD-MM-YYYY[THH:MM:SS...]" as sent in request Datetime fields
+    return datetime.fromisoformat(f"{value[6:10]}-{value[3:5]}-{value[0:2]}{value[10:]}")
+
+
+class TimestampParser:
+    """Memoized parser for request and event timestamps.
+
+    Accepts ISO 8601 (optionally with a Z suffix) and the day-first
+    DD-MM-YYYY[THH:MM:SS] form of request Datetime fields. Which of those a
+    string is gets decided once per format shape (its length and separator
+    characters), and each result kind (datetime, wall-clock or aware datetime,
+    wall-clock or UTC epoch seconds) is kept in a bounded LRU, since the same
+    Datetime, Start, End and event timestamps come back on every request.
+    Unparseable strings raise ValueError.
+    """
+
+    def __init__(self, max_entries: int = 16384, max_shapes: int = 256):
+        self.max_shapes = max_shapes
+        self._formats: Dict[Tuple[int, str, str, str], Callable[[str], datetime]] = {}
+        self._lock = threading.Lock()
+        self.parse = lru_cache(maxsize=max_entries)(self._parse)
+        self.parse_wall = lru_cache(maxsize=max_entries)(self._parse_wall)
+        self.aware = lru_cache(maxsize=max_entries)(self._aware)
+        self.wall = lru_cache(maxsize=max_entries)(self._wall)
+        self.epoch = lru_cache(maxsize=max_entries)(self._epoch)
+        self.epoch_offset = lru_cache(maxsize=max_entries)(self._epoch_offset)
+        self._caches = (self.parse, self.parse_wall, self.aware, self.wall, self.epoch, self.epoch_offset)
+
+    def _converter(self, value: str) -> Callable[[str], datetime]:
+        shape = _shape(value)
+        converter = self._formats.get(shape)
+        if converter is not None:
+            return converter
+        if value[2:3] == "-":
+            converter = _day_first
+        elif value[-1:] == "Z":
+            converter = _iso_zulu
+        else:
+            converter = _iso
+        converter(value)  # raises ValueError before an unusable shape is remembered
+        with self._lock:
+            if len(self._formats) < self.max_shapes:
+                self._formats[shape] = converter
+        return converter
+
+    def _parse(self, value: str) -> datetime:
+        """Parse as written: aware when the string has an offset, naive otherwise."""
+        if not isinstance(value, str):
+            raise ValueError(f"Expected a timestamp string, got {value!r}")
+        return self._converter(value)(value)
+
+    def _aware(self, value: str, tz=DEFAULT_TIMEZONE) -> datetime:
+        """Parse keeping the UTC offset; naive values are wall-clock time in tz."""
+        dt = self.parse(value)
+        return tz.localize(dt) if dt.tzinfo is None else dt
+
+    def _wall(self, value: str) -> int:
+        """Wall-clock seconds since 1970-01-01, ignoring any UTC offset."""
+        return wall_seconds(self.parse(value))
+
+    def _epoch(self, value: str, tz=DEFAULT_TIMEZONE) -> int:
+        """UTC epoch seconds; naive values are wall-clock time in tz."""
+        return int(self.aware(value, tz).timestamp())
+
+    def _epoch_offset(self, value: str) -> Tuple[int, Optional[int]]:
+        """(UTC epoch seconds, UTC offset seconds); naive values keep their wall clock and no offset."""
+        dt = self.parse(value)
+        offset = dt.utcoffset()
+        if offset is None:
+            return wall_seconds(dt), None
+        offset_seconds = int(offset.total_seconds())
+        return wall_seconds(dt) - offset_seconds, offset_seconds
+
+    def _parse_wall(self, value: str) -> datetime:
+        """Naive wall-clock datetime, dropping any UTC offset."""
+        dt = self.parse(value)
+        return dt.replace(tzinfo=None) if dt.tzinfo is not None else dt
+
+    def clear(self) -> None:
+        """Drop every cached result and format shape."""
+        for cache in self._caches:
+            cache.cache_clear()
+        with self._lock:
+            self._formats.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters summed over the result caches, and cache sizes."""
+        infos = [cache.cache_info() for cache in self._caches]
+        return {"hits": sum(info.hits for info in infos), "misses": sum(info.misses for info in infos),
+                "entries": sum(info.currsize for info in infos), "shapes": len(self._formats)}
+
+
+timestamps = TimestampParser()
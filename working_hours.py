@@ -0,0 +1,174 @@
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, time as dt_time, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import pytz
+
+from compact_events import EPOCH, CompactEvent
+from timestamps import timestamps
+
+# (start, end) in UTC epoch seconds
+UtcInterval = Tuple[int, int]
+
+WEEKDAYS = (0, 1, 2, 3, 4)
+
+
+def _parse_clock(value: str) -> dt_time:
+    hours, _, minutes = value.partition(":")
+    return dt_time(int(hours), int(minutes or 0))
+
+
+class WorkingHours:
+    """An attendee's timezone and working-hours profile, e.g. Europe/Berlin 09:00-17:00 Mon-Fri.
+
+    compile() turns the profile into UTC epoch intervals for a range of days;
+    use working_hour_masks to get them cached instead of recompiling per search.
+    """
+
+    __slots__ = ("timezone", "start", "end", "workdays", "key")
+
+    def __init__(self, timezone: str = "Asia/Kolkata", start: str = "09:00", end: str = "18:00",
+                 workdays: Iterable[int] = WEEKDAYS):
+        self.timezone = pytz.timezone(timezone)
+        self.start = _parse_clock(start)
+        self.end = _parse_clock(end)
+        self.workdays = frozenset(workdays)
+        if self.end <= self.start:
+            raise ValueError(f"Working hours must end after they start, got {start}-{end}")
+        self.key = (self.timezone.zone, self.start, self.end, tuple(sorted(self.workdays)))
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], default: Optional["WorkingHours"] = None) -> "WorkingHours":
+        """Build from {"timezone": ..., "working_hours": "09:00-17:00", "workdays": [0, ...]}, filling gaps from default."""
+        default = default or cls()
+        hours = data.get("working_hours")
+        start, end = hours.split("-") if hours else (default.start.strftime("%H:%M"), default.end.strftime("%H:%M"))
+        return cls(data.get("timezone") or default.timezone.zone, start.strip(), end.strip(),
+                   data.get("workdays", default.workdays))
+
+    def compile(self, first_day: date, last_day: date) -> List[UtcInterval]:
+        """UTC intervals of every working period whose local day falls in [first_day, last_day]."""
+        intervals = []
+        day = first_day
+        while day <= last_day:
+            if day.weekday() in self.workdays:
+                start = self.timezone.localize(datetime.combine(day, self.start))
+                end = self.timezone.localize(datetime.combine(day, self.end))
+                intervals.append((int(start.timestamp()), int(end.timestamp())))
+            day += timedelta(days=1)
+        return intervals
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, WorkingHours) and self.key == other.key
+
+    def __hash__(self) -> int:
+        return hash(self.key)
+
+    def __repr__(self) -> str:
+        return f"WorkingHours({self.timezone.zone}, {self.start:%H:%M}-{self.end:%H:%M})"
+
+
+def intersect_intervals(first: List[UtcInterval], second: List[UtcInterval]) -> List[UtcInterval]:
+    """Two-pointer intersection of two sorted, disjoint interval lists."""
+    result = []
+    i = j = 0
+    while i < len(first) and j < len(second):
+        start = max(first[i][0], second[j][0])
+        end = min(first[i][1], second[j][1])
+        if start < end:
+            result.append((start, end))
+        if first[i][1] < second[j][1]:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+class WorkingHoursMasks:
+    """LRU cache of compiled UTC working-hour masks, per profile and for sets of profiles.
+
+    Masks are compiled for whole UTC days around the requested window, so every
+    search inside the same days reuses them; the intersection for a set of
+    profiles (the hours when everyone is working) is cached the same way.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._masks: "OrderedDict[Tuple, List[UtcInterval]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.compiles = 0
+
+    def _cached(self, key: Tuple, build) -> List[UtcInterval]:
+        with self._lock:
+            mask = self._masks.get(key)
+            if mask is not None:
+                self._masks.move_to_end(key)
+                self.hits += 1
+                return mask
+        mask = build()
+        with self._lock:
+            self._masks[key] = mask
+            self.compiles += 1
+            while len(self._masks) > self.max_entries:
+                self._masks.popitem(last=False)
+        return mask
+
+    @staticmethod
+    def _days(start: int, end: int) -> Tuple[date, date]:
+        return (EPOCH + timedelta(seconds=start)).date(), (EPOCH + timedelta(seconds=end)).date()
+
+    def mask(self, profile: WorkingHours, start: int, end: int) -> List[UtcInterval]:
+        """The profile's working intervals on the UTC days spanning [start, end]."""
+        first_day, last_day = self._days(start, end)
+
+        def build():
+            # Local days one either side cover any UTC offset; clip back to the UTC days
+            lower = int((datetime.combine(first_day, dt_time()) - EPOCH).total_seconds())
+            upper = lower + ((last_day - first_day).days + 1) * 86400
+            return [(max(s, lower), min(e, upper))
+                    for s, e in profile.compile(first_day - timedelta(days=1), last_day + timedelta(days=1))
+                    if s < upper and e > lower]
+
+        return self._cached(("profile", profile.key, first_day, last_day), build)
+
+    def common(self, profiles: Iterable[WorkingHours], start: int, end: int) -> List[UtcInterval]:
+        """Intervals inside [start, end] when every profile is working."""
+        unique = sorted(set(profiles), key=lambda profile: profile.key)
+        first_day, last_day = self._days(start, end)
+
+        def build():
+            mask = None
+            for profile in unique:
+                compiled = self.mask(profile, start, end)
+                mask = compiled if mask is None else intersect_intervals(mask, compiled)
+            return mask or []
+
+        mask = self._cached(("common", tuple(profile.key for profile in unique), first_day, last_day), build)
+        return [(max(s, start), min(e, end)) for s, e in mask if s < end and e > start]
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache counters and the number of cached masks."""
+        with self._lock:
+            return {"masks": len(self._masks), "compiles": self.compiles, "hits": self.hits}
+
+
+working_hour_masks = WorkingHoursMasks()
+
+
+def utc_seconds(dt: datetime, default_tz=pytz.timezone('Asia/Kolkata')) -> int:
+    """UTC epoch seconds of a datetime, reading naive values as wall-clock time in default_tz."""
+    if dt.tzinfo is None:
+        dt = default_tz.localize(dt)
+    return int(dt.timestamp())
+
+
+def event_utc_bounds(event, default_tz=pytz.timezone('Asia/Kolkata')) -> Tuple[int, int]:
+    """(start, end) UTC epoch seconds for a CompactEvent or an event dict; naive times are in default_tz."""
+    if isinstance(event, CompactEvent):
+        if event.offset is not None:
+            return event.start, event.end
+        return (utc_seconds(EPOCH + timedelta(seconds=event.start), default_tz),
+                utc_seconds(EPOCH + timedelta(seconds=event.end), default_tz))
+    return timestamps.epoch(event["StartTime"], default_tz), timestamps.epoch(event["EndTime"], default_tz)